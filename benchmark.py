@@ -0,0 +1,239 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from src.interpretador.assembler import Assembler
+from src.interpretador.imagem import ImagemPrograma
+from src.interpretador.interpretador import Interpretador
+from src.simulador.processador import Processador, TAMANHO_MEMORIA, TRACE_DESLIGADO
+from src.simulador.fusao import Fusao
+from src.simulador.tradutor import TradutorBlocos
+
+PASTA_CARGAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+BASELINE_PADRAO = os.path.join(PASTA_CARGAS, "baseline.json")
+
+MOTORES = ("interpretador", "fusao", "blocos")
+
+# Tempo mínimo de cada medição curta (montagem, carga): repete até atingi-lo
+TEMPO_MINIMO = 0.2
+
+
+def coletar_cargas(filtro=None):
+    """
+    Lista as cargas de trabalho (benchmarks/*.asm), opcionalmente filtradas por substring do nome.
+    """
+    cargas = sorted(glob.glob(os.path.join(PASTA_CARGAS, "*.asm")))
+    if filtro:
+        cargas = [caminho for caminho in cargas if filtro in os.path.basename(caminho)]
+    return cargas
+
+
+def _cronometrar(funcao, repeticoes):
+    """
+    Executa funcao() várias vezes, cada rodada repetindo até TEMPO_MINIMO.
+    Devolve (melhor tempo por chamada, último resultado).
+    """
+    melhor = None
+    resultado = None
+    for _ in range(repeticoes):
+        chamadas = 0
+        inicio = time.perf_counter()
+        while True:
+            resultado = funcao()
+            chamadas += 1
+            decorrido = time.perf_counter() - inicio
+            if decorrido >= TEMPO_MINIMO:
+                break
+        por_chamada = decorrido / chamadas
+        if melhor is None or por_chamada < melhor:
+            melhor = por_chamada
+    return melhor, resultado
+
+
+def _hash_estado(cpu):
+    h = hashlib.sha256()
+    h.update(cpu.regs.tobytes())
+    h.update(cpu.memoria.tobytes())
+    h.update((cpu.pc & 0xFFFFFFFF).to_bytes(4, "little"))
+    return h.hexdigest()[:16]
+
+
+def medir_simulacao(fonte, motor, repeticoes):
+    """
+    Executa o programa até o halt no motor indicado. Devolve instruções/s (melhor rodada),
+    o número de instruções e um hash do estado final (para detectar divergência entre motores).
+    No motor "fusao" também informa a fração de instruções executadas em superinstruções.
+    """
+    segmentos = Assembler.montar_fonte(fonte)
+    melhor = None
+    for _ in range(repeticoes):
+        cpu = Processador(nivel_trace=TRACE_DESLIGADO, fusao=motor == "fusao")
+        cpu.carregar_programa(segmentos)
+        executar = TradutorBlocos(cpu).run if motor == "blocos" else cpu.run
+        inicio = time.perf_counter()
+        executar()
+        decorrido = time.perf_counter() - inicio
+        if melhor is None or decorrido < melhor:
+            melhor = decorrido
+    medida = {
+        "valor": cpu.contador_instrucoes / melhor,
+        "unidade": "instrucoes/s",
+        "instrucoes": cpu.contador_instrucoes,
+        "estado": _hash_estado(cpu),
+    }
+    if motor == "fusao":
+        medida["taxa_fusao"] = Fusao.estatisticas(cpu)["taxa"]
+    return medida
+
+
+def medir_montagem(fontes, repeticoes):
+    """
+    Linhas de assembly montadas por segundo, somando todas as cargas.
+    """
+    linhas = sum(len(fonte.splitlines()) for fonte in fontes)
+    tempo, _ = _cronometrar(lambda: [Assembler.montar_fonte(fonte) for fonte in fontes], repeticoes)
+    return {"valor": linhas / tempo, "unidade": "linhas/s", "linhas": linhas}
+
+
+def medir_carga(formato, repeticoes):
+    """
+    Palavras por segundo ao carregar uma imagem que ocupa a memória inteira (pseudoaleatória, semente fixa).
+    """
+    gerador = random.Random(2024)
+    palavras = [gerador.getrandbits(32) for _ in range(TAMANHO_MEMORIA)]
+    segmentos = [(0, palavras)]
+
+    descritor, caminho = tempfile.mkstemp(suffix=".bin")
+    os.close(descritor)
+    try:
+        if formato == "texto":
+            ImagemPrograma.escrever_texto(caminho, segmentos)
+        else:
+            ImagemPrograma.escrever(caminho, segmentos)
+
+        def carregar():
+            cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+            Interpretador.carregar_em(cpu, caminho)
+            return cpu
+
+        tempo, cpu = _cronometrar(carregar, repeticoes)
+        if list(cpu.memoria) != palavras:
+            raise RuntimeError(f"Carga da imagem em formato {formato} produziu memória diferente da gravada.")
+    finally:
+        os.remove(caminho)
+    return {"valor": TAMANHO_MEMORIA / tempo, "unidade": "palavras/s", "palavras": TAMANHO_MEMORIA}
+
+
+def executar_benchmarks(cargas, motores=MOTORES, repeticoes=3, progresso=None):
+    """
+    Roda todas as medições e devolve o relatório (dicionário serializável em JSON).
+    """
+    resultados = {}
+
+    def registrar(nome, medida):
+        resultados[nome] = medida
+        if progresso:
+            linha = f"{nome:<36} {medida['valor']:>16,.0f} {medida['unidade']}"
+            if "taxa_fusao" in medida:
+                linha += f" ({100 * medida['taxa_fusao']:.1f}% em superinstruções)"
+            progresso(linha)
+
+    fontes = []
+    for caminho in cargas:
+        with open(caminho, "r") as f:
+            fontes.append(f.read())
+
+    for caminho, fonte in zip(cargas, fontes):
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        for motor in motores:
+            registrar(f"simulacao/{nome}/{motor}", medir_simulacao(fonte, motor, repeticoes))
+
+    if fontes:
+        registrar("montagem", medir_montagem(fontes, repeticoes))
+    for formato in ("binario", "texto"):
+        registrar(f"carga/{formato}", medir_carga(formato, repeticoes))
+
+    return {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "maquina": platform.machine(),
+        "sistema": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(relatorio, baseline, tolerancia):
+    """
+    Compara com uma baseline salva. Devolve a lista de problemas: medidas mais lentas que
+    baseline * (1 - tolerancia) e simulações que mudaram de número de instruções ou de estado final.
+    """
+    problemas = []
+    for nome, medida in relatorio["resultados"].items():
+        referencia = baseline.get("resultados", {}).get(nome)
+        if referencia is None:
+            continue
+        for campo in ("instrucoes", "estado"):
+            if campo in referencia and referencia[campo] != medida.get(campo):
+                problemas.append(f"{nome}: {campo} mudou ({referencia[campo]} -> {medida.get(campo)})")
+        razao = medida["valor"] / referencia["valor"]
+        if razao < 1 - tolerancia:
+            problemas.append(f"{nome}: {razao:.2f}x da baseline ({medida['valor']:,.0f} vs {referencia['valor']:,.0f} {medida['unidade']})")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de desempenho do simulador UFLA-RISC.")
+    parser.add_argument("--filtro", default=None, help="Só as cargas cujo nome contém este texto")
+    parser.add_argument("--motores", default=",".join(MOTORES), help="Motores separados por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Rodadas por medida (vale a melhor)")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO, help="Baseline para comparação")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava os resultados como nova baseline")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Perda relativa aceita antes de acusar regressão")
+    args = parser.parse_args()
+
+    motores = [motor for motor in args.motores.split(",") if motor]
+    for motor in motores:
+        if motor not in MOTORES:
+            parser.error(f"Motor desconhecido: {motor}")
+
+    relatorio = executar_benchmarks(coletar_cargas(args.filtro), motores, args.repeticoes, progresso=print)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if args.salvar_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nBaseline gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nSem baseline em {args.baseline} (use --salvar-baseline para criar).")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    problemas = comparar(relatorio, baseline, args.tolerancia)
+    if problemas:
+        print("\nRegressões em relação à baseline:")
+        for problema in problemas:
+            print(f"  {problema}")
+        return 1
+    print("\nSem regressões em relação à baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# Checksum por rotação e xor de 1000 palavras, 100 passadas (~800 mil instruções)
+address 0
+        lcl r2, 1
+        zeros r3
+        lcl r12, 5
+        lcl r13, 27
+        lcl r1, 1000        # palavras
+        lcl r10, 4096
+        copy r4, r1
+        lcl r7, 0x7F4A
+        lch r7, 0x9E37
+dados:  store r10, r7
+        add r7, r7, r10
+        add r10, r10, r2
+        sub r4, r4, r2
+        bne r4, r3, dados
+
+        lcl r9, 100         # passadas
+        zeros r5            # checksum
+passada: lcl r10, 4096
+        copy r4, r1
+soma:   load r6, r10
+        lsl r8, r5, r12     # r5 rotacionado 5 bits à esquerda
+        lsr r11, r5, r13
+        or r8, r8, r11
+        xor r5, r8, r6
+        add r10, r10, r2
+        sub r4, r4, r2
+        bne r4, r3, soma
+        sub r9, r9, r2
+        bne r9, r3, passada
+        halt
@@ -0,0 +1,13 @@
+# Laços de contagem aninhados: 300 x 1000 iterações (~900 mil instruções)
+address 0
+        lcl r1, 300         # contador externo
+        lcl r2, 1
+        zeros r3
+        zeros r5            # acumulador
+externo: lcl r4, 1000       # contador interno
+interno: add r5, r5, r2
+        sub r4, r4, r2
+        bne r4, r3, interno
+        sub r1, r1, r2
+        bne r1, r3, externo
+        halt
@@ -0,0 +1,23 @@
+# Preenche 4096 palavras a partir de 4096 e copia para 8192, 20 vezes (~820 mil instruções)
+address 0
+        lcl r2, 1
+        zeros r3
+        lcl r9, 20          # repetições
+repete: lcl r10, 4096       # origem
+        lcl r11, 8192       # destino
+        lcl r4, 4096        # palavras
+preenche: store r10, r4     # mem[r10] = r4
+        add r10, r10, r2
+        sub r4, r4, r2
+        bne r4, r3, preenche
+        lcl r10, 4096
+        lcl r4, 4096
+copia:  load r6, r10
+        store r11, r6
+        add r10, r10, r2
+        add r11, r11, r2
+        sub r4, r4, r2
+        bne r4, r3, copia
+        sub r9, r9, r2
+        bne r9, r3, repete
+        halt
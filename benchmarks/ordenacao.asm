@@ -0,0 +1,42 @@
+# Bubble sort de 300 valores pseudoaleatórios (xorshift) em 4096 (~450 mil instruções)
+address 0
+        lcl r2, 1
+        zeros r3
+        lcl r20, 31
+        lcl r21, 0xFFFF
+        lcl r1, 300         # N
+        lcl r10, 4096
+        copy r4, r1
+        lcl r7, 12345       # semente
+        lcl r12, 13
+        lcl r13, 17
+        lcl r14, 5
+gera:   lsl r8, r7, r12
+        xor r7, r7, r8
+        lsr r8, r7, r13
+        xor r7, r7, r8
+        lsl r8, r7, r14
+        xor r7, r7, r8
+        and r8, r7, r21     # valores de 16 bits: a subtração não transborda
+        store r10, r8
+        add r10, r10, r2
+        sub r4, r4, r2
+        bne r4, r3, gera
+
+        sub r5, r1, r2      # i = N - 1
+externo: lcl r10, 4096      # &a[j]
+        copy r6, r5         # comparações nesta passada
+interno: load r8, r10       # a[j]
+        add r11, r10, r2
+        load r9, r11        # a[j + 1]
+        sub r15, r9, r8     # negativo se a[j] > a[j + 1]
+        lsr r15, r15, r20
+        beq r15, r3, sem_troca
+        store r10, r9
+        store r11, r8
+sem_troca: copy r10, r11
+        sub r6, r6, r2
+        bne r6, r3, interno
+        sub r5, r5, r2
+        bne r5, r3, externo
+        halt
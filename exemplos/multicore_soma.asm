@@ -0,0 +1,50 @@
+# Programa para o SistemaMulticore (src/simulador/multicore.py) com 4 núcleos:
+#   python -m src.simulador.multicore exemplos/multicore_soma.asm --inicios 0,2,4,6
+# Cada núcleo entra no seu ponto de entrada, guarda o próprio número em r1 e roda a mesma rotina
+# sobre a memória compartilhada: preenche 1000 palavras da sua região (2000 + 1000 * núcleo)
+# e grava a soma delas em M[100 + núcleo].
+address 0
+        lcl r1, 0
+        j comum
+        lcl r1, 1
+        j comum
+        lcl r1, 2
+        j comum
+        lcl r1, 3
+        j comum
+
+comum:  lcl r2, 1
+        zeros r3
+        lcl r7, 1000
+        lcl r10, 2000       # r10 = 2000 + 1000 * r1
+        copy r4, r1
+regiao: beq r4, r3, pronto
+        add r10, r10, r7
+        sub r4, r4, r2
+        j regiao
+
+pronto: lcl r9, 50          # passadas
+passada: copy r11, r10
+        copy r4, r7
+        copy r6, r1
+preenche: store r11, r6     # M[r11] = r6
+        add r6, r6, r2
+        add r11, r11, r2
+        sub r4, r4, r2
+        bne r4, r3, preenche
+        sub r9, r9, r2
+        bne r9, r3, passada
+
+        zeros r5            # soma da região
+        copy r11, r10
+        copy r4, r7
+soma:   load r6, r11
+        add r5, r5, r6
+        add r11, r11, r2
+        sub r4, r4, r2
+        bne r4, r3, soma
+
+        lcl r8, 100
+        add r8, r8, r1
+        store r8, r5        # M[100 + núcleo] = soma
+        halt
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.interpretador.assembler import Assembler
+from src.interpretador.interpretador import Interpretador
+from src.simulador.processador import Processador, TRACE_DESLIGADO
+from src.simulador.tradutor import TradutorBlocos
+
+EXTENSOES = (".asm", ".bin")
+
+# Instruções executadas entre duas verificações do tempo limite
+FATIA = 100_000
+
+
+def coletar_programas(entradas):
+    """
+    Expande diretórios (arquivos .asm/.bin) e manifestos (um caminho por linha) em uma lista de programas.
+    """
+    programas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for nome in sorted(os.listdir(entrada)):
+                if nome.endswith(EXTENSOES):
+                    programas.append(os.path.join(entrada, nome))
+        elif entrada.endswith(EXTENSOES):
+            programas.append(entrada)
+        else:
+            # Manifesto: caminhos relativos ao diretório do próprio manifesto
+            pasta = os.path.dirname(entrada)
+            with open(entrada, "r") as f:
+                for linha in f:
+                    linha = linha.split("#")[0].strip()
+                    if linha:
+                        programas.append(os.path.join(pasta, linha))
+    return programas
+
+
+def carregar_segmentos(caminho):
+    """
+    Monta (.asm) ou lê (.bin) o programa, sem gravar nada em disco.
+    """
+    if caminho.endswith(".asm"):
+        with open(caminho, "r") as f:
+            return Assembler.montar_fonte(f.read())
+    return Interpretador.carregar_arquivo(caminho)
+
+
+def executar_programa(caminho, orcamento=None, tempo_limite=None, motor="interpretador", memoria_esparsa=False):
+    """
+    Executa um programa até o halt, o fim do orçamento de instruções ou o tempo limite (em segundos).
+    Devolve um resumo serializável em JSON.
+    """
+    inicio = time.perf_counter()
+    resumo = {"arquivo": caminho, "status": None, "erro": None}
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO, memoria_esparsa=memoria_esparsa)
+
+    try:
+        cpu.carregar_programa(carregar_segmentos(caminho))
+        executar = TradutorBlocos(cpu).run if motor == "blocos" else cpu.run
+
+        while not cpu.halted:
+            fatia = FATIA
+            if orcamento is not None:
+                fatia = min(fatia, orcamento - cpu.contador_instrucoes)
+                if fatia <= 0:
+                    resumo["status"] = "orcamento"
+                    break
+            executar(fatia)
+            if tempo_limite is not None and time.perf_counter() - inicio > tempo_limite and not cpu.halted:
+                resumo["status"] = "tempo"
+                break
+        else:
+            resumo["status"] = "halt"
+    except Exception as e:
+        resumo["status"] = "erro"
+        resumo["erro"] = f"{type(e).__name__}: {e}"
+
+    resumo.update({
+        "pc_final": cpu.pc,
+        "instrucoes": cpu.contador_instrucoes,
+        "registradores": list(cpu.regs),
+        "tempo": time.perf_counter() - inicio,
+    })
+    return resumo
+
+
+def executar_lote(programas, orcamento=None, tempo_limite=None, processos=None, motor="interpretador",
+                  memoria_esparsa=False):
+    """
+    Distribui os programas em um pool de processos e devolve os resumos na ordem de entrada.
+    """
+    resumos = [None] * len(programas)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {
+            executor.submit(executar_programa, caminho, orcamento, tempo_limite, motor, memoria_esparsa): indice
+            for indice, caminho in enumerate(programas)
+        }
+        for futuro in as_completed(futuros):
+            indice = futuros[futuro]
+            try:
+                resumos[indice] = futuro.result()
+            except Exception as e:  # processo do pool encerrado de forma anormal
+                resumos[indice] = {"arquivo": programas[indice], "status": "erro", "erro": f"{type(e).__name__}: {e}"}
+    return resumos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa vários programas UFLA-RISC em paralelo.")
+    parser.add_argument("entradas", nargs="+", help="Diretórios, arquivos .asm/.bin ou manifestos")
+    parser.add_argument("--orcamento", type=int, default=None, help="Máximo de instruções por programa")
+    parser.add_argument("--tempo-limite", type=float, default=None, help="Tempo máximo por programa (s)")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: núcleos)")
+    parser.add_argument("--motor", choices=("interpretador", "blocos"), default="interpretador")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--memoria-esparsa", action="store_true", help="Memória paginada de 16M palavras (endereços de 24 bits)")
+    args = parser.parse_args()
+
+    programas = coletar_programas(args.entradas)
+    inicio = time.perf_counter()
+    resumos = executar_lote(programas, args.orcamento, args.tempo_limite, args.processos, args.motor, args.memoria_esparsa)
+    relatorio = {"programas": resumos, "tempo_total": time.perf_counter() - inicio}
+
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+    return 1 if any(resumo["status"] == "erro" for resumo in resumos) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
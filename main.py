@@ -1,5 +1,5 @@
 from src.interpretador.interpretador import Interpretador
-from src.interpretador.assembler import Assembler
+from src.interpretador.cache_montagem import CacheMontagem
 import os
 from src.simulador.processador import Processador
 
@@ -11,25 +11,22 @@ def main():
     # 2. Criar a pasta 'bin' se não existir
     os.makedirs(os.path.dirname(caminho_binario), exist_ok=True)
 
-    # 3. Montar o código Assembly para Binário
+    # 3. Montar o código Assembly para Binário (reaproveita a imagem em cache se a fonte não mudou)
     print(f"Montando o arquivo assembly: {caminho_assembly} -> {caminho_binario}")
     try:
-        Assembler.montar(caminho_assembly, caminho_binario)
+        caminho_imagem = CacheMontagem.montar(caminho_assembly, caminho_binario)
         print("Montagem concluída com sucesso.")
     except Exception as e:
         print(f"Erro durante a montagem: {e}")
         return # Interrompe se a montagem falhar
 
-    # 4. Carregar o arquivo binário montado no Interpretador
-    memoria = Interpretador.carregar_arquivo(caminho_binario)
-
+    # 4. Carregar a imagem montada direto na memória do processador
     cpu = Processador()
-    cpu.carregar_programa(memoria)
+    Interpretador.carregar_em(cpu, caminho_imagem)
 
     print("Programa carregado. Executando...\n")
 
-    while not cpu.halted:
-        cpu.executar_ciclo()
+    cpu.run()
 
     print("\nExecução finalizada!")
 
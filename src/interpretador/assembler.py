@@ -1,5 +1,232 @@
-import re
+from array import array
 from src.simulador.opcodes import OPCODES
+from src.interpretador.imagem import ImagemPrograma
+
+# Versão da codificação gerada pelo montador: incrementar quando a saída para uma mesma fonte
+# mudar, para invalidar o cache de montagem (ver cache_montagem.py)
+VERSAO_MONTADOR = 1
+
+# Formatos de operandos (a ordem dos operandos segue a sintaxe assembly)
+F_RRR = 0      # rc, ra, rb        -> ra (23-16) | rb (15-8) | rc (7-0)
+F_RR = 1       # rc, ra            -> ra (23-16) | rc (7-0)
+F_R = 2        # rc                -> rc (7-0)
+F_CONST = 3    # rc, const16       -> const16 (23-8) | rc (7-0)
+F_DESVIO = 4   # ra, rb, offset    -> ra (23-16) | rb (15-8) | offset (7-0)
+F_SALTO = 5    # endereço          -> endereço (23-0)
+F_JR = 6       # ra                -> ra (23-16)
+F_HALT = 7     # (sem operandos)   -> 32 bits iguais a 1
+
+_FORMATO_POR_MNEMONICO = {
+    'add': F_RRR, 'sub': F_RRR, 'xor': F_RRR, 'or': F_RRR, 'and': F_RRR,
+    'asl': F_RRR, 'asr': F_RRR, 'lsl': F_RRR, 'lsr': F_RRR,
+    'not': F_RR, 'copy': F_RR, 'load': F_RR, 'store': F_RR,
+    'zeros': F_R,
+    'lch': F_CONST, 'lcl': F_CONST,
+    'beq': F_DESVIO, 'bne': F_DESVIO,
+    'j': F_SALTO, 'jal': F_SALTO,
+    'jr': F_JR,
+    'halt': F_HALT,
+}
+
+_OPERANDOS_ESPERADOS = {
+    F_RRR: (3, "rc, ra, rb"),
+    F_RR: (2, "rc, ra"),
+    F_R: (1, "rc"),
+    F_CONST: (2, "rc, Const16"),
+    F_DESVIO: (3, "ra, rb, offset"),
+    F_SALTO: (1, "endereço"),
+    F_JR: (1, "ra"),
+}
+
+# Tabela de codificação pré-calculada: mnemônico -> (opcode já deslocado para os bits 31-24, formato)
+TABELA_CODIFICACAO = {
+    mnemonico: (int(OPCODES[mnemonico], 2) << 24, formato)
+    for mnemonico, formato in _FORMATO_POR_MNEMONICO.items()
+}
+
+REGISTRADORES = {f"r{numero}": numero for numero in range(32)}
+
+
+class ErroMontagem(Exception):
+    """
+    Erros de montagem acumulados: diagnosticos é uma lista de (número da linha, mensagem).
+    """
+
+    def __init__(self, diagnosticos):
+        self.diagnosticos = diagnosticos
+        linhas = "\n".join(f"  linha {num_linha}: {mensagem}" for num_linha, mensagem in diagnosticos)
+        super().__init__(f"{len(diagnosticos)} erro(s) de montagem:\n{linhas}")
+
+
+def _registrador(texto):
+    numero = REGISTRADORES.get(texto)
+    if numero is not None:
+        return numero
+    texto = texto.lower()
+    if texto[:1] == 'r' and texto[1:].isdigit():
+        numero = int(texto[1:])
+        if 0 <= numero <= 31:
+            return numero
+        raise ValueError(f"Número de registrador fora do intervalo (0-31): {numero}")
+    raise ValueError(f"Registrador inválido: {texto}")
+
+
+def _inteiro(texto):
+    if texto[:2] in ("0x", "0X"):
+        return int(texto, 16)
+    return int(texto)
+
+
+def _eh_rotulo(texto):
+    return texto.isidentifier()
+
+
+def codificar_instrucao(mnemonico, opcode, formato, operandos):
+    """
+    Codifica uma instrução. Devolve (palavra, rótulo): se o alvo de beq/bne/j/jal for um rótulo,
+    o campo correspondente fica zerado e o rótulo é devolvido para ser resolvido depois.
+    Levanta ValueError com a mensagem de diagnóstico.
+    """
+    if formato == F_HALT:
+        return 0xFFFFFFFF, None
+
+    quantidade, descricao = _OPERANDOS_ESPERADOS[formato]
+    if len(operandos) != quantidade:
+        raise ValueError(f"Instrução {mnemonico} requer {quantidade} operando(s) ({descricao}).")
+
+    if formato == F_RRR:
+        return opcode | (_registrador(operandos[1]) << 16) | (_registrador(operandos[2]) << 8) | _registrador(operandos[0]), None
+    if formato == F_RR:
+        return opcode | (_registrador(operandos[1]) << 16) | _registrador(operandos[0]), None
+    if formato == F_R:
+        return opcode | _registrador(operandos[0]), None
+    if formato == F_CONST:
+        rc = _registrador(operandos[0])
+        try:
+            const16 = _inteiro(operandos[1])
+        except ValueError:
+            raise ValueError(f"Constante inválida: {operandos[1]}")
+        if not 0 <= const16 <= 65535:
+            raise ValueError(f"Constante de 16 bits fora do intervalo (0 a 65535): {const16}")
+        return opcode | (const16 << 8) | rc, None
+    if formato == F_JR:
+        return opcode | (_registrador(operandos[0]) << 16), None
+    if formato == F_DESVIO:
+        palavra = opcode | (_registrador(operandos[0]) << 16) | (_registrador(operandos[1]) << 8)
+        alvo = operandos[2]
+        try:
+            offset = _inteiro(alvo)
+        except ValueError:
+            if not _eh_rotulo(alvo):
+                raise ValueError(f"Offset inválido: {alvo}")
+            return palavra, alvo
+        if not -128 <= offset <= 127:
+            raise ValueError(f"Offset fora do intervalo para 8 bits (-128 a 127): {offset}")
+        return palavra | (offset & 0xFF), None
+    # F_SALTO
+    alvo = operandos[0]
+    try:
+        endereco = _inteiro(alvo)
+    except ValueError:
+        if not _eh_rotulo(alvo):
+            raise ValueError(f"Endereço inválido: {alvo}")
+        return opcode, alvo
+    if not 0 <= endereco <= 0xFFFFFF:
+        raise ValueError(f"Endereço de 24 bits fora do intervalo: {endereco}")
+    return opcode | endereco, None
+
+
+def campo_rotulo(formato, endereco, rotulo, alvo):
+    """
+    Bits a somar na palavra da instrução em endereco para que ela aponte para o rótulo em alvo.
+    Levanta ValueError se o rótulo estiver fora do alcance do campo.
+    """
+    if formato == F_DESVIO:
+        # O desvio vai para (endereço do beq/bne + offset)
+        offset = alvo - endereco
+        if not -128 <= offset <= 127:
+            raise ValueError(f"Rótulo '{rotulo}' fora do alcance de 8 bits do desvio (offset {offset})")
+        return offset & 0xFF
+    if not 0 <= alvo <= 0xFFFFFF:
+        raise ValueError(f"Rótulo '{rotulo}' fora do intervalo de 24 bits")
+    return alvo
+
+
+# Efeito de uma linha na disposição da imagem
+LINHA_VAZIA = 0        # não gera palavra (só comentário, só rótulos ou linha com erro sem palavra)
+LINHA_ENDERECO = 1     # diretiva address: abre um segmento em valor
+LINHA_INSTRUCAO = 2    # gera uma palavra (valor)
+
+
+class LinhaAnalisada:
+    """
+    Resultado da análise de uma linha, independente das demais: rótulos definidos, efeito na
+    disposição e palavra codificada (com o campo do rótulo ainda zerado, se houver). Não guarda o
+    número da linha, então serve para qualquer linha com o mesmo texto.
+    """
+    __slots__ = ("rotulos", "tipo", "valor", "formato", "alvo", "erro")
+
+    def __init__(self, rotulos, tipo, valor=0, formato=None, alvo=None, erro=None):
+        self.rotulos = rotulos    # tupla de (nome, mensagem de erro ou None)
+        self.tipo = tipo
+        self.valor = valor        # base do segmento (LINHA_ENDERECO) ou palavra (LINHA_INSTRUCAO)
+        self.formato = formato
+        self.alvo = alvo          # rótulo referenciado pela instrução
+        self.erro = erro
+
+
+_LINHA_EM_BRANCO = LinhaAnalisada((), LINHA_VAZIA)
+
+
+def analisar_linha(linha):
+    """
+    Analisa uma linha de assembly: o analisador comum de Assembler.montar_fonte e do
+    MontadorIncremental. Rótulos duplicados só são detectados na disposição, que conhece as demais linhas.
+    """
+    # Remover comentário (tudo após "#")
+    if '#' in linha:
+        linha = linha[:linha.index('#')]
+    partes = linha.replace(',', ' ').split()
+    if not partes:  # Ignora linhas vazias ou apenas com comentários
+        return _LINHA_EM_BRANCO
+
+    # Rótulos: "nome:" no início da linha (pode haver instrução na mesma linha)
+    rotulos = ()
+    if partes[0][-1] == ':':
+        rotulos = []
+        while partes and partes[0].endswith(':'):
+            rotulo = partes.pop(0)[:-1]
+            rotulos.append((rotulo, None if _eh_rotulo(rotulo) else f"Rótulo inválido: '{rotulo}'"))
+        rotulos = tuple(rotulos)
+        if not partes:
+            return LinhaAnalisada(rotulos, LINHA_VAZIA)
+
+    mnemonico = partes[0].lower()
+
+    # Diretiva address (o endereço é lido primeiro como binário e depois como decimal)
+    if mnemonico == 'address':
+        if len(partes) != 2:
+            return LinhaAnalisada(rotulos, LINHA_VAZIA, erro="Sintaxe inválida para 'address'. Esperado: address <endereço_binário>")
+        try:
+            base = int(partes[1], 2)
+        except ValueError:
+            try:
+                base = int(partes[1])
+            except ValueError:
+                return LinhaAnalisada(rotulos, LINHA_VAZIA, erro=f"Endereço inválido: '{partes[1]}' não é um binário ou decimal válido.")
+        return LinhaAnalisada(rotulos, LINHA_ENDERECO, base)
+
+    entrada = TABELA_CODIFICACAO.get(mnemonico)
+    if entrada is None:
+        return LinhaAnalisada(rotulos, LINHA_VAZIA, erro=f"Mnemônico desconhecido: {mnemonico}")
+    opcode, formato = entrada
+
+    try:
+        palavra, alvo = codificar_instrucao(mnemonico, opcode, formato, partes[1:])
+    except ValueError as e:
+        return LinhaAnalisada(rotulos, LINHA_INSTRUCAO, 0, erro=str(e))
+    return LinhaAnalisada(rotulos, LINHA_INSTRUCAO, palavra, formato, alvo)
+
 
 class Assembler:
     """
@@ -8,193 +235,86 @@ class Assembler:
     """
 
     @staticmethod
-    def montar(caminho_assembly: str, caminho_saida_bin: str):
+    def montar(caminho_assembly: str, caminho_saida_bin: str, formato: str = "binario"):
         """
         Lê o arquivo assembly, converte para binário e salva no arquivo de saída.
+        formato: "binario" (imagem compactada, padrão) ou "texto" (uma palavra de 32 caracteres '0'/'1' por linha).
         """
-        instrucoes_binarias = []
-        
+        if formato not in ("binario", "texto"):
+            raise ValueError(f"Formato de saída desconhecido: {formato}")
+
         try:
             with open(caminho_assembly, 'r') as f:
-                linhas = f.readlines()
+                fonte = f.read()
         except FileNotFoundError:
             raise FileNotFoundError(f"O arquivo assembly '{caminho_assembly}' não foi encontrado.")
 
-        for num_linha, linha in enumerate(linhas, 1):
-            linha = linha.strip()
+        segmentos = Assembler.montar_fonte(fonte)
 
-            # Remover comentário (tudo após "#")
-            linha = linha.split('#')[0].strip()
-
-            if not linha:  # Ignora linhas vazias ou apenas com comentários
-                continue
+        if formato == "texto":
+            ImagemPrograma.escrever_texto(caminho_saida_bin, segmentos)
+        else:
+            ImagemPrograma.escrever(caminho_saida_bin, segmentos)
 
-            # Diretiva address
-            if linha.lower().startswith('address'):
-                try:
-                    partes = linha.split()
-                    if len(partes) != 2:
-                        raise ValueError("Sintaxe inválida para 'address'. Esperado: address <endereço_binário>")
-                    
-                    endereco_str = partes[1]
-                    try:
-                        int(endereco_str, 2)
-                    except ValueError:
-                        try:
-                            endereco_decimal = int(endereco_str)
-                            endereco_str = bin(endereco_decimal)[2:]  # Remove '0b'
-                        except ValueError:
-                            raise ValueError(f"Endereço inválido na linha {num_linha}: '{endereco_str}' não é um binário ou decimal válido.")
-                    
-                    instrucoes_binarias.append(f"address {endereco_str}")
-                    continue
-                except Exception as e:
-                    raise Exception(f"Erro na linha {num_linha}: {e}")
-
-            # Instrução Assembly
-            try:
-                partes = re.split(r'[,\s]+', linha)
-                mnemonico = partes[0].lower()
-                operandos = partes[1:]
+    @staticmethod
+    def montar_fonte(fonte: str) -> list:
+        """
+        Monta o texto assembly e devolve os segmentos (endereço_base, array de palavras).
 
-                print(f"Processando mnemônico: {mnemonico} com operandos: {operandos}") 
+        Uma única passada codifica as instruções direto em inteiros; referências a rótulos
+        (beq/bne/j/jal) ficam pendentes e são resolvidas ao final. Todos os erros são
+        acumulados e levantados juntos em um ErroMontagem.
+        """
+        diagnosticos = []
+        rotulos = {}
+        pendentes = []  # (palavras, índice, endereço, formato, rótulo, número da linha)
+        segmentos = []
+        palavras = None
+        base = 0
+        analisadas = {}  # texto da linha -> LinhaAnalisada (linhas repetidas são analisadas uma vez)
 
-                if mnemonico == 'halt':
-                    # Código binário para halt é 32 bits de '1'
-                    instrucao_binaria = '1' * 32  # 0xFFFFFFFF
-                elif mnemonico in OPCODES:
-                    instrucao_binaria = Assembler._codificar_instrucao(mnemonico, operandos)
-                else:
-                    raise ValueError(f"Mnemônico desconhecido: {mnemonico}")
-                
-                instrucoes_binarias.append(instrucao_binaria)
+        for num_linha, linha in enumerate(fonte.splitlines(), 1):
+            item = analisadas.get(linha)
+            if item is None:
+                item = analisadas[linha] = analisar_linha(linha)
 
-            except Exception as e:
-                raise Exception(f"Erro ao montar instrução na linha {num_linha}: {e}")
+            if item.rotulos:
+                for rotulo, erro in item.rotulos:
+                    if erro is not None:
+                        diagnosticos.append((num_linha, erro))
+                    elif rotulo in rotulos:
+                        diagnosticos.append((num_linha, f"Rótulo '{rotulo}' definido mais de uma vez"))
+                    else:
+                        rotulos[rotulo] = base + (len(palavras) if palavras is not None else 0)
+            if item.erro is not None:
+                diagnosticos.append((num_linha, item.erro))
 
-        # Salva o arquivo binário de saída (formato texto com binários de 32 bits)
-        with open(caminho_saida_bin, 'w') as f:
-            f.write('\n'.join(instrucoes_binarias) + '\n')
+            tipo = item.tipo
+            if tipo == LINHA_INSTRUCAO:
+                if palavras is None:
+                    palavras = array('I')
+                    segmentos.append((base, palavras))
+                if item.alvo is not None:
+                    pendentes.append((palavras, len(palavras), base + len(palavras), item.formato, item.alvo, num_linha))
+                palavras.append(item.valor)
+            elif tipo == LINHA_ENDERECO:
+                base = item.valor
+                palavras = array('I')
+                segmentos.append((base, palavras))
 
-    @staticmethod
-    def _codificar_instrucao(mnemonico: str, operandos: list) -> str:
-        """
-        Codifica uma instrução assembly para sua representação binária de 32 bits.
-        """
-        
-        # Mapeamento de registradores (r0 a r31) para binário de 8 bits
-        def reg_to_bin(reg_str):
-            match = re.match(r'r(\d+)', reg_str.lower())
-            if not match:
-                raise ValueError(f"Registrador inválido: {reg_str}")
-            reg_num = int(match.group(1))
-            if not 0 <= reg_num <= 31:
-                raise ValueError(f"Número de registrador fora do intervalo (0-31): {reg_num}")
-            return format(reg_num, '08b')
-
-        # Obtém o opcode da instrução
-        opcode = OPCODES.get(mnemonico)
-        if not opcode:
-            raise ValueError(f"Opcode não encontrado para o mnemônico: {mnemonico}")
-
-        # Exemplo de codificação para instruções ALU de 3 operandos
-        if mnemonico in ['add', 'sub', 'xor', 'or', 'and', 'asl', 'asr', 'lsl', 'lsr']:
-            if len(operandos) != 3:
-                raise ValueError(f"Instrução {mnemonico} requer 3 operandos (rc, ra, rb).")
-            rc, ra, rb = operandos
-            # Formato: OPCODE (31-24) | ra (23-16) | rb (15-8) | rc (7-0)
-            return opcode + reg_to_bin(ra) + reg_to_bin(rb) + reg_to_bin(rc)
-
-        # Codificação para instruções de 2 operandos (not, copy)
-        elif mnemonico == 'not' or mnemonico == 'copy':
-            if len(operandos) != 2:
-                raise ValueError(f"Instrução {mnemonico} requer 2 operandos (rc, ra).")
-            rc, ra = operandos
-            padding_rb = '0' * 8
-            return opcode + reg_to_bin(ra) + padding_rb + reg_to_bin(rc)
-
-        # Codificação para instrução ZERA
-        elif mnemonico == 'zeros':
-            if len(operandos) != 1:
-                raise ValueError(f"Instrução {mnemonico} requer 1 operando (rc).")
-            rc = operandos[0]
-            padding_ra_rb = '0' * 16
-            return opcode + padding_ra_rb + reg_to_bin(rc)
-
-        # Codificação para instruções com constante (lch, lcl)
-        elif mnemonico in ['lch', 'lcl']:
-            if len(operandos) != 2:
-                raise ValueError(f"Instrução {mnemonico} requer 2 operandos (rc, Const16).")
-            rc, const16_str = operandos
-            try:
-                const16 = int(const16_str)
-                if not 0 <= const16 <= 65535:
-                    raise ValueError("Constante de 16 bits fora do intervalo (0 a 65535).")
-                const16_bin = format(const16, '016b')
-            except ValueError as e:
-                raise ValueError(f"Constante inválida: {const16_str}. Erro: {e}")
-            
-            # Formato: OPCODE (8) | Const16 (16) | rc (8) = 32 bits
-            return opcode + const16_bin + reg_to_bin(rc)
-
-        # Codificação para LOAD/STORE (load, store)
-        elif mnemonico in ['load', 'store']:
-            if len(operandos) != 2:
-                raise ValueError(f"Instrução {mnemonico} requer 2 operandos (rc, ra).")
-            rc, ra = operandos
-            padding_rb = '0' * 8
-            return opcode + reg_to_bin(ra) + padding_rb + reg_to_bin(rc)
-
-        # =================================================================
-        # CORREÇÃO CRÍTICA AQUI: Desvios Condicionais (beq, bne)
-        # =================================================================
-        elif mnemonico in ['beq', 'bne']:
-            if len(operandos) != 3:
-                raise ValueError(f"Instrução {mnemonico} requer 3 operandos (ra, rb, offset).")
-            ra, rb, offset_str = operandos
-            
+        # Segunda etapa: resolve as referências a rótulos
+        for destino, indice, endereco, formato, rotulo, num_linha in pendentes:
+            alvo = rotulos.get(rotulo)
+            if alvo is None:
+                diagnosticos.append((num_linha, f"Rótulo não definido: '{rotulo}'"))
+                continue
             try:
-                offset = int(offset_str)
-                # O OFFSET AGORA TEM QUE SER 8 BITS PARA CABER EM 32 BITS TOTAIS
-                if not -128 <= offset <= 127:
-                    raise ValueError("Offset fora do intervalo para 8 bits (-128 a 127).")
-                
-                # '08b' GARANTE QUE SEJAM APENAS 8 BITS
-                offset_bin = format(offset & 0xFF, '08b') 
+                destino[indice] |= campo_rotulo(formato, endereco, rotulo, alvo)
             except ValueError as e:
-                raise ValueError(f"Offset inválido: {offset_str}. Erro: {e}")
-            
-            # Formato: OPCODE (8) | ra (8) | rb (8) | offset (8) = 32 bits
-            return opcode + reg_to_bin(ra) + reg_to_bin(rb) + offset_bin
+                diagnosticos.append((num_linha, str(e)))
 
-        # 2. Desvios Incondicionais (j, jal)
-        elif mnemonico in ['j', 'jal']:
-            if len(operandos) != 1:
-                raise ValueError(f"Instrução {mnemonico} requer 1 operando (endereço).")
-            endereco_str = operandos[0]
+        if diagnosticos:
+            diagnosticos.sort(key=lambda item: item[0])
+            raise ErroMontagem(diagnosticos)
 
-            try:
-                if endereco_str.startswith("0x") or endereco_str.startswith("0X"):
-                    endereco = int(endereco_str, 16)
-                else:
-                    endereco = int(endereco_str)
-                
-                if not 0 <= endereco <= 16777215: # 2^24 - 1
-                    raise ValueError("Endereço de 24 bits fora do intervalo.")
-                
-                endereco_bin = format(endereco, '024b')
-            except ValueError as e:
-                raise ValueError(f"Endereço inválido: {endereco_str}. Erro: {e}")
-            
-            # Formato: OPCODE (8) | endereço (24) = 32 bits
-            return opcode + endereco_bin
-
-        # 3. Desvio por Registrador (jr)
-        elif mnemonico == 'jr':
-            if len(operandos) != 1:
-                raise ValueError(f"Instrução {mnemonico} requer 1 operando (ra).")
-            ra = operandos[0]
-            padding = '0' * 16
-            return opcode + reg_to_bin(ra) + padding
-
-        raise NotImplementedError(f"Codificação para a instrução '{mnemonico}' não implementada.")
\ No newline at end of file
+        return segmentos
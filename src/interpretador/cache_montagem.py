@@ -0,0 +1,99 @@
+import hashlib
+import os
+import tempfile
+
+from src.interpretador.assembler import Assembler, VERSAO_MONTADOR
+from src.interpretador.imagem import ImagemPrograma, VERSAO as VERSAO_IMAGEM
+from src.interpretador.interpretador import Interpretador
+from src.simulador.processador import Processador
+
+# Diretório padrão do cache (pode ser trocado pela variável de ambiente UFLA_RISC_CACHE)
+DIRETORIO_PADRAO = ".cache_montagem"
+
+
+class CacheMontagem:
+    """
+    Cache de montagem endereçado por conteúdo: a imagem binária de uma fonte assembly fica em
+    <diretório>/<sha256>.bin, onde o hash cobre o texto da fonte e as versões do montador e do
+    formato de imagem. Se a fonte não mudou, a imagem já montada é reaproveitada e basta mapeá-la
+    na memória (Interpretador.carregar_em).
+    """
+
+    @staticmethod
+    def diretorio_padrao():
+        return os.environ.get("UFLA_RISC_CACHE", DIRETORIO_PADRAO)
+
+    @staticmethod
+    def chave(fonte: bytes) -> str:
+        h = hashlib.sha256()
+        h.update(f"montador={VERSAO_MONTADOR};imagem={VERSAO_IMAGEM}\0".encode("ascii"))
+        h.update(fonte)
+        return h.hexdigest()
+
+    @staticmethod
+    def montar(caminho_assembly, caminho_saida=None, diretorio=None):
+        """
+        Devolve o caminho da imagem em cache da fonte, montando-a só se ainda não estiver lá.
+        Com caminho_saida, também deixa uma cópia da imagem nesse arquivo (regravada apenas se diferente).
+        """
+        try:
+            with open(caminho_assembly, "rb") as f:
+                fonte = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"O arquivo assembly '{caminho_assembly}' não foi encontrado.")
+
+        diretorio = diretorio or CacheMontagem.diretorio_padrao()
+        caminho_imagem = os.path.join(diretorio, CacheMontagem.chave(fonte) + ".bin")
+
+        dados = None
+        if not os.path.exists(caminho_imagem):
+            dados = ImagemPrograma.codificar(Assembler.montar_fonte(fonte.decode("utf-8")))
+            CacheMontagem._gravar(caminho_imagem, dados)
+
+        if caminho_saida is not None:
+            if dados is None:
+                with open(caminho_imagem, "rb") as f:
+                    dados = f.read()
+            CacheMontagem._atualizar(caminho_saida, dados)
+
+        return caminho_imagem
+
+    @staticmethod
+    def _gravar(caminho, dados):
+        # Grava em um temporário e renomeia: outro processo nunca vê uma imagem pela metade
+        pasta = os.path.dirname(caminho) or "."
+        os.makedirs(pasta, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+        except BaseException:
+            os.remove(temporario)
+            raise
+
+    @staticmethod
+    def _atualizar(caminho, dados):
+        try:
+            if os.path.getsize(caminho) == len(dados):
+                with open(caminho, "rb") as f:
+                    if f.read() == dados:
+                        return
+        except FileNotFoundError:
+            pass
+        CacheMontagem._gravar(caminho, dados)
+
+
+def load_program(caminho, cpu=None, diretorio_cache=None):
+    """
+    Carrega um programa no processador (um Processador novo se cpu for None) e o devolve.
+    Fontes .asm passam pelo cache de montagem; imagens binárias ou no formato texto legado são
+    carregadas diretamente.
+    """
+    if cpu is None:
+        cpu = Processador()
+
+    if caminho.endswith(".asm"):
+        caminho = CacheMontagem.montar(caminho, diretorio=diretorio_cache)
+    Interpretador.carregar_em(cpu, caminho)
+    return cpu
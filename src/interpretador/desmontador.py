@@ -0,0 +1,45 @@
+from src.interpretador.assembler import (
+    TABELA_CODIFICACAO, F_RRR, F_RR, F_R, F_CONST, F_DESVIO, F_SALTO, F_JR,
+)
+
+# Opcode -> (mnemônico, formato), inverso da tabela do assembler
+_POR_OPCODE = {opcode >> 24: (mnemonico, formato) for mnemonico, (opcode, formato) in TABELA_CODIFICACAO.items()}
+
+
+class Desmontador:
+    """
+    Converte palavras de 32 bits de volta para a sintaxe assembly UFLA-RISC.
+    """
+
+    @staticmethod
+    def desmontar(palavra: int) -> str:
+        if palavra == 0xFFFFFFFF:
+            return "halt"
+        if palavra == 0:
+            return "nop"
+
+        entrada = _POR_OPCODE.get((palavra >> 24) & 0xFF)
+        if entrada is None:
+            return f".word 0x{palavra:08X}"
+        mnemonico, formato = entrada
+
+        ra = (palavra >> 16) & 0xFF
+        rb = (palavra >> 8) & 0xFF
+        rc = palavra & 0xFF
+        if formato == F_RRR:
+            return f"{mnemonico} r{rc}, r{ra}, r{rb}"
+        if formato == F_RR:
+            return f"{mnemonico} r{rc}, r{ra}"
+        if formato == F_R:
+            return f"{mnemonico} r{rc}"
+        if formato == F_CONST:
+            return f"{mnemonico} r{rc}, {(palavra >> 8) & 0xFFFF}"
+        if formato == F_DESVIO:
+            offset = rc - 256 if rc > 127 else rc
+            return f"{mnemonico} r{ra}, r{rb}, {offset}"
+        if formato == F_SALTO:
+            return f"{mnemonico} {palavra & 0xFFFFFF}"
+        if formato == F_JR:
+            return f"{mnemonico} r{ra}"
+        # F_HALT só é válido como a palavra com 32 bits iguais a 1 (tratada acima)
+        return f".word 0x{palavra:08X}"
@@ -0,0 +1,138 @@
+import os
+import struct
+import sys
+from array import array
+
+# Formato binário compactado da imagem de programa:
+#   cabeçalho: magic (4 bytes) | versão (uint16) | reservado (uint16) | número de segmentos (uint32)
+#   segmento:  endereço base (uint32) | quantidade de palavras (uint32) | palavras (uint32 cada)
+# Todos os campos em little-endian.
+MAGIC = b"URSC"
+VERSAO = 1
+
+_CABECALHO = struct.Struct("<4sHHI")
+_SEGMENTO = struct.Struct("<II")
+_PALAVRA = struct.Struct("<I")
+
+_HOST_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class ImagemPrograma:
+    """
+    Leitura e escrita de imagens de programa: uma lista de segmentos (endereço_base, palavras).
+    """
+
+    @staticmethod
+    def eh_binaria(caminho: str) -> bool:
+        """
+        Verifica pelo magic se o arquivo está no formato binário compactado.
+        """
+        with open(caminho, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+
+    @staticmethod
+    def codificar(segmentos) -> bytes:
+        """
+        Serializa os segmentos no formato binário.
+        """
+        partes = [_CABECALHO.pack(MAGIC, VERSAO, 0, len(segmentos))]
+        for base, palavras in segmentos:
+            if not isinstance(palavras, array) or palavras.typecode != "I":
+                palavras = array("I", palavras)
+            if not _HOST_LITTLE_ENDIAN:
+                palavras = array("I", palavras)
+                palavras.byteswap()
+            partes.append(_SEGMENTO.pack(base, len(palavras)))
+            partes.append(palavras.tobytes())
+        return b"".join(partes)
+
+    @staticmethod
+    def decodificar(buffer):
+        """
+        Interpreta um buffer (bytes, mmap...) no formato binário e devolve os segmentos.
+        Em hosts little-endian as palavras são memoryviews sobre o próprio buffer (sem cópia).
+        """
+        visao = memoryview(buffer)
+        if len(visao) < _CABECALHO.size:
+            raise ValueError("Imagem binária truncada: cabeçalho incompleto.")
+
+        magic, versao, _, quantidade = _CABECALHO.unpack_from(visao, 0)
+        if magic != MAGIC:
+            raise ValueError("Arquivo não está no formato binário UFLA-RISC.")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de imagem não suportada: {versao} (esperada {VERSAO}).")
+
+        segmentos = []
+        posicao = _CABECALHO.size
+        for _ in range(quantidade):
+            if posicao + _SEGMENTO.size > len(visao):
+                raise ValueError("Imagem binária truncada: cabeçalho de segmento incompleto.")
+            base, tamanho = _SEGMENTO.unpack_from(visao, posicao)
+            posicao += _SEGMENTO.size
+            fim = posicao + 4 * tamanho
+            if fim > len(visao):
+                raise ValueError(f"Imagem binária truncada: segmento em {base} incompleto.")
+
+            if _HOST_LITTLE_ENDIAN:
+                palavras = visao[posicao:fim].cast("I")
+            else:
+                palavras = array("I")
+                palavras.frombytes(visao[posicao:fim])
+                palavras.byteswap()
+            segmentos.append((base, palavras))
+            posicao = fim
+        return segmentos
+
+    @staticmethod
+    def escrever(caminho: str, segmentos):
+        """
+        Grava a imagem no formato binário.
+        """
+        with open(caminho, "wb") as f:
+            f.write(ImagemPrograma.codificar(segmentos))
+
+    @staticmethod
+    def corrigir(caminho: str, segmentos, alteracoes):
+        """
+        Regrava no lugar palavras de uma imagem binária já escrita com os mesmos segmentos
+        (mesmas bases e tamanhos). alteracoes: iterável de (índice do segmento, índice da palavra, valor).
+        Devolve False, sem tocar no arquivo, se ele não existir ou o tamanho não bater com os segmentos.
+        """
+        inicios = []
+        posicao = _CABECALHO.size
+        for _, palavras in segmentos:
+            posicao += _SEGMENTO.size
+            inicios.append(posicao)
+            posicao += 4 * len(palavras)
+
+        try:
+            if os.path.getsize(caminho) != posicao:
+                return False
+        except FileNotFoundError:
+            return False
+
+        with open(caminho, "r+b") as f:
+            for indice_segmento, indice, valor in sorted(alteracoes):
+                f.seek(inicios[indice_segmento] + 4 * indice)
+                f.write(_PALAVRA.pack(valor))
+        return True
+
+    @staticmethod
+    def ler(caminho: str):
+        """
+        Lê a imagem binária com uma única leitura do arquivo.
+        """
+        with open(caminho, "rb") as f:
+            return ImagemPrograma.decodificar(f.read())
+
+    @staticmethod
+    def escrever_texto(caminho: str, segmentos):
+        """
+        Exporta a imagem no formato texto legado (diretivas 'address' e palavras de 32 caracteres '0'/'1').
+        """
+        linhas = []
+        for base, palavras in segmentos:
+            linhas.append(f"address {base:b}")
+            linhas.extend(format(palavra, "032b") for palavra in palavras)
+        with open(caminho, "w") as f:
+            f.write("\n".join(linhas) + "\n")
@@ -1,44 +1,76 @@
+import mmap
+from array import array
+
+from src.interpretador.imagem import ImagemPrograma
+
+
 class Interpretador:
     @staticmethod
     def carregar_arquivo(caminho):
-        memoria_carregada = {}
-        endereco_atual = 0
-
+        """
+        Carrega uma imagem de programa e devolve a lista de segmentos (endereço_base, palavras).
+        Aceita o formato binário compactado e o formato texto legado.
+        """
         try:
-            # O montador gera um arquivo de texto com instruções binárias de 32 bits e diretivas 'address'.
-            # O interpretador agora assume que o arquivo de entrada está neste formato.
-            with open(caminho, "r") as f:
-                for linha in f:
-                    linha = linha.strip()
-
-                    if linha == "":
-                        continue
-
-                    # Verifica se a linha começa com a diretiva 'address'
-                    if linha.lower().startswith("address"):
-                        partes = linha.split()
-                        if len(partes) != 2:
-                            raise ValueError(f"Diretiva inválida: {linha}")
-                        try:
-                            endereco_atual = int(partes[1], 2)  # Trata o endereço como binário
-                        except ValueError:
-                            raise ValueError(f"Endereço inválido na linha {linha}")
-                        continue
-
-                    # Verificar se a linha tem exatamente 32 bits
-                    if all(c in "01" for c in linha) and len(linha) == 32:
-                        try:
-                            instrucao = int(linha, 2)
-                            memoria_carregada[endereco_atual] = instrucao
-                            endereco_atual += 1
-                        except ValueError:
-                            raise ValueError(f"Erro ao processar instrução binária: {linha}")
-                    else:
-                        raise ValueError(f"Linha inválida encontrada: {linha} (Deve ter exatamente 32 bits de '0' ou '1')")
-
+            if ImagemPrograma.eh_binaria(caminho):
+                return ImagemPrograma.ler(caminho)
+            return Interpretador._carregar_texto(caminho)
         except FileNotFoundError:
             raise FileNotFoundError(f"O arquivo {caminho} não foi encontrado.")
-        except Exception as e:
-            raise e
 
-        return memoria_carregada
\ No newline at end of file
+    @staticmethod
+    def carregar_em(cpu, caminho):
+        """
+        Mapeia o arquivo binário (mmap) e copia os segmentos direto para a memória do processador.
+        Arquivos no formato texto são lidos normalmente.
+        """
+        if not ImagemPrograma.eh_binaria(caminho):
+            cpu.carregar_programa(Interpretador._carregar_texto(caminho))
+            return
+
+        with open(caminho, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            segmentos = ImagemPrograma.decodificar(mapa)
+            try:
+                cpu.carregar_programa(segmentos)
+            finally:
+                # As memoryviews precisam ser liberadas antes de fechar o mmap
+                for _, palavras in segmentos:
+                    if isinstance(palavras, memoryview):
+                        palavras.release()
+
+    @staticmethod
+    def _carregar_texto(caminho):
+        segmentos = []
+        palavras = None
+
+        # O formato texto tem instruções binárias de 32 bits e diretivas 'address'.
+        with open(caminho, "r") as f:
+            for linha in f:
+                linha = linha.strip()
+
+                if linha == "":
+                    continue
+
+                # Verifica se a linha começa com a diretiva 'address'
+                if linha.lower().startswith("address"):
+                    partes = linha.split()
+                    if len(partes) != 2:
+                        raise ValueError(f"Diretiva inválida: {linha}")
+                    try:
+                        endereco_atual = int(partes[1], 2)  # Trata o endereço como binário
+                    except ValueError:
+                        raise ValueError(f"Endereço inválido na linha {linha}")
+                    palavras = array("I")
+                    segmentos.append((endereco_atual, palavras))
+                    continue
+
+                # Verificar se a linha tem exatamente 32 bits
+                if len(linha) == 32 and not linha.strip("01"):
+                    if palavras is None:
+                        palavras = array("I")
+                        segmentos.append((0, palavras))
+                    palavras.append(int(linha, 2))
+                else:
+                    raise ValueError(f"Linha inválida encontrada: {linha} (Deve ter exatamente 32 bits de '0' ou '1')")
+
+        return segmentos
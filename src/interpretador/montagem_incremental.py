@@ -0,0 +1,417 @@
+import argparse
+import os
+import sys
+import time
+from array import array
+
+from src.interpretador.assembler import LINHA_ENDERECO, LINHA_INSTRUCAO, LINHA_VAZIA, ErroMontagem, analisar_linha, campo_rotulo
+from src.interpretador.imagem import ImagemPrograma
+
+# Modos da última montagem (MontadorIncremental.ultima["modo"])
+MODO_COMPLETO = "completo"        # todas as linhas dispostas de novo (a partir do cache por linha)
+MODO_INCREMENTAL = "incremental"  # só as linhas alteradas e os dependentes dos rótulos que mudaram
+MODO_INALTERADO = "inalterado"    # a fonte não mudou
+
+_BLOCO_COMPARACAO = 256
+
+
+def _trecho_comum(a, b, limite, do_fim):
+    """
+    Quantidade de linhas iguais no início (ou no fim) das duas listas, até limite. Compara blocos
+    de linhas de uma vez (igualdade de listas em C) e só refina linha a linha no último bloco.
+    """
+    n = 0
+    while n + _BLOCO_COMPARACAO <= limite:
+        if do_fim:
+            iguais = a[len(a) - n - _BLOCO_COMPARACAO:len(a) - n] == b[len(b) - n - _BLOCO_COMPARACAO:len(b) - n]
+        else:
+            iguais = a[n:n + _BLOCO_COMPARACAO] == b[n:n + _BLOCO_COMPARACAO]
+        if not iguais:
+            break
+        n += _BLOCO_COMPARACAO
+    if do_fim:
+        while n < limite and a[-1 - n] == b[-1 - n]:
+            n += 1
+    else:
+        while n < limite and a[n] == b[n]:
+            n += 1
+    return n
+
+
+def _endereco(segmentos, cursor):
+    segmento, indice = cursor
+    return (segmentos[segmento][0] if segmento >= 0 else 0) + indice
+
+
+def _avancar(item, segmento, indice):
+    """
+    Cursor (segmento, índice da próxima palavra) depois da linha; segmento -1 antes de qualquer segmento.
+    """
+    if item.tipo == LINHA_INSTRUCAO:
+        if segmento < 0:
+            return 0, 1
+        return segmento, indice + 1
+    if item.tipo == LINHA_ENDERECO:
+        return segmento + 1, 0
+    return segmento, indice
+
+
+class MontadorIncremental:
+    """
+    Montador que mantém o estado da última montagem de um arquivo para remontá-lo depois de uma
+    edição sem refazer tudo:
+
+    - cache por texto de linha: só linhas novas ou alteradas são analisadas e codificadas;
+    - cursor por linha (segmento, índice da próxima palavra), que dá o endereço de cada rótulo;
+    - índice de dependências rótulo -> palavras que o referenciam.
+
+    Quando a edição não muda a disposição (mesma sequência de instruções e diretivas address e
+    nenhum rótulo novo em conflito), só as palavras das linhas alteradas e dos desvios/saltos para
+    rótulos que mudaram de endereço são recodificadas, e a imagem binária de saída é corrigida no
+    lugar. Caso contrário as linhas são dispostas de novo a partir do cache (sem reanalisar) e a
+    saída só é regravada inteira se a forma dos segmentos mudou.
+
+    O resultado e os diagnósticos são sempre os mesmos de Assembler.montar_fonte. Em caso de erro
+    o estado da última montagem bem-sucedida é mantido.
+    """
+
+    def __init__(self, caminho_assembly, caminho_saida=None, formato="binario"):
+        if formato not in ("binario", "texto"):
+            raise ValueError(f"Formato de saída desconhecido: {formato}")
+        self.caminho_assembly = caminho_assembly
+        self.caminho_saida = caminho_saida
+        self.formato = formato
+
+        self._analisadas = {}   # texto da linha -> LinhaAnalisada
+        self.linhas = []        # texto das linhas da última montagem
+        self.itens = []         # LinhaAnalisada de cada linha
+        self.cursores = []      # cursor no início de cada linha
+        self.segmentos = []     # [(base, array('I'))]
+        self.rotulos = {}       # rótulo -> endereço
+        self.referencias = {}   # (segmento, índice) -> (formato, rótulo, palavra com o campo zerado)
+        self.dependentes = {}   # rótulo -> conjunto de (segmento, índice)
+        self.montado = False
+        self.ultima = {}
+
+    def _analisar(self, linha):
+        item = self._analisadas.get(linha)
+        if item is None:
+            item = self._analisadas[linha] = analisar_linha(linha)
+        return item
+
+    def montar(self):
+        """
+        Lê o arquivo assembly, remonta o que mudou e atualiza a saída. Devolve os segmentos.
+        """
+        try:
+            with open(self.caminho_assembly, 'r') as f:
+                fonte = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"O arquivo assembly '{self.caminho_assembly}' não foi encontrado.")
+        return self.atualizar(fonte)
+
+    def atualizar(self, fonte: str):
+        """
+        Remonta a partir do novo texto da fonte e atualiza a saída (se houver). Devolve os segmentos.
+        """
+        inicio = time.perf_counter()
+        linhas = fonte.splitlines()
+        analisadas_antes = len(self._analisadas)
+
+        if not self.montado:
+            modo, alteracoes = self._montar_completo(linhas)
+        else:
+            antigas = self.linhas
+            prefixo = _trecho_comum(antigas, linhas, min(len(antigas), len(linhas)), False)
+            sufixo = _trecho_comum(antigas, linhas, min(len(antigas), len(linhas)) - prefixo, True)
+
+            if prefixo == len(antigas) == len(linhas):
+                modo, alteracoes = MODO_INALTERADO, []
+            else:
+                alteracoes = self._montar_regiao(linhas, prefixo, len(antigas) - sufixo, len(linhas) - sufixo)
+                modo = MODO_INCREMENTAL
+                if alteracoes is None:
+                    modo, alteracoes = self._montar_completo(linhas)
+
+        analisadas = len(self._analisadas) - analisadas_antes
+        # Descarta do cache linhas que saíram da fonte
+        if len(self._analisadas) > 2 * len(self.linhas) + 1024:
+            self._analisadas = {linha: item for linha, item in zip(self.linhas, self.itens)}
+
+        self.ultima = {
+            "modo": modo,
+            "linhas": len(linhas),
+            "linhas_analisadas": analisadas,
+            "palavras_alteradas": len(alteracoes) if alteracoes is not None else sum(len(p) for _, p in self.segmentos),
+            "tempo": time.perf_counter() - inicio,
+        }
+        return self.segmentos
+
+    def _montar_regiao(self, linhas, inicio, fim_antigo, fim_novo):
+        """
+        Caminho incremental: as linhas [inicio, fim_antigo) foram trocadas por linhas[inicio:fim_novo].
+        Devolve as palavras alteradas ou None se a disposição mudou (ou há erros a relatar).
+        """
+        antigos = self.itens[inicio:fim_antigo]
+        novos = [self._analisar(linha) for linha in linhas[inicio:fim_novo]]
+
+        forma_antiga = [(item.tipo, item.valor if item.tipo == LINHA_ENDERECO else 0) for item in antigos if item.tipo != LINHA_VAZIA]
+        forma_nova = [(item.tipo, item.valor if item.tipo == LINHA_ENDERECO else 0) for item in novos if item.tipo != LINHA_VAZIA]
+        if forma_antiga != forma_nova:
+            return None
+
+        segmentos = self.segmentos
+        if inicio < len(self.cursores):
+            cursor = self.cursores[inicio]
+        elif self.itens:
+            cursor = _avancar(self.itens[-1], *self.cursores[-1])
+        else:
+            cursor = (-1, 0)
+
+        rotulos_antigos = {}
+        for item, cursor_antigo in zip(antigos, self.cursores[inicio:fim_antigo]):
+            for rotulo, _ in item.rotulos:
+                rotulos_antigos[rotulo] = _endereco(segmentos, cursor_antigo)
+
+        # Cursores, rótulos e palavras da região nova
+        cursores = []
+        rotulos_novos = {}
+        posicoes = []  # (segmento, índice, item) de cada instrução da região
+        segmento, indice = cursor
+        for item in novos:
+            if item.erro is not None:
+                return None
+            cursores.append((segmento, indice))
+            for rotulo, erro in item.rotulos:
+                if erro is not None or rotulo in rotulos_novos:
+                    return None
+                if rotulo not in rotulos_antigos and rotulo in self.rotulos:
+                    return None
+                rotulos_novos[rotulo] = _endereco(segmentos, (segmento, indice))
+            segmento, indice = _avancar(item, segmento, indice)
+            if item.tipo == LINHA_INSTRUCAO:
+                posicoes.append((segmento, indice - 1, item))
+
+        rotulos = dict(self.rotulos)
+        movidos = set()
+        for rotulo in rotulos_antigos.keys() | rotulos_novos.keys():
+            endereco = rotulos_novos.get(rotulo)
+            if endereco != rotulos_antigos.get(rotulo):
+                movidos.add(rotulo)
+                if endereco is None:
+                    del rotulos[rotulo]
+                else:
+                    rotulos[rotulo] = endereco
+
+        # Recodifica as instruções da região e as que referenciam rótulos que mudaram
+        novas = {}
+        referencias = {}
+        for segmento, indice, item in posicoes:
+            palavra = item.valor
+            if item.alvo is not None:
+                alvo = rotulos.get(item.alvo)
+                if alvo is None:
+                    return None
+                referencias[(segmento, indice)] = (item.formato, item.alvo, palavra)
+                try:
+                    palavra |= campo_rotulo(item.formato, segmentos[segmento][0] + indice, item.alvo, alvo)
+                except ValueError:
+                    return None
+            novas[(segmento, indice)] = palavra
+
+        for rotulo in movidos:
+            for posicao in self.dependentes.get(rotulo, ()):
+                if posicao in novas:
+                    continue
+                formato, _, palavra = self.referencias[posicao]
+                alvo = rotulos.get(rotulo)
+                if alvo is None:
+                    return None
+                try:
+                    novas[posicao] = palavra | campo_rotulo(formato, segmentos[posicao[0]][0] + posicao[1], rotulo, alvo)
+                except ValueError:
+                    return None
+
+        # Sem erros: aplica ao estado
+        for segmento, indice, _ in posicoes:
+            antiga = self.referencias.pop((segmento, indice), None)
+            if antiga is not None:
+                self.dependentes[antiga[1]].discard((segmento, indice))
+        for posicao, referencia in referencias.items():
+            self.referencias[posicao] = referencia
+            self.dependentes.setdefault(referencia[1], set()).add(posicao)
+
+        self.rotulos = rotulos
+        self.linhas = linhas
+        self.itens[inicio:fim_antigo] = novos
+        self.cursores[inicio:fim_antigo] = cursores
+
+        alteracoes = []
+        for (segmento, indice), palavra in novas.items():
+            palavras = segmentos[segmento][1]
+            if palavras[indice] != palavra:
+                palavras[indice] = palavra
+                alteracoes.append((segmento, indice, palavra))
+        self._gravar(alteracoes)
+        return alteracoes
+
+    def _montar_completo(self, linhas):
+        """
+        Dispõe todas as linhas (analisando só as que não estão no cache) e resolve os rótulos.
+        """
+        itens = [self._analisar(linha) for linha in linhas]
+
+        diagnosticos = []
+        rotulos = {}
+        referencias = {}
+        cursores = []
+        segmentos = []
+        segmento, indice = -1, 0
+        for num_linha, item in enumerate(itens, 1):
+            cursores.append((segmento, indice))
+            if item.rotulos:
+                endereco = _endereco(segmentos, (segmento, indice))
+                for rotulo, erro in item.rotulos:
+                    if erro is not None:
+                        diagnosticos.append((num_linha, erro))
+                    elif rotulo in rotulos:
+                        diagnosticos.append((num_linha, f"Rótulo '{rotulo}' definido mais de uma vez"))
+                    else:
+                        rotulos[rotulo] = endereco
+
+            if item.tipo == LINHA_INSTRUCAO:
+                if segmento < 0:
+                    segmentos.append((0, array('I')))
+                segmento, indice = _avancar(item, segmento, indice)
+                segmentos[segmento][1].append(item.valor)
+                if item.alvo is not None:
+                    referencias[(segmento, indice - 1)] = (item.formato, item.alvo, item.valor, num_linha)
+            elif item.tipo == LINHA_ENDERECO:
+                segmentos.append((item.valor, array('I')))
+                segmento, indice = _avancar(item, segmento, indice)
+
+            if item.erro is not None:
+                diagnosticos.append((num_linha, item.erro))
+
+        dependentes = {}
+        for (segmento, indice), (formato, rotulo, _, num_linha) in referencias.items():
+            alvo = rotulos.get(rotulo)
+            if alvo is None:
+                diagnosticos.append((num_linha, f"Rótulo não definido: '{rotulo}'"))
+                continue
+            try:
+                segmentos[segmento][1][indice] |= campo_rotulo(formato, segmentos[segmento][0] + indice, rotulo, alvo)
+            except ValueError as e:
+                diagnosticos.append((num_linha, str(e)))
+            dependentes.setdefault(rotulo, set()).add((segmento, indice))
+
+        if diagnosticos:
+            diagnosticos.sort(key=lambda item: item[0])
+            raise ErroMontagem(diagnosticos)
+
+        anteriores = self.segmentos
+        mesma_forma = self.montado and len(anteriores) == len(segmentos) and all(
+            base == base_anterior and len(palavras) == len(palavras_anteriores)
+            for (base, palavras), (base_anterior, palavras_anteriores) in zip(segmentos, anteriores)
+        )
+
+        self.linhas = linhas
+        self.itens = itens
+        self.cursores = cursores
+        self.segmentos = segmentos
+        self.rotulos = rotulos
+        self.referencias = {posicao: referencia[:3] for posicao, referencia in referencias.items()}
+        self.dependentes = dependentes
+        self.montado = True
+
+        if not mesma_forma:
+            self._gravar(None)
+            return MODO_COMPLETO, None
+
+        alteracoes = []
+        for indice_segmento, ((_, palavras), (_, palavras_anteriores)) in enumerate(zip(segmentos, anteriores)):
+            if palavras != palavras_anteriores:
+                alteracoes.extend(
+                    (indice_segmento, indice, palavra)
+                    for indice, (palavra, anterior) in enumerate(zip(palavras, palavras_anteriores))
+                    if palavra != anterior
+                )
+        self._gravar(alteracoes)
+        return MODO_COMPLETO, alteracoes
+
+    def _gravar(self, alteracoes):
+        """
+        Atualiza a saída: corrige no lugar as palavras alteradas da imagem binária ou, se a forma
+        mudou (alteracoes None), o arquivo não bate com o estado ou o formato é texto, regrava tudo.
+        """
+        caminho = self.caminho_saida
+        if caminho is None or alteracoes == []:
+            return
+        if self.formato == "texto":
+            ImagemPrograma.escrever_texto(caminho, self.segmentos)
+            return
+        if alteracoes is None or not ImagemPrograma.corrigir(caminho, self.segmentos, alteracoes):
+            ImagemPrograma.escrever(caminho, self.segmentos)
+
+    def observar(self, intervalo=0.05, ao_montar=None, ao_falhar=None, parar=None):
+        """
+        Modo watch: verifica o arquivo a cada intervalo segundos e remonta quando ele muda.
+        ao_montar(segmentos) e ao_falhar(erro) são chamados a cada remontagem; parar() encerra o laço.
+        """
+        assinatura = None
+        while parar is None or not parar():
+            try:
+                estado = os.stat(self.caminho_assembly)
+                atual = (estado.st_mtime_ns, estado.st_size)
+            except FileNotFoundError:
+                atual = None
+            if atual is not None and atual != assinatura:
+                assinatura = atual
+                try:
+                    segmentos = self.montar()
+                except (ErroMontagem, OSError) as erro:
+                    if ao_falhar is not None:
+                        ao_falhar(erro)
+                else:
+                    if ao_montar is not None:
+                        ao_montar(segmentos)
+            time.sleep(intervalo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remonta um programa UFLA-RISC a cada alteração da fonte.")
+    parser.add_argument("programa", help="Arquivo .asm")
+    parser.add_argument("saida", help="Imagem de saída (.bin)")
+    parser.add_argument("--formato", choices=("binario", "texto"), default="binario")
+    parser.add_argument("--intervalo", type=float, default=0.05, help="Segundos entre verificações do arquivo")
+    parser.add_argument("--executar", action="store_true", help="Executa o programa até o halt após cada montagem")
+    parser.add_argument("--max-steps", type=int, default=None)
+    args = parser.parse_args()
+
+    montador = MontadorIncremental(args.programa, args.saida, args.formato)
+
+    def ao_montar(segmentos):
+        ultima = montador.ultima
+        print(f"[{ultima['modo']}] {ultima['linhas']} linhas, {ultima['linhas_analisadas']} analisadas, "
+              f"{ultima['palavras_alteradas']} palavras alteradas em {ultima['tempo'] * 1000:.2f} ms")
+        if args.executar:
+            from src.simulador.processador import Processador, TRACE_DESLIGADO
+            cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+            cpu.carregar_programa(segmentos)
+            cpu.run(args.max_steps)
+            print(f"  {cpu.contador_instrucoes} instruções, PC={cpu.pc}, halted={cpu.halted}")
+            print("  " + "  ".join(f"R{j:02}={cpu.regs[j]}" for j in range(32) if cpu.regs[j]))
+
+    def ao_falhar(erro):
+        print(erro, file=sys.stderr)
+
+    print(f"Observando {args.programa} (Ctrl+C para sair)")
+    try:
+        montador.observar(args.intervalo, ao_montar, ao_falhar)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
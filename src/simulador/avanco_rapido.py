@@ -0,0 +1,224 @@
+from math import gcd
+
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.instrucoes import FLAGS_ADD, FLAGS_SUB
+from src.simulador.decodificador import Decodificador
+
+OP = UnidadeControle.OPCODES
+
+HALT = 0xFFFFFFFF
+MODULO = 1 << 32
+
+
+class LacoAfim:
+    """
+    Laço [inicio, fim] cujo corpo só soma/subtrai de registradores valores invariantes
+    (registradores não escritos no corpo) e termina em um beq/bne/j em fim.
+    """
+    __slots__ = ("inicio", "fim", "tamanho", "passos", "ultima_alu", "saida")
+
+    def __init__(self, inicio, fim, passos, ultima_alu, saida):
+        self.inicio = inicio
+        self.fim = fim
+        self.tamanho = fim - inicio + 1  # instruções por iteração, contando o desvio
+        self.passos = passos             # [(rd, rk, subtrai)]: rd += regs[rk] ou rd -= regs[rk]
+        self.ultima_alu = ultima_alu     # (tipo, rd, rk, rd_eh_a) da última soma/subtração, ou None
+        self.saida = saida               # (opcode, ra, rb) do desvio; opcode J para salto incondicional
+
+
+class AvancoRapido:
+    """
+    Execução com avanço rápido de laços ociosos (Processador.avanco_rapido = True).
+
+    Sempre que um desvio volta para trás, o laço [alvo, desvio] é analisado. Se o corpo só
+    incrementa registradores por valores constantes (contadores) e a saída depende apenas deles,
+    o número de iterações até a saída é obtido resolvendo k * passo = -diferença (mod 2^32), e o
+    estado final (registradores, flags, PC e contador de instruções) é escrito diretamente.
+    Laços cujo estado não muda nunca terminam: o orçamento (max_steps) é consumido de uma vez e,
+    sem orçamento, o run() retorna com cpu.parada indicando o laço infinito.
+    """
+
+    @staticmethod
+    def run(cpu, max_steps=None):
+        """
+        Mesmo laço de Processador.run (trace desligado), verificando os desvios para trás.
+        """
+        if cpu.halted:
+            return 0
+        cpu.parada = None
+
+        lacos = cpu.lacos_analisados
+        if lacos is None:
+            lacos = cpu.lacos_analisados = {}
+            cpu.ouvintes_codigo.append(lambda endereco: lacos.clear())
+
+        cache = cpu.cache_instrucoes
+        memoria = cpu.memoria
+        regs = cpu.regs
+        tamanho = len(memoria)
+        limite = -1 if max_steps is None else max_steps
+        executadas = 0
+        decodificada = cpu.decodificada
+
+        try:
+            while executadas != limite:
+                pc = cpu.pc
+                if pc >= tamanho or pc < 0:
+                    cpu.halted = True
+                    break
+
+                decodificada = cache.get(pc)
+                if decodificada is None:
+                    decodificada = cache[pc] = Decodificador.decodificar(memoria[pc])
+
+                pc += 1
+                cpu.pc = pc
+                if decodificada.palavra == HALT or pc >= tamanho:
+                    cpu.halted = True
+                    break
+
+                resultado = decodificada.handler(cpu)
+                if decodificada.escreve_rc:
+                    regs[decodificada.rc] = resultado
+                executadas += 1
+
+                destino = cpu.pc
+                if destino < pc:
+                    # Desvio para trás (ou para si mesmo): candidato a laço ocioso.
+                    # lacos: endereço após o desvio -> LacoAfim, ou False se não der para avançar
+                    laco = lacos.get(pc)
+                    if laco is None:
+                        laco = AvancoRapido.analisar(cpu, destino, pc - 1) if destino >= 0 else None
+                        lacos[pc] = laco or False
+                    if laco and laco.inicio == destino:
+                        restante = None if max_steps is None else limite - executadas
+                        executadas += AvancoRapido.avancar(cpu, laco, restante)
+                        if cpu.parada is not None:
+                            break
+        finally:
+            cpu.contador_instrucoes += executadas
+            if decodificada is not None:
+                cpu.decodificada = decodificada
+                cpu.ir = decodificada.palavra
+                cpu.opcode = decodificada.opcode
+                cpu.ra = decodificada.ra
+                cpu.rb = decodificada.rb
+                cpu.rc = decodificada.rc
+
+        return executadas
+
+    @staticmethod
+    def analisar(cpu, inicio, fim):
+        """
+        Devolve o LacoAfim de [inicio, fim], ou None se o corpo não for apenas de contadores.
+        """
+        desvio = Decodificador.decodificar(cpu.memoria[fim])
+        if desvio.opcode in (OP['BEQ'], OP['BNE']):
+            if desvio.ra >= 32 or desvio.rb >= 32:
+                return None
+            saida = (desvio.opcode, desvio.ra, desvio.rb)
+        elif desvio.opcode == OP['J'] and inicio == fim:
+            saida = (OP['J'], 0, 0)
+        else:
+            return None
+
+        passos = []
+        escritos = set()
+        lidos = set()
+        ultima_alu = None
+        cache = cpu.cache_instrucoes
+        for endereco in range(inicio, fim):
+            # Decodifica pelo cache: um store no corpo do laço invalida esta análise
+            d = cache.get(endereco)
+            if d is None:
+                d = cache[endereco] = Decodificador.decodificar(cpu.memoria[endereco])
+            if d.palavra == 0:  # nop
+                continue
+            if d.opcode not in (OP['ADD'], OP['SUB']) or max(d.ra, d.rb, d.rc) >= 32:
+                return None
+            rd = d.rc
+            if d.ra == rd and d.rb != rd:
+                rk = d.rb
+                rd_eh_a = True
+            elif d.opcode == OP['ADD'] and d.rb == rd and d.ra != rd:
+                rk = d.ra
+                rd_eh_a = False
+            else:
+                return None
+            if rd in escritos:
+                return None
+            escritos.add(rd)
+            lidos.add(rk)
+            subtrai = d.opcode == OP['SUB']
+            passos.append((rd, rk, subtrai))
+            ultima_alu = (FLAGS_SUB if subtrai else FLAGS_ADD, rd, rk, rd_eh_a)
+
+        # Os incrementos precisam ser invariantes no laço
+        if lidos & escritos:
+            return None
+        return LacoAfim(inicio, fim, tuple(passos), ultima_alu, saida)
+
+    @staticmethod
+    def _iteracoes_ate_saida(laco, regs, incrementos):
+        """
+        Menor k >= 1 em que o desvio do fim do laço não é tomado após k iterações (None: nunca).
+        """
+        opcode, ra, rb = laco.saida
+        if opcode == OP['J']:
+            return None
+        passo = (incrementos.get(ra, 0) - incrementos.get(rb, 0)) % MODULO
+        diferenca = (regs[ra] - regs[rb]) % MODULO
+
+        if opcode == OP['BEQ']:
+            # Continua enquanto a diferença for zero: só se repete para sempre com passo nulo
+            return None if passo == 0 else 1
+
+        # bne: continua enquanto diferença + k * passo != 0 (mod 2^32)
+        if passo == 0:
+            return None
+        divisor = gcd(passo, MODULO)
+        alvo = (-diferenca) % MODULO
+        if alvo % divisor:
+            return None
+        modulo = MODULO // divisor
+        k = (alvo // divisor) * pow(passo // divisor, -1, modulo) % modulo
+        return k or modulo
+
+    @staticmethod
+    def avancar(cpu, laco, restante):
+        """
+        Aplica de uma vez as iterações do laço (cpu.pc == laco.inicio). Devolve as instruções
+        puladas, sem ultrapassar `restante` (None: sem limite).
+        """
+        regs = cpu.regs
+        incrementos = {}
+        for rd, rk, subtrai in laco.passos:
+            incrementos[rd] = (-regs[rk] if subtrai else regs[rk]) % MODULO
+
+        k = AvancoRapido._iteracoes_ate_saida(laco, regs, incrementos)
+        sai = k is not None
+        if restante is not None and (k is None or k * laco.tamanho > restante):
+            k = restante // laco.tamanho
+            sai = False
+        elif k is None:
+            if any(incrementos.values()):
+                return 0  # o estado muda a cada volta e não há saída: executa normalmente
+            cpu.parada = f"Laço infinito sem mudança de estado em [{laco.inicio}, {laco.fim}]"
+            return 0
+        if k <= 0:
+            return 0
+
+        if laco.ultima_alu is not None:
+            tipo, rd, rk, rd_eh_a = laco.ultima_alu
+            anterior = (regs[rd] + (k - 1) * incrementos[rd]) % MODULO
+            resultado = (anterior + incrementos[rd]) % MODULO
+            if rd_eh_a:
+                cpu.ultima_op_flags = (tipo, anterior, regs[rk], resultado)
+            else:
+                cpu.ultima_op_flags = (tipo, regs[rk], anterior, resultado)
+
+        for rd, incremento in incrementos.items():
+            regs[rd] = (regs[rd] + k * incremento) % MODULO
+
+        cpu.pc = laco.fim + 1 if sai else laco.inicio
+        return k * laco.tamanho
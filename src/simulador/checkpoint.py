@@ -0,0 +1,79 @@
+from bisect import bisect_right
+
+# Granularidade do copy-on-write da memória
+BITS_PAGINA = 8
+PALAVRAS_POR_PAGINA = 1 << BITS_PAGINA
+
+
+class Checkpoint:
+    """
+    Fotografia do estado do processador. A memória é guardada como uma tupla de páginas (bytes),
+    ou um dicionário página -> bytes só com as páginas alocadas na memória esparsa; páginas não
+    alteradas desde o checkpoint anterior são compartilhadas com ele, sem cópia.
+    """
+    __slots__ = ("regs", "ultima_op_flags", "pc", "halted", "contador_instrucoes", "paginas")
+
+    def __init__(self, regs, ultima_op_flags, pc, halted, contador_instrucoes, paginas):
+        self.regs = regs
+        self.ultima_op_flags = ultima_op_flags
+        self.pc = pc
+        self.halted = halted
+        self.contador_instrucoes = contador_instrucoes
+        self.paginas = paginas
+
+
+class Rebobinador:
+    """
+    Tira checkpoints periódicos durante a execução e permite voltar N instruções:
+    restaura o checkpoint mais recente anterior ao alvo e reexecuta até ele.
+    """
+
+    def __init__(self, cpu, intervalo=5000):
+        self.cpu = cpu
+        self.intervalo = intervalo
+        self.checkpoints = [cpu.checkpoint()]
+        self._contadores = [cpu.contador_instrucoes]
+
+    def _registrar(self):
+        checkpoint = self.cpu.checkpoint()
+        posicao = bisect_right(self._contadores, checkpoint.contador_instrucoes)
+        if posicao and self._contadores[posicao - 1] == checkpoint.contador_instrucoes:
+            return
+        self.checkpoints.insert(posicao, checkpoint)
+        self._contadores.insert(posicao, checkpoint.contador_instrucoes)
+
+    def run(self, max_steps=None):
+        """
+        Executa como Processador.run, tirando um checkpoint a cada `intervalo` instruções.
+        """
+        cpu = self.cpu
+        inicio = cpu.contador_instrucoes
+        while not cpu.halted:
+            fatia = self.intervalo - (cpu.contador_instrucoes % self.intervalo)
+            if max_steps is not None:
+                restante = max_steps - (cpu.contador_instrucoes - inicio)
+                if restante <= 0:
+                    break
+                fatia = min(fatia, restante)
+            if cpu.run(fatia) < fatia and not cpu.halted:
+                break
+            if cpu.contador_instrucoes % self.intervalo == 0:
+                self._registrar()
+        return cpu.contador_instrucoes - inicio
+
+    def ir_para(self, contador_alvo):
+        """
+        Leva o processador ao estado em que estava após contador_alvo instruções.
+        """
+        posicao = bisect_right(self._contadores, contador_alvo) - 1
+        if posicao < 0:
+            raise ValueError(f"Não há checkpoint anterior à instrução {contador_alvo}.")
+        checkpoint = self.checkpoints[posicao]
+        self.cpu.restore(checkpoint)
+        self.cpu.run(contador_alvo - checkpoint.contador_instrucoes)
+
+    def voltar(self, n=1):
+        """
+        Volta n instruções na execução atual.
+        """
+        self.ir_para(max(self.cpu.contador_instrucoes - n, self._contadores[0]))
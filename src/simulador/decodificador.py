@@ -0,0 +1,151 @@
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.instrucoes import Instrucoes
+
+
+class InstrucaoDecodificada:
+    """
+    Registro de uma instrução já decodificada (um por endereço de memória).
+    """
+    __slots__ = ("palavra", "opcode", "ra", "rb", "rc", "const16", "endereco24", "handler", "escreve_rc")
+
+    def __init__(self, palavra, opcode, ra, rb, rc, const16, endereco24, handler, escreve_rc=False):
+        self.palavra = palavra
+        self.opcode = opcode
+        self.ra = ra
+        self.rb = rb
+        self.rc = rc
+        self.const16 = const16
+        self.endereco24 = endereco24
+        self.handler = handler
+        self.escreve_rc = escreve_rc
+
+
+class InstrucaoIlegal(Exception):
+    """
+    Trap gerado ao executar uma palavra cujo opcode não pertence ao conjunto UFLA-RISC.
+    """
+
+    def __init__(self, pc, palavra):
+        self.pc = pc
+        self.palavra = palavra
+        super().__init__(
+            f"Instrução ilegal no PC = {pc}: IR={palavra:08X} (opcode {(palavra >> 24) & 0xFF:02X})"
+        )
+
+
+# Fábricas: recebem o registro decodificado e devolvem o handler com os operandos já ligados.
+# O handler recebe apenas a cpu e devolve o resultado a ser escrito em rc (ou None).
+
+def _com_ra_rb(funcao):
+    def fabrica(d):
+        ra, rb = d.ra, d.rb
+        return lambda cpu: funcao(cpu, ra, rb)
+    return fabrica
+
+
+def _com_ra(funcao):
+    def fabrica(d):
+        ra = d.ra
+        return lambda cpu: funcao(cpu, ra)
+    return fabrica
+
+
+def _com_ra_rc(funcao):
+    def fabrica(d):
+        ra, rc = d.ra, d.rc
+        return lambda cpu: funcao(cpu, ra, rc)
+    return fabrica
+
+
+def _com_const16(funcao):
+    def fabrica(d):
+        const16, rc = d.const16, d.rc
+        return lambda cpu: funcao(cpu, const16, rc)
+    return fabrica
+
+
+def _com_endereco24(funcao):
+    def fabrica(d):
+        endereco24 = d.endereco24
+        return lambda cpu: funcao(cpu, endereco24)
+    return fabrica
+
+
+def _desvio(funcao):
+    def fabrica(d):
+        ra, rb, offset = d.ra, d.rb, d.rc
+        return lambda cpu: funcao(cpu, ra, rb, offset)
+    return fabrica
+
+
+def _zeros(d):
+    rc = d.rc
+    return lambda cpu: Instrucoes.zeros(cpu, rc)
+
+
+def _nop(d):
+    # Palavra nula (memória não inicializada): não altera o estado
+    return lambda cpu: None
+
+
+def _ilegal(d):
+    palavra = d.palavra
+
+    def handler(cpu):
+        raise InstrucaoIlegal(cpu.pc - 1, palavra)
+    return handler
+
+
+# Opcode -> (fábrica do handler, escreve resultado em rc)
+_INSTRUCOES = {
+    UnidadeControle.OPCODES['ADD']: (_com_ra_rb(Instrucoes.add), True),
+    UnidadeControle.OPCODES['SUB']: (_com_ra_rb(Instrucoes.sub), True),
+    UnidadeControle.OPCODES['ZERO']: (_zeros, True),
+    UnidadeControle.OPCODES['XOR']: (_com_ra_rb(Instrucoes.xor), True),
+    UnidadeControle.OPCODES['OR']: (_com_ra_rb(Instrucoes.or_), True),
+    UnidadeControle.OPCODES['NOT']: (_com_ra(Instrucoes.not_), True),
+    UnidadeControle.OPCODES['AND']: (_com_ra_rb(Instrucoes.and_), True),
+    UnidadeControle.OPCODES['ASL']: (_com_ra_rb(Instrucoes.asl), True),
+    UnidadeControle.OPCODES['ASR']: (_com_ra_rb(Instrucoes.asr), True),
+    UnidadeControle.OPCODES['LSL']: (_com_ra_rb(Instrucoes.lsl), True),
+    UnidadeControle.OPCODES['LSR']: (_com_ra_rb(Instrucoes.lsr), True),
+    UnidadeControle.OPCODES['COPY']: (_com_ra(Instrucoes.copy), True),
+    UnidadeControle.OPCODES['LC_HI']: (_com_const16(Instrucoes.lc_hi), True),
+    UnidadeControle.OPCODES['LC_LO']: (_com_const16(Instrucoes.lc_lo), True),
+    UnidadeControle.OPCODES['LOAD']: (_com_ra_rc(Instrucoes.load), True),
+    UnidadeControle.OPCODES['STORE']: (_com_ra_rc(Instrucoes.store), False),
+    UnidadeControle.OPCODES['JAL']: (_com_endereco24(Instrucoes.jal), False),
+    UnidadeControle.OPCODES['JR']: (_com_ra(Instrucoes.jr), False),
+    UnidadeControle.OPCODES['BEQ']: (_desvio(Instrucoes.beq), False),
+    UnidadeControle.OPCODES['BNE']: (_desvio(Instrucoes.bne), False),
+    UnidadeControle.OPCODES['J']: (_com_endereco24(Instrucoes.jump), False),
+}
+
+# Tabela de despacho indexada diretamente pelo opcode (256 entradas)
+TABELA_DESPACHO = [(_ilegal, False)] * 256
+TABELA_DESPACHO[0x00] = (_nop, False)
+for _opcode, _entrada in _INSTRUCOES.items():
+    TABELA_DESPACHO[_opcode] = _entrada
+
+
+class Decodificador:
+
+    @staticmethod
+    def decodificar(palavra: int) -> InstrucaoDecodificada:
+        """
+        Extrai todos os campos de uma palavra de 32 bits de uma só vez e liga o handler aos operandos.
+        """
+        opcode = UnidadeControle.extrair_opcode(palavra)
+        decodificada = InstrucaoDecodificada(
+            palavra,
+            opcode,
+            UnidadeControle.extrair_ra(palavra),
+            UnidadeControle.extrair_rb(palavra),
+            UnidadeControle.extrair_rc(palavra),
+            UnidadeControle.extrair_const16(palavra),
+            UnidadeControle.extrair_endereco24(palavra),
+            None,
+        )
+        fabrica, decodificada.escreve_rc = TABELA_DESPACHO[opcode]
+        decodificada.handler = fabrica(decodificada)
+        return decodificada
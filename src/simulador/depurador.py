@@ -0,0 +1,261 @@
+import argparse
+import sys
+
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.processador import Processador, TRACE_DESLIGADO
+from src.interpretador.desmontador import Desmontador
+from src.interpretador.cache_montagem import load_program
+
+OP = UnidadeControle.OPCODES
+OPCODE_LOAD = OP['LOAD']
+OPCODE_STORE = OP['STORE']
+
+LEITURA = "leitura"
+ESCRITA = "escrita"
+ACESSO = "acesso"  # leitura ou escrita
+_TIPOS_WATCHPOINT = (LEITURA, ESCRITA, ACESSO)
+
+NOMES_REGISTRADORES = tuple(f"r{i}" for i in range(32))
+
+
+class Parada:
+    """
+    Motivo de uma parada do depurador (fica em cpu.parada). A instrução em pc ainda não foi executada.
+    """
+    __slots__ = ("motivo", "pc", "endereco", "valor_atual", "valor_novo")
+
+    def __init__(self, motivo, pc, endereco=None, valor_atual=None, valor_novo=None):
+        self.motivo = motivo          # "breakpoint", "leitura" ou "escrita"
+        self.pc = pc
+        self.endereco = endereco      # endereço acessado (watchpoints)
+        self.valor_atual = valor_atual
+        self.valor_novo = valor_novo  # valor que o store vai escrever
+
+    def __str__(self):
+        if self.motivo == "breakpoint":
+            return f"Breakpoint em PC={self.pc}"
+        texto = f"Watchpoint de {self.motivo} em M[{self.endereco}] (PC={self.pc}, valor={self.valor_atual}"
+        if self.valor_novo is not None:
+            texto += f" -> {self.valor_novo}"
+        return texto + ")"
+
+
+def _compilar_condicao(condicao):
+    """
+    Condição de um breakpoint: None (sempre para), uma função cpu -> bool ou uma expressão em
+    texto sobre r0..r31, pc e mem (ex.: "r3 == 5 and mem[100] != 0").
+    """
+    if condicao is None or callable(condicao):
+        return condicao
+    codigo = compile(condicao, "<condição>", "eval")
+
+    def avaliar(cpu):
+        nomes = dict(zip(NOMES_REGISTRADORES, cpu.regs))
+        nomes["pc"] = cpu.pc
+        nomes["mem"] = cpu.memoria
+        return eval(codigo, {"__builtins__": {}}, nomes)
+    return avaliar
+
+
+class Depurador:
+    """
+    Breakpoints de PC (com condição opcional) e watchpoints de leitura/escrita em intervalos de
+    memória, consultados em O(1) por mapas de bits indexados pelo endereço.
+
+    O depurador só fica instalado como observador enquanto houver algum ponto armado: sem
+    breakpoints nem watchpoints o processador volta ao laço rápido de Processador.run, sem custo.
+    A parada acontece antes da instrução (breakpoint) ou do acesso (watchpoint), com o motivo em
+    cpu.parada. Para seguir depois de uma parada use continuar() ou passo(), que não param de novo
+    na mesma instrução.
+
+    Uso:
+        depurador = Depurador(cpu)
+        depurador.adicionar_watchpoint(100, 110, ESCRITA)
+        depurador.adicionar_breakpoint(42, "r3 == 0")
+        parada = depurador.continuar()
+    """
+
+    def __init__(self, cpu):
+        self.cpu = cpu
+        self.breakpoints = {}  # endereço -> condição compilada (ou None)
+        self.watchpoints = []  # (inicio, fim inclusive, tipo)
+        tamanho_mapa = (len(cpu.memoria) + 7) >> 3
+        self._mapa_pc = bytearray(tamanho_mapa)
+        self._mapa_leitura = bytearray(tamanho_mapa)
+        self._mapa_escrita = bytearray(tamanho_mapa)
+        self._vigia_leitura = False
+        self._vigia_escrita = False
+        self._retomando = False
+        self.instalado = False
+
+    # ---- pontos de parada ----
+
+    def _verificar_endereco(self, endereco):
+        if not 0 <= endereco < len(self.cpu.memoria):
+            raise IndexError(f"Endereço {endereco} fora da memória de {len(self.cpu.memoria)} palavras.")
+
+    def adicionar_breakpoint(self, endereco, condicao=None):
+        self._verificar_endereco(endereco)
+        self.breakpoints[endereco] = _compilar_condicao(condicao)
+        self._mapa_pc[endereco >> 3] |= 1 << (endereco & 7)
+        self._atualizar()
+
+    def remover_breakpoint(self, endereco):
+        if self.breakpoints.pop(endereco, False) is not False:
+            self._mapa_pc[endereco >> 3] &= ~(1 << (endereco & 7)) & 0xFF
+            self._atualizar()
+
+    def adicionar_watchpoint(self, inicio, fim=None, tipo=ESCRITA):
+        """
+        Vigia os acessos de load/store ao intervalo [inicio, fim] (fim inclusive; só inicio se None).
+        """
+        if tipo not in _TIPOS_WATCHPOINT:
+            raise ValueError(f"Tipo de watchpoint desconhecido: {tipo}")
+        fim = inicio if fim is None else fim
+        if fim < inicio:
+            raise ValueError(f"Intervalo de watchpoint inválido: [{inicio}, {fim}]")
+        self._verificar_endereco(inicio)
+        self._verificar_endereco(fim)
+        self.watchpoints.append((inicio, fim, tipo))
+        self._reconstruir_mapas()
+
+    def remover_watchpoint(self, inicio, fim=None):
+        fim = inicio if fim is None else fim
+        self.watchpoints = [w for w in self.watchpoints if (w[0], w[1]) != (inicio, fim)]
+        self._reconstruir_mapas()
+
+    def limpar(self):
+        """
+        Remove todos os pontos de parada (e desinstala o depurador).
+        """
+        self.breakpoints.clear()
+        self._mapa_pc[:] = bytes(len(self._mapa_pc))
+        self.watchpoints.clear()
+        self._reconstruir_mapas()
+
+    @staticmethod
+    def _marcar(mapa, inicio, fim):
+        # Bytes inteiros de uma vez no meio do intervalo, bit a bit só nas pontas
+        endereco = inicio
+        while endereco <= fim and endereco & 7:
+            mapa[endereco >> 3] |= 1 << (endereco & 7)
+            endereco += 1
+        cheios = (fim + 1 - endereco) >> 3
+        if cheios > 0:
+            mapa[endereco >> 3:(endereco >> 3) + cheios] = b"\xff" * cheios
+            endereco += cheios << 3
+        while endereco <= fim:
+            mapa[endereco >> 3] |= 1 << (endereco & 7)
+            endereco += 1
+
+    def _reconstruir_mapas(self):
+        vazio = bytes(len(self._mapa_leitura))
+        self._mapa_leitura[:] = vazio
+        self._mapa_escrita[:] = vazio
+        for inicio, fim, tipo in self.watchpoints:
+            if tipo != ESCRITA:
+                Depurador._marcar(self._mapa_leitura, inicio, fim)
+            if tipo != LEITURA:
+                Depurador._marcar(self._mapa_escrita, inicio, fim)
+        self._vigia_leitura = any(tipo != ESCRITA for _, _, tipo in self.watchpoints)
+        self._vigia_escrita = any(tipo != LEITURA for _, _, tipo in self.watchpoints)
+        self._atualizar()
+
+    def _atualizar(self):
+        # Instalado só enquanto houver algo armado: sem pontos, o run() volta ao laço rápido
+        armado = bool(self.breakpoints) or bool(self.watchpoints)
+        if armado and not self.instalado:
+            self.cpu.instalar_observador(self)
+            self.instalado = True
+        elif not armado and self.instalado:
+            self.cpu.remover_observador(self)
+            self.instalado = False
+
+    # ---- observador ----
+
+    def antes(self, cpu, pc, decodificada):
+        if self._retomando:
+            # Primeira instrução após continuar()/passo(): já foi reportada
+            self._retomando = False
+            return None
+
+        if self._mapa_pc[pc >> 3] >> (pc & 7) & 1:
+            condicao = self.breakpoints[pc]
+            if condicao is None or condicao(cpu):
+                return Parada("breakpoint", pc)
+
+        opcode = decodificada.opcode
+        if opcode == OPCODE_STORE:
+            if self._vigia_escrita:
+                endereco = cpu.regs[decodificada.rc] & cpu.mascara_endereco
+                if self._mapa_escrita[endereco >> 3] >> (endereco & 7) & 1:
+                    return Parada(ESCRITA, pc, endereco, cpu.memoria[endereco], cpu.regs[decodificada.ra])
+        elif opcode == OPCODE_LOAD:
+            if self._vigia_leitura:
+                endereco = cpu.regs[decodificada.ra] & cpu.mascara_endereco
+                if self._mapa_leitura[endereco >> 3] >> (endereco & 7) & 1:
+                    return Parada(LEITURA, pc, endereco, cpu.memoria[endereco])
+        return None
+
+    def depois(self, cpu, pc, decodificada):
+        return None
+
+    # ---- execução ----
+
+    def continuar(self, max_steps=None):
+        """
+        Executa até a próxima parada, o halt ou max_steps instruções. Devolve a Parada (ou None).
+        """
+        cpu = self.cpu
+        self._retomando = self.instalado and isinstance(cpu.parada, Parada) and cpu.parada.pc == cpu.pc
+        cpu.run(max_steps)
+        self._retomando = False
+        return cpu.parada if isinstance(cpu.parada, Parada) else None
+
+    def passo(self, n=1):
+        """
+        Executa n instruções (ou até uma parada), sem parar de novo na instrução atual.
+        """
+        return self.continuar(n)
+
+
+def _intervalo(texto):
+    inicio, _, fim = texto.partition(":")
+    return int(inicio, 0), int(fim, 0) if fim else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa um programa UFLA-RISC até um breakpoint ou watchpoint.")
+    parser.add_argument("programa", help="Arquivo .asm ou .bin")
+    parser.add_argument("--break", dest="breakpoints", action="append", default=[], metavar="PC[:CONDIÇÃO]",
+                        help="Breakpoint (ex.: 42 ou '42:r3 == 0')")
+    parser.add_argument("--watch", action="append", default=[], metavar="INICIO[:FIM]", help="Watchpoint de escrita")
+    parser.add_argument("--rwatch", action="append", default=[], metavar="INICIO[:FIM]", help="Watchpoint de leitura")
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--memoria-esparsa", action="store_true")
+    args = parser.parse_args()
+
+    cpu = load_program(args.programa, Processador(nivel_trace=TRACE_DESLIGADO, memoria_esparsa=args.memoria_esparsa))
+    depurador = Depurador(cpu)
+    for texto in args.breakpoints:
+        endereco, _, condicao = texto.partition(":")
+        depurador.adicionar_breakpoint(int(endereco, 0), condicao or None)
+    for texto in args.watch:
+        depurador.adicionar_watchpoint(*_intervalo(texto), ESCRITA)
+    for texto in args.rwatch:
+        depurador.adicionar_watchpoint(*_intervalo(texto), LEITURA)
+
+    parada = depurador.continuar(args.max_steps)
+    if parada is None:
+        print(f"Sem parada: {cpu.contador_instrucoes} instruções, PC={cpu.pc}, halted={cpu.halted}")
+        return 0
+
+    print(f"{parada} após {cpu.contador_instrucoes} instruções")
+    print(f"  {cpu.pc}: {Desmontador.desmontar(cpu.memoria[cpu.pc])}")
+    for i in range(0, 32, 8):
+        print("  " + "  ".join(f"R{j:02}={cpu.regs[j]:<10}" for j in range(i, i + 8)))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.instrucoes import FLAGS_ADD, FLAGS_SUB, FLAGS_RESULTADO
+from src.simulador.decodificador import Decodificador
+
+OP = UnidadeControle.OPCODES
+
+HALT = 0xFFFFFFFF
+
+# Campos de registrador lidos/escritos por opcode: só instruções com registradores válidos são fundidas,
+# assim nenhum componente de uma superinstrução pode levantar exceção no meio dela
+_CAMPOS = {
+    OP['ADD']: ("ra", "rb", "rc"), OP['SUB']: ("ra", "rb", "rc"), OP['XOR']: ("ra", "rb", "rc"),
+    OP['OR']: ("ra", "rb", "rc"), OP['AND']: ("ra", "rb", "rc"), OP['ASL']: ("ra", "rb", "rc"),
+    OP['ASR']: ("ra", "rb", "rc"), OP['LSL']: ("ra", "rb", "rc"), OP['LSR']: ("ra", "rb", "rc"),
+    OP['ZERO']: ("rc",), OP['NOT']: ("ra", "rc"), OP['COPY']: ("ra", "rc"),
+    OP['LC_HI']: ("rc",), OP['LC_LO']: ("rc",), OP['LOAD']: ("ra", "rc"), OP['STORE']: ("ra", "rc"),
+    OP['BEQ']: ("ra", "rb"), OP['BNE']: ("ra", "rb"),
+}
+
+_ULA = {
+    OP['ADD'], OP['SUB'], OP['ZERO'], OP['XOR'], OP['OR'], OP['NOT'],
+    OP['AND'], OP['ASL'], OP['ASR'], OP['LSL'], OP['LSR'], OP['COPY'],
+}
+
+TIPOS = ("constante32", "zeros+lcl", "alu+desvio", "load+op+store")
+
+
+class InstrucaoFundida:
+    """
+    Superinstrução: sequência de `tamanho` instruções a partir de um endereço, executada por
+    um único handler. O run() põe cpu.pc em `proximo` antes de chamá-lo (desvios o sobrescrevem);
+    `ultima` é a decodificação da última instrução do grupo.
+    """
+    __slots__ = ("tipo", "tamanho", "proximo", "handler", "ultima")
+
+    def __init__(self, tipo, tamanho, proximo, handler, ultima):
+        self.tipo = tipo
+        self.tamanho = tamanho
+        self.proximo = proximo
+        self.handler = handler
+        self.ultima = ultima
+
+
+def _valida(d):
+    campos = _CAMPOS.get(d.opcode)
+    if campos is None or d.palavra == HALT:
+        return False
+    for campo in campos:
+        if getattr(d, campo) >= 32:
+            return False
+    return True
+
+
+def _constante(rc, valor):
+    flags = (FLAGS_RESULTADO, 0, 0, valor)
+
+    def handler(cpu):
+        cpu.regs[rc] = valor
+        cpu.ultima_op_flags = flags
+    return handler
+
+
+def _alu_desvio(alu, desvio, endereco_desvio):
+    ra, rb, rc = alu.ra, alu.rb, alu.rc
+    x, y = desvio.ra, desvio.rb
+    offset = (desvio.rc - 256) if desvio.rc > 127 else desvio.rc
+    alvo = endereco_desvio + offset
+    tomar_se_igual = desvio.opcode == OP['BEQ']
+
+    if alu.opcode == OP['SUB']:
+        def handler(cpu):
+            regs = cpu.regs
+            a = regs[ra]
+            b = regs[rb]
+            resultado = (a - b) & 0xFFFFFFFF
+            cpu.ultima_op_flags = (FLAGS_SUB, a, b, resultado)
+            regs[rc] = resultado
+            if (regs[x] == regs[y]) == tomar_se_igual:
+                cpu.pc = alvo
+    else:
+        def handler(cpu):
+            regs = cpu.regs
+            a = regs[ra]
+            b = regs[rb]
+            resultado = (a + b) & 0xFFFFFFFF
+            cpu.ultima_op_flags = (FLAGS_ADD, a, b, resultado)
+            regs[rc] = resultado
+            if (regs[x] == regs[y]) == tomar_se_igual:
+                cpu.pc = alvo
+    return handler
+
+
+def _load_op_store(load, op, store):
+    carregar, operar, armazenar = load.handler, op.handler, store.handler
+    rc_load, rc_op = load.rc, op.rc
+
+    def handler(cpu):
+        regs = cpu.regs
+        regs[rc_load] = carregar(cpu)
+        regs[rc_op] = operar(cpu)
+        armazenar(cpu)
+    return handler
+
+
+class Fusao:
+    """
+    Execução com superinstruções (Processador.fusao = True): sequências comuns são reconhecidas
+    na decodificação e executadas por um único handler, com o mesmo estado final (registradores,
+    flags, memória, PC e contador de instruções) da execução instrução a instrução.
+
+    - constante32: lch + lcl (em qualquer ordem) no mesmo registrador
+    - zeros+lcl: zeros rX seguido de lcl rX
+    - alu+desvio: add/sub seguido de beq/bne
+    - load+op+store: load, uma operação da ULA e store
+
+    A superinstrução fica associada ao endereço da primeira instrução; um desvio para o meio do
+    grupo encontra a instrução isolada naquele endereço. Um store em qualquer endereço do grupo
+    descarta a superinstrução.
+    """
+
+    @staticmethod
+    def _decodificar(cpu, endereco):
+        # Pelo cache de instruções: um store no endereço avisa os ouvintes_codigo
+        d = cpu.cache_instrucoes.get(endereco)
+        if d is None:
+            d = cpu.cache_instrucoes[endereco] = Decodificador.decodificar(cpu.memoria[endereco])
+        return d
+
+    @staticmethod
+    def fundir(cpu, pc):
+        """
+        Devolve a InstrucaoFundida que começa em pc, ou None se não houver padrão reconhecido.
+        """
+        tamanho = len(cpu.memoria)
+        # A última instrução do grupo precisa ter um sucessor dentro da memória (senão é halt)
+        if pc < 0 or pc + 2 >= tamanho:
+            return None
+
+        primeira = Fusao._decodificar(cpu, pc)
+        if not _valida(primeira):
+            return None
+        segunda = Fusao._decodificar(cpu, pc + 1)
+        if not _valida(segunda):
+            return None
+        op1, op2 = primeira.opcode, segunda.opcode
+
+        if op1 == OP['LOAD'] and op2 in _ULA and pc + 3 < tamanho:
+            terceira = Fusao._decodificar(cpu, pc + 2)
+            if terceira.opcode == OP['STORE'] and _valida(terceira):
+                return InstrucaoFundida("load+op+store", 3, pc + 3, _load_op_store(primeira, segunda, terceira), terceira)
+
+        mesmo_rc = primeira.rc == segunda.rc
+        if mesmo_rc and {op1, op2} == {OP['LC_HI'], OP['LC_LO']}:
+            alta, baixa = (primeira, segunda) if op1 == OP['LC_HI'] else (segunda, primeira)
+            valor = ((alta.const16 & 0xFFFF) << 16) | (baixa.const16 & 0xFFFF)
+            return InstrucaoFundida("constante32", 2, pc + 2, _constante(primeira.rc, valor), segunda)
+
+        if mesmo_rc and op1 == OP['ZERO'] and op2 == OP['LC_LO']:
+            return InstrucaoFundida("zeros+lcl", 2, pc + 2, _constante(primeira.rc, segunda.const16 & 0xFFFF), segunda)
+
+        if op1 in (OP['ADD'], OP['SUB']) and op2 in (OP['BEQ'], OP['BNE']):
+            return InstrucaoFundida("alu+desvio", 2, pc + 2, _alu_desvio(primeira, segunda, pc + 1), segunda)
+
+        return None
+
+    @staticmethod
+    def _invalidar(fundidas, endereco):
+        if endereco is None:
+            fundidas.clear()
+            return
+        # Um grupo tem no máximo 3 instruções: pode começar até 2 endereços antes
+        for inicio in (endereco, endereco - 1, endereco - 2):
+            fundidas.pop(inicio, None)
+
+    @staticmethod
+    def run(cpu, max_steps=None):
+        """
+        Mesmo laço de Processador.run (trace desligado), executando superinstruções quando possível.
+        Uma superinstrução só é usada se couber inteira no max_steps restante.
+        """
+        if cpu.halted:
+            return 0
+
+        fundidas = cpu.fusoes
+        if fundidas is None:
+            fundidas = cpu.fusoes = {}
+            cpu.ouvintes_codigo.append(lambda endereco: Fusao._invalidar(fundidas, endereco))
+        estatisticas = cpu.estatisticas_fusao
+
+        cache = cpu.cache_instrucoes
+        memoria = cpu.memoria
+        regs = cpu.regs
+        tamanho = len(memoria)
+        limite = -1 if max_steps is None else max_steps
+        executadas = 0
+        decodificada = cpu.decodificada
+
+        try:
+            while executadas != limite:
+                pc = cpu.pc
+                if pc >= tamanho or pc < 0:
+                    cpu.halted = True
+                    break
+
+                fundida = fundidas.get(pc)
+                if fundida is None:
+                    fundida = fundidas[pc] = Fusao.fundir(cpu, pc) or False
+                if fundida and (limite < 0 or executadas + fundida.tamanho <= limite):
+                    cpu.pc = fundida.proximo
+                    fundida.handler(cpu)
+                    executadas += fundida.tamanho
+                    estatisticas[fundida.tipo] += fundida.tamanho
+                    decodificada = fundida.ultima
+                    continue
+
+                decodificada = cache.get(pc)
+                if decodificada is None:
+                    decodificada = cache[pc] = Decodificador.decodificar(memoria[pc])
+
+                pc += 1
+                cpu.pc = pc
+                if decodificada.palavra == HALT or pc >= tamanho:
+                    cpu.halted = True
+                    break
+
+                resultado = decodificada.handler(cpu)
+                if decodificada.escreve_rc:
+                    regs[decodificada.rc] = resultado
+                executadas += 1
+        finally:
+            cpu.contador_instrucoes += executadas
+            if decodificada is not None:
+                cpu.decodificada = decodificada
+                cpu.ir = decodificada.palavra
+                cpu.opcode = decodificada.opcode
+                cpu.ra = decodificada.ra
+                cpu.rb = decodificada.rb
+                cpu.rc = decodificada.rc
+
+        return executadas
+
+    @staticmethod
+    def estatisticas(cpu):
+        """
+        Instruções executadas dentro de superinstruções, por tipo, e a taxa de acerto em relação
+        a cpu.contador_instrucoes.
+        """
+        por_tipo = dict(cpu.estatisticas_fusao)
+        fundidas = sum(por_tipo.values())
+        total = cpu.contador_instrucoes
+        return {
+            "instrucoes": total,
+            "fundidas": fundidas,
+            "taxa": fundidas / total if total else 0.0,
+            "por_tipo": por_tipo,
+        }
@@ -0,0 +1,408 @@
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from src.interpretador.assembler import TABELA_CODIFICACAO, F_RRR, F_RR, F_R, F_CONST, F_DESVIO, F_SALTO
+from src.interpretador.desmontador import Desmontador
+from src.simulador.instrucoes import Instrucoes
+from src.simulador.processador import Processador, TRACE_DESLIGADO, TAMANHO_MEMORIA
+from src.simulador.checkpoint import BITS_PAGINA, PALAVRAS_POR_PAGINA
+from src.simulador.tradutor import TradutorBlocos
+
+HALT = 0xFFFFFFFF
+
+# Valores que exercitam os casos de borda (shift 0 e >= 32, carry/overflow, sinal, limites de 16 bits)
+VALORES_ESPECIAIS = (
+    0, 1, 2, 31, 32, 33, 0x7FFF, 0x8000, 0xFFFF, 0x10000,
+    0x7FFFFFFF, 0x80000000, 0x80000001, 0xFFFFFFFE, 0xFFFFFFFF,
+)
+
+TAMANHO_PROGRAMA = 24       # instruções por programa gerado (sem contar o halt final)
+ORCAMENTO = 256             # instruções executadas por programa
+INTERVALO_CHECKPOINT = 32   # instruções entre duas comparações de estado
+LOTE = 250                  # programas por tarefa enviada a um processo
+
+# Campos do resumo de estado comparado a cada checkpoint
+CAMPOS_RESUMO = ("contador", "pc", "halted", "flags", "registradores", "memoria", "erro")
+
+_MEMORIA_ZERADA = bytes(TAMANHO_MEMORIA * 4)
+_PAGINA_ZERADA = bytes(PALAVRAS_POR_PAGINA * 4)
+
+_MNEMONICOS = tuple(m for m, (_, formato) in TABELA_CODIFICACAO.items() if m != "halt")
+
+
+class CasoFuzz:
+    """
+    Programa gerado e estado inicial: palavras a partir do endereço 0 (terminadas em halt),
+    registradores, flags (bits N Z C O), palavras de dados fora do programa e orçamento de instruções.
+    """
+    __slots__ = ("semente", "programa", "regs", "flags", "dados", "orcamento")
+
+    def __init__(self, semente, programa, regs, flags, dados, orcamento):
+        self.semente = semente
+        self.programa = programa
+        self.regs = regs
+        self.flags = flags
+        self.dados = dados
+        self.orcamento = orcamento
+
+    def copiar(self, **alteracoes):
+        campos = {campo: getattr(self, campo) for campo in CasoFuzz.__slots__}
+        campos.update(alteracoes)
+        return CasoFuzz(**campos)
+
+
+def _criar_referencia():
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+
+    def executar(max_steps):
+        # Semântica de referência: o ciclo IF/ID/EX/WB, instrução a instrução
+        alvo = cpu.contador_instrucoes + max_steps
+        while not cpu.halted and cpu.contador_instrucoes < alvo:
+            cpu.executar_ciclo()
+    return cpu, executar
+
+
+def _criar_interpretador(**opcoes):
+    def criar():
+        cpu = Processador(nivel_trace=TRACE_DESLIGADO, **opcoes)
+        return cpu, cpu.run
+    return criar
+
+
+def _criar_blocos():
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+    return cpu, TradutorBlocos(cpu).run
+
+
+# Motores de execução: nome -> função que devolve (cpu, executar(max_steps))
+MOTORES = {
+    "referencia": _criar_referencia,
+    "interpretador": _criar_interpretador(),
+    "blocos": _criar_blocos,
+    "fusao": _criar_interpretador(fusao=True),
+    "avanco_rapido": _criar_interpretador(avanco_rapido=True),
+}
+
+
+# ---- geração ----
+
+def _valor(rng, tamanho_programa):
+    sorteio = rng.random()
+    if sorteio < 0.45:
+        return rng.choice(VALORES_ESPECIAIS)
+    if sorteio < 0.65:
+        # Endereços dentro do programa: loads/stores/jr sobre o próprio código
+        return rng.randrange(tamanho_programa + 2)
+    return rng.getrandbits(32)
+
+
+def _registrador(rng):
+    # Poucos registradores concentram as dependências entre instruções
+    return rng.randrange(8) if rng.random() < 0.9 else rng.randrange(32)
+
+
+def _instrucao(rng, endereco, tamanho_programa):
+    mnemonico = rng.choice(_MNEMONICOS)
+    opcode, formato = TABELA_CODIFICACAO[mnemonico]
+    if formato == F_RRR:
+        return opcode | (_registrador(rng) << 16) | (_registrador(rng) << 8) | _registrador(rng)
+    if formato == F_RR:
+        return opcode | (_registrador(rng) << 16) | _registrador(rng)
+    if formato == F_R:
+        return opcode | _registrador(rng)
+    if formato == F_CONST:
+        return opcode | ((_valor(rng, tamanho_programa) & 0xFFFF) << 8) | _registrador(rng)
+    if formato == F_DESVIO:
+        # Offsets para trás e para frente, quase sempre dentro do programa
+        offset = rng.randint(-endereco - 1, tamanho_programa - endereco + 1)
+        offset = max(-128, min(127, offset))
+        return opcode | (_registrador(rng) << 16) | (_registrador(rng) << 8) | (offset & 0xFF)
+    if formato == F_SALTO:
+        return opcode | rng.randrange(tamanho_programa + 2)
+    # F_JR
+    return opcode | (_registrador(rng) << 16)
+
+
+def gerar_caso(semente, tamanho=TAMANHO_PROGRAMA, orcamento=ORCAMENTO):
+    """
+    Gera, de forma determinística a partir da semente, um programa válido e um estado inicial.
+    """
+    rng = random.Random(semente)
+    n = rng.randint(1, tamanho)
+    programa = []
+    for endereco in range(n):
+        if rng.random() < 0.03:
+            programa.append(0)  # nop
+        else:
+            programa.append(_instrucao(rng, endereco, n))
+    programa.append(HALT)
+
+    regs = tuple(_valor(rng, n) for _ in range(32))
+    flags = rng.getrandbits(4)
+    dados = {}
+    for _ in range(rng.randrange(4)):
+        dados[rng.randrange(n + 1, 1 << 16)] = _valor(rng, n)
+    return CasoFuzz(semente, tuple(programa), regs, flags, dados, orcamento)
+
+
+# ---- execução e comparação ----
+
+# motor -> (cpu, executar, checkpoint inicial): um Processador por motor em cada processo,
+# devolvido ao estado zerado por restore() (só as páginas escritas são regravadas)
+_PROCESSADORES = {}
+
+
+def _preparar(caso, motor):
+    reaproveitado = _PROCESSADORES.get(motor)
+    if reaproveitado is None:
+        cpu, executar = MOTORES[motor]()
+        reaproveitado = _PROCESSADORES[motor] = (cpu, executar, cpu.checkpoint())
+    cpu, executar, inicial = reaproveitado
+    cpu.restore(inicial)
+    segmentos = [(0, caso.programa)]
+    segmentos.extend((endereco, (palavra,)) for endereco, palavra in caso.dados.items())
+    cpu.carregar_programa(segmentos)
+    cpu.regs[:] = array('I', caso.regs)
+    cpu.ultima_op_flags = Instrucoes.fixar_flags((caso.flags >> 3) & 1, (caso.flags >> 2) & 1, (caso.flags >> 1) & 1, caso.flags & 1)
+    return cpu, executar
+
+
+def _limpas_zeradas(cpu):
+    # Páginas fora de paginas_sujas nunca foram escritas: precisam continuar zeradas.
+    # Comparar uma cópia com as páginas sujas apagadas custa bem menos que resumir a memória toda.
+    copia = bytearray(cpu.memoria)
+    for pagina in cpu.paginas_sujas:
+        inicio = pagina << (BITS_PAGINA + 2)
+        copia[inicio:inicio + len(_PAGINA_ZERADA)] = _PAGINA_ZERADA
+    return copia == _MEMORIA_ZERADA
+
+
+def _resumo(cpu, erro, final):
+    # Memória: CRC das páginas escritas; no final também confere que as demais estão zeradas,
+    # o que pega um motor que escreva na memória sem marcar a página como suja.
+    memoria = 0
+    with memoryview(cpu.memoria) as visao:
+        for pagina in sorted(cpu.paginas_sujas):
+            inicio = pagina << BITS_PAGINA
+            memoria = zlib.crc32(struct.pack("<I", pagina), memoria)
+            memoria = zlib.crc32(visao[inicio:inicio + PALAVRAS_POR_PAGINA], memoria)
+    if final:
+        memoria = (memoria, _limpas_zeradas(cpu))
+    return (
+        cpu.contador_instrucoes, cpu.pc, cpu.halted, cpu.flags(),
+        zlib.crc32(cpu.regs), memoria, erro,
+    )
+
+
+def executar_caso(caso, motor, intervalo=INTERVALO_CHECKPOINT):
+    """
+    Executa o caso no motor e devolve o resumo do estado (ver CAMPOS_RESUMO) a cada `intervalo`
+    instruções, terminando no halt, em uma exceção ou no fim do orçamento.
+    """
+    cpu, executar = _preparar(caso, motor)
+    resumos = []
+    erro = None
+    executadas = 0
+    while True:
+        fatia = min(intervalo, caso.orcamento - executadas)
+        if cpu.halted or fatia <= 0 or erro is not None:
+            break
+        try:
+            executar(fatia)
+        except Exception as e:
+            erro = type(e).__name__
+        executadas += fatia
+        resumos.append(_resumo(cpu, erro, False))
+    resumos.append(_resumo(cpu, erro, True))
+    return resumos
+
+
+def comparar(caso, candidato, referencia="referencia", intervalo=INTERVALO_CHECKPOINT):
+    """
+    Devolve None se os motores concordam em todos os checkpoints, ou
+    (índice do checkpoint, resumo da referência, resumo do candidato) da primeira divergência.
+    """
+    esperados = executar_caso(caso, referencia, intervalo)
+    obtidos = executar_caso(caso, candidato, intervalo)
+    for indice in range(max(len(esperados), len(obtidos))):
+        esperado = esperados[indice] if indice < len(esperados) else None
+        obtido = obtidos[indice] if indice < len(obtidos) else None
+        if esperado != obtido:
+            return (indice, esperado, obtido)
+    return None
+
+
+def campos_divergentes(esperado, obtido):
+    if esperado is None or obtido is None:
+        return ["checkpoints"]
+    return [campo for campo, a, b in zip(CAMPOS_RESUMO, esperado, obtido) if a != b]
+
+
+# ---- minimização ----
+
+def minimizar(caso, candidato, referencia="referencia"):
+    """
+    Reduz um caso divergente: corta o orçamento na primeira instrução divergente, troca
+    instruções por nop e zera registradores, flags e dados enquanto a divergência persistir.
+    """
+    def diverge(c):
+        return comparar(c, candidato, referencia) is not None
+
+    if not diverge(caso):
+        raise ValueError(f"O caso da semente {caso.semente} não diverge em '{candidato}'.")
+
+    caso = _cortar_orcamento(caso, candidato, referencia)
+    mudou = True
+    while mudou:
+        mudou = False
+        programa = list(caso.programa)
+        for endereco in range(len(programa) - 1):
+            if programa[endereco] == 0:
+                continue
+            tentativa = caso.copiar(programa=tuple(programa[:endereco] + [0] + programa[endereco + 1:]))
+            if diverge(tentativa):
+                caso, programa, mudou = tentativa, list(tentativa.programa), True
+
+        # Halt logo após a última instrução não nula
+        ultima = max((i for i, palavra in enumerate(programa[:-1]) if palavra != 0), default=-1)
+        if ultima + 2 < len(programa):
+            tentativa = caso.copiar(programa=tuple(programa[:ultima + 1]) + (HALT,))
+            if diverge(tentativa):
+                caso, mudou = tentativa, True
+
+        for registrador in range(32):
+            if caso.regs[registrador]:
+                regs = list(caso.regs)
+                regs[registrador] = 0
+                tentativa = caso.copiar(regs=tuple(regs))
+                if diverge(tentativa):
+                    caso, mudou = tentativa, True
+
+        for endereco in list(caso.dados):
+            dados = dict(caso.dados)
+            del dados[endereco]
+            tentativa = caso.copiar(dados=dados)
+            if diverge(tentativa):
+                caso, mudou = tentativa, True
+
+        if caso.flags:
+            tentativa = caso.copiar(flags=0)
+            if diverge(tentativa):
+                caso, mudou = tentativa, True
+
+    return _cortar_orcamento(caso, candidato, referencia)
+
+
+def _cortar_orcamento(caso, candidato, referencia):
+    # Checkpoint a cada instrução: o orçamento passa a terminar na primeira divergência
+    divergencia = comparar(caso, candidato, referencia, intervalo=1)
+    if divergencia is None:
+        return caso
+    indice, esperado, obtido = divergencia
+    return caso.copiar(orcamento=min(caso.orcamento, indice + 1))
+
+
+def formatar_caso(caso, candidato=None, referencia="referencia"):
+    """
+    Reprodutor legível: programa desmontado, estado inicial e, com o candidato, os campos divergentes.
+    """
+    linhas = [f"# semente {caso.semente}, orçamento {caso.orcamento} instruções"]
+    for endereco, palavra in enumerate(caso.programa):
+        linhas.append(f"{endereco:>5}: {palavra:08X}  {Desmontador.desmontar(palavra)}")
+    registradores = [f"r{i}={valor:#x}" for i, valor in enumerate(caso.regs) if valor]
+    linhas.append("registradores: " + (" ".join(registradores) or "todos zero"))
+    linhas.append("flags: N={} Z={} C={} O={}".format((caso.flags >> 3) & 1, (caso.flags >> 2) & 1, (caso.flags >> 1) & 1, caso.flags & 1))
+    if caso.dados:
+        linhas.append("dados: " + " ".join(f"M[{e}]={v:#x}" for e, v in sorted(caso.dados.items())))
+
+    if candidato is not None:
+        divergencia = comparar(caso, candidato, referencia, intervalo=1)
+        if divergencia is None:
+            linhas.append(f"'{candidato}' concorda com '{referencia}'.")
+        else:
+            indice, esperado, obtido = divergencia
+            linhas.append(f"divergência após o checkpoint {indice}: {', '.join(campos_divergentes(esperado, obtido))}")
+            linhas.append(f"  {referencia}: {esperado}")
+            linhas.append(f"  {candidato}: {obtido}")
+    return "\n".join(linhas)
+
+
+# ---- execução em paralelo ----
+
+def _executar_lote(inicio, quantidade, candidatos, tamanho, orcamento):
+    """
+    Roda em um processo do pool: gera e compara os casos [inicio, inicio + quantidade).
+    Devolve a lista de falhas (semente, candidato, campos divergentes).
+    """
+    falhas = []
+    for semente in range(inicio, inicio + quantidade):
+        caso = gerar_caso(semente, tamanho, orcamento)
+        esperados = executar_caso(caso, "referencia")
+        for candidato in candidatos:
+            obtidos = executar_caso(caso, candidato)
+            if obtidos != esperados:
+                for esperado, obtido in zip(esperados + [None], obtidos + [None]):
+                    if esperado != obtido:
+                        falhas.append((semente, candidato, campos_divergentes(esperado, obtido)))
+                        break
+    return falhas
+
+
+def fuzz(candidatos, quantidade, inicio=0, processos=None, tamanho=TAMANHO_PROGRAMA, orcamento=ORCAMENTO):
+    """
+    Compara os candidatos com a referência em `quantidade` programas a partir da semente `inicio`,
+    em lotes distribuídos por um pool de processos. Devolve {"programas", "falhas", "tempo"}.
+    """
+    for candidato in candidatos:
+        if candidato not in MOTORES:
+            raise ValueError(f"Motor desconhecido: {candidato}")
+
+    comeco = time.perf_counter()
+    falhas = []
+    lotes = [(semente, min(LOTE, inicio + quantidade - semente)) for semente in range(inicio, inicio + quantidade, LOTE)]
+    if processos == 1:
+        for semente, n in lotes:
+            falhas.extend(_executar_lote(semente, n, candidatos, tamanho, orcamento))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(_executar_lote, semente, n, candidatos, tamanho, orcamento) for semente, n in lotes]
+            for futuro in futuros:
+                falhas.extend(futuro.result())
+    return {"programas": quantidade, "falhas": falhas, "tempo": time.perf_counter() - comeco}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzing diferencial dos motores de execução UFLA-RISC.")
+    # O tradutor de blocos compila cada bloco novo: bem mais lento por programa, por isso só se pedido
+    parser.add_argument("--motores", default="interpretador,fusao,avanco_rapido",
+                        help="Motores candidatos, comparados com a referência (ciclo a ciclo); também: blocos")
+    parser.add_argument("--programas", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=0, help="Semente do primeiro programa")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tamanho", type=int, default=TAMANHO_PROGRAMA, help="Máximo de instruções por programa")
+    parser.add_argument("--orcamento", type=int, default=ORCAMENTO, help="Instruções executadas por programa")
+    parser.add_argument("--minimizar", type=int, default=3, help="Falhas minimizadas e mostradas")
+    args = parser.parse_args()
+
+    candidatos = [motor for motor in args.motores.split(",") if motor]
+    resultado = fuzz(candidatos, args.programas, args.semente, args.processos, args.tamanho, args.orcamento)
+    taxa = resultado["programas"] / resultado["tempo"] if resultado["tempo"] else 0.0
+    print(f"{resultado['programas']} programas x {len(candidatos)} motores em {resultado['tempo']:.2f} s "
+          f"({taxa:,.0f} programas/s), {len(resultado['falhas'])} falha(s)")
+
+    for semente, candidato, campos in resultado["falhas"][:args.minimizar]:
+        print(f"\n== semente {semente}: '{candidato}' diverge em {', '.join(campos)}")
+        caso = minimizar(gerar_caso(semente, args.tamanho, args.orcamento), candidato)
+        print(formatar_caso(caso, candidato))
+    return 1 if resultado["falhas"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
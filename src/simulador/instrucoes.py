@@ -1,17 +1,54 @@
+from src.simulador.checkpoint import BITS_PAGINA
+
+# Flags avaliadas sob demanda: cada operação guarda só (tipo, a, b, resultado)
+# em cpu.ultima_op_flags, e N/Z/C/O são calculadas apenas quando lidas.
+FLAGS_ADD = 0        # N/Z do resultado, C e O da soma a + b
+FLAGS_SUB = 1        # N/Z do resultado, C e O da subtração a - b
+FLAGS_RESULTADO = 2  # N/Z do resultado, C = O = 0
+FLAGS_FIXAS = 3      # Flags explícitas em a (bits N Z C O)
+
+FLAGS_ZEROS = (FLAGS_FIXAS, 0b0100, 0, 0)
+
+
 class Instrucoes:
 
+    @staticmethod
+    def calcular_flags(ultima_op):
+        """
+        Materializa (N, Z, C, O) a partir do registro da última operação.
+        """
+        tipo, a, b, resultado = ultima_op
+        if tipo == FLAGS_FIXAS:
+            return ((a >> 3) & 1, (a >> 2) & 1, (a >> 1) & 1, a & 1)
+
+        neg = (resultado >> 31) & 1
+        zero = 1 if resultado == 0 else 0
+        if tipo == FLAGS_RESULTADO:
+            return (neg, zero, 0, 0)
+
+        sinal_a = (a >> 31) & 1
+        sinal_b = (b >> 31) & 1
+        if tipo == FLAGS_ADD:
+            carry = 1 if a + b > 0xFFFFFFFF else 0
+            overflow = 1 if (sinal_a == sinal_b and neg != sinal_a) else 0
+        else:
+            carry = 1 if a < b else 0
+            overflow = 1 if (sinal_a != sinal_b and neg != sinal_a) else 0
+        return (neg, zero, carry, overflow)
+
+    @staticmethod
+    def fixar_flags(neg, zero, carry, overflow):
+        """
+        Registro de última operação com flags explícitas (usado ao escrever uma flag diretamente).
+        """
+        return (FLAGS_FIXAS, (neg << 3) | (zero << 2) | (carry << 1) | overflow, 0, 0)
+
     @staticmethod
     def add(cpu, ra, rb):
         a = cpu.regs[ra]
         b = cpu.regs[rb]
         resultado = (a + b) & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado & (1 << 31)) != 0 else 0
-        cpu.flag_carry = 1 if a + b > 0xFFFFFFFF else 0
-        sinal_a = (a >> 31) & 1
-        sinal_b = (b >> 31) & 1
-        sinal_r = (resultado >> 31) & 1
-        cpu.flag_overflow = 1 if (sinal_a == sinal_b and sinal_r != sinal_a) else 0
+        cpu.ultima_op_flags = (FLAGS_ADD, a, b, resultado)
         return resultado
     
     @staticmethod
@@ -19,21 +56,12 @@ class Instrucoes:
         a = cpu.regs[ra]
         b = cpu.regs[rb]
         resultado = (a - b) & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado & (1 << 31)) != 0 else 0
-        cpu.flag_carry = 1 if a < b else 0
-        sinal_a = (a >> 31) & 1
-        sinal_b = (b >> 31) & 1
-        sinal_r = (resultado >> 31) & 1
-        cpu.flag_overflow = 1 if (sinal_a != sinal_b and sinal_r != sinal_a) else 0
+        cpu.ultima_op_flags = (FLAGS_SUB, a, b, resultado)
         return resultado
     
     @staticmethod
     def zeros(cpu, rc):
-        cpu.flag_neg = 0
-        cpu.flag_zero = 1
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = FLAGS_ZEROS
         return 0
     
     @staticmethod
@@ -41,10 +69,7 @@ class Instrucoes:
         a = cpu.regs[ra]
         b = cpu.regs[rb]
         resultado = a ^ b
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado & 0xFFFFFFFF
     
     @staticmethod
@@ -52,20 +77,14 @@ class Instrucoes:
         a = cpu.regs[ra]
         b = cpu.regs[rb]
         resultado = a | b
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado & 0xFFFFFFFF
     
     @staticmethod
     def not_(cpu, ra):
         a = cpu.regs[ra]
         resultado = (~a) & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado
     
     @staticmethod
@@ -73,10 +92,7 @@ class Instrucoes:
         a = cpu.regs[ra]
         b = cpu.regs[rb]
         resultado = a & b
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado & 0xFFFFFFFF
     
     @staticmethod
@@ -84,10 +100,7 @@ class Instrucoes:
         a = cpu.regs[ra]
         shift = cpu.regs[rb] & 0x1F
         resultado = (a << shift) & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado
     
     @staticmethod
@@ -100,10 +113,7 @@ class Instrucoes:
         else:
             resultado = (a >> shift) | ((0xFFFFFFFF << (32 - shift)) if sinal else 0)
         resultado &= 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado
     
     @staticmethod
@@ -111,10 +121,7 @@ class Instrucoes:
         a = cpu.regs[ra]
         shift = cpu.regs[rb] & 0x1F
         resultado = (a << shift) & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado
     
     @staticmethod
@@ -122,63 +129,57 @@ class Instrucoes:
         a = cpu.regs[ra]
         shift = cpu.regs[rb] & 0x1F
         resultado = (a >> shift) & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado
     
     @staticmethod
     def copy(cpu, ra):
         resultado = cpu.regs[ra] & 0xFFFFFFFF
-        cpu.flag_zero = 1 if resultado == 0 else 0
-        cpu.flag_neg = 1 if (resultado >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, resultado)
         return resultado
     
     @staticmethod
     def lc_hi(cpu, const16, rc):
         atual = cpu.regs[rc]
         novo = ((const16 << 16) & 0xFFFF0000) | (atual & 0x0000FFFF)
-        cpu.flag_zero = 1 if novo == 0 else 0
-        cpu.flag_neg = 1 if (novo >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, novo)
         return novo & 0xFFFFFFFF
     
     @staticmethod
     def lc_lo(cpu, const16, rc):
         atual = cpu.regs[rc]
         novo = (const16 & 0xFFFF) | (atual & 0xFFFF0000)
-        cpu.flag_zero = 1 if novo == 0 else 0
-        cpu.flag_neg = 1 if (novo >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, novo)
         return novo & 0xFFFFFFFF
     
     @staticmethod
     def load(cpu, ra, rc):
         endereco = cpu.regs[ra]
-        endereco = endereco & 0xFFFF
+        endereco = endereco & cpu.mascara_endereco
         valor = cpu.memoria[endereco]
-        cpu.flag_zero = 1 if valor == 0 else 0
-        cpu.flag_neg = 1 if (valor >> 31) & 1 else 0
-        cpu.flag_carry = 0
-        cpu.flag_overflow = 0
+        cpu.ultima_op_flags = (FLAGS_RESULTADO, 0, 0, valor)
         return valor
     
     @staticmethod
     def store(cpu, ra, rc):
-        endereco = cpu.regs[rc] & 0xFFFF
+        endereco = cpu.regs[rc] & cpu.mascara_endereco
         valor = cpu.regs[ra] & 0xFFFFFFFF
         cpu.memoria[endereco] = valor
+        cpu.paginas_sujas.add(endereco >> BITS_PAGINA)
+        if endereco in cpu.cache_instrucoes:
+            cpu.invalidar_codigo(endereco)
         return None
     
     @staticmethod
     def jump(cpu, endereco24):
         cpu.pc = endereco24 & 0xFFFFFF
     
+    @staticmethod
+    def jal(cpu, endereco24):
+        # R31 guarda o endereço de retorno (instrução seguinte ao jal)
+        cpu.regs[31] = cpu.pc & 0xFFFFFFFF
+        cpu.pc = endereco24 & 0xFFFFFF
+
     @staticmethod
     def jr(cpu, ra):
         cpu.pc = cpu.regs[ra] & 0xFFFFFFFF
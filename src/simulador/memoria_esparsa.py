@@ -0,0 +1,147 @@
+from array import array
+
+from src.simulador.checkpoint import BITS_PAGINA, PALAVRAS_POR_PAGINA
+
+# Espaço de endereçamento dos saltos (endereço de 24 bits): 16M palavras
+BITS_ENDERECO_ESPARSA = 24
+TAMANHO_MEMORIA_ESPARSA = 1 << BITS_ENDERECO_ESPARSA
+
+MASCARA_PAGINA = PALAVRAS_POR_PAGINA - 1
+
+_PAGINA_ZERADA = array('I', [0]) * PALAVRAS_POR_PAGINA
+
+
+class MemoriaEsparsa:
+    """
+    Memória paginada esparsa: uma tabela de páginas (dicionário página -> array('I') de
+    PALAVRAS_POR_PAGINA palavras) alocadas na primeira escrita, já zeradas. Leituras de páginas
+    nunca escritas devolvem 0 sem alocar nada, então o uso de memória é proporcional às páginas
+    efetivamente escritas, mesmo cobrindo as 16M palavras.
+
+    Indexação por inteiro (e leitura por fatia contínua) como um array('I'); endereços fora de
+    [0, tamanho) levantam IndexError.
+    """
+    __slots__ = ("paginas", "tamanho")
+
+    def __init__(self, tamanho=TAMANHO_MEMORIA_ESPARSA):
+        self.paginas = {}
+        self.tamanho = tamanho
+
+    def __len__(self):
+        return self.tamanho
+
+    def __getitem__(self, endereco):
+        try:
+            return self.paginas[endereco >> BITS_PAGINA][endereco & MASCARA_PAGINA]
+        except KeyError:
+            if 0 <= endereco < self.tamanho:
+                return 0
+            raise IndexError(f"Endereço {endereco} fora da memória de {self.tamanho} palavras.")
+        except TypeError:
+            if not isinstance(endereco, slice):
+                raise
+            inicio, fim, passo = endereco.indices(self.tamanho)
+            if passo != 1:
+                raise ValueError("A memória esparsa só aceita fatias contínuas.")
+            return self.ler(inicio, max(fim - inicio, 0))
+
+    def __setitem__(self, endereco, valor):
+        try:
+            self.paginas[endereco >> BITS_PAGINA][endereco & MASCARA_PAGINA] = valor
+        except KeyError:
+            if not 0 <= endereco < self.tamanho:
+                raise IndexError(f"Endereço {endereco} fora da memória de {self.tamanho} palavras.")
+            pagina = self.paginas[endereco >> BITS_PAGINA] = array('I', _PAGINA_ZERADA)
+            pagina[endereco & MASCARA_PAGINA] = valor
+
+    def _verificar_intervalo(self, inicio, quantidade):
+        if inicio < 0 or inicio + quantidade > self.tamanho:
+            raise IndexError(
+                f"Intervalo [{inicio}, {inicio + quantidade}) fora da memória de {self.tamanho} palavras."
+            )
+
+    def ler(self, inicio, quantidade):
+        """
+        Copia quantidade palavras a partir de inicio para um array('I'), página a página.
+        """
+        self._verificar_intervalo(inicio, quantidade)
+        resultado = array('I')
+        endereco = inicio
+        fim = inicio + quantidade
+        while endereco < fim:
+            deslocamento = endereco & MASCARA_PAGINA
+            trecho = min(PALAVRAS_POR_PAGINA - deslocamento, fim - endereco)
+            pagina = self.paginas.get(endereco >> BITS_PAGINA)
+            if pagina is None:
+                resultado.extend(_PAGINA_ZERADA[:trecho])
+            else:
+                resultado.extend(pagina[deslocamento:deslocamento + trecho])
+            endereco += trecho
+        return resultado
+
+    def escrever(self, inicio, palavras):
+        """
+        Copia palavras (array('I'), memoryview de uint32 ou sequência de inteiros) a partir de
+        inicio, alocando as páginas atingidas. Devolve o conjunto de páginas escritas.
+        """
+        if not isinstance(palavras, (array, memoryview)):
+            palavras = array('I', palavras)
+        self._verificar_intervalo(inicio, len(palavras))
+
+        escritas = set()
+        origem = 0
+        endereco = inicio
+        fim = inicio + len(palavras)
+        while endereco < fim:
+            deslocamento = endereco & MASCARA_PAGINA
+            trecho = min(PALAVRAS_POR_PAGINA - deslocamento, fim - endereco)
+            numero = endereco >> BITS_PAGINA
+            pagina = self.paginas.get(numero)
+            if pagina is None:
+                pagina = self.paginas[numero] = array('I', _PAGINA_ZERADA)
+            with memoryview(pagina) as destino:
+                destino[deslocamento:deslocamento + trecho] = palavras[origem:origem + trecho]
+            escritas.add(numero)
+            origem += trecho
+            endereco += trecho
+        return escritas
+
+    def capturar(self, anteriores, sujas):
+        """
+        Páginas de um checkpoint: dicionário página -> bytes só com as páginas alocadas.
+        Com as páginas do checkpoint anterior, só as páginas sujas são copiadas.
+        """
+        if anteriores is None:
+            return {numero: pagina.tobytes() for numero, pagina in self.paginas.items()}
+        capturadas = dict(anteriores)
+        for numero in sujas:
+            pagina = self.paginas.get(numero)
+            if pagina is None:
+                capturadas.pop(numero, None)
+            else:
+                capturadas[numero] = pagina.tobytes()
+        return capturadas
+
+    def restaurar(self, capturadas, atuais, sujas):
+        """
+        Volta às páginas de um checkpoint. Com as páginas do último checkpoint (atuais), só as
+        páginas sujas ou diferentes entre os dois são regravadas; páginas ausentes do checkpoint
+        são liberadas. Devolve True se alguma página mudou.
+        """
+        if atuais is None:
+            mudou = bool(self.paginas or capturadas)
+            self.paginas.clear()
+            for numero, conteudo in capturadas.items():
+                self.paginas[numero] = array('I', conteudo)
+            return mudou
+
+        restaurar = set(sujas)
+        restaurar.update(numero for numero, conteudo in capturadas.items() if conteudo is not atuais.get(numero))
+        restaurar.update(numero for numero in atuais if numero not in capturadas)
+        for numero in restaurar:
+            conteudo = capturadas.get(numero)
+            if conteudo is None:
+                self.paginas.pop(numero, None)
+            else:
+                self.paginas[numero] = array('I', conteudo)
+        return bool(restaurar)
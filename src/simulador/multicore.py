@@ -0,0 +1,245 @@
+import argparse
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from src.interpretador.cache_montagem import CacheMontagem
+from src.interpretador.interpretador import Interpretador
+from src.simulador.processador import Processador, TRACE_DESLIGADO, TAMANHO_MEMORIA
+
+
+def _nucleo(memoria, pc):
+    # Processador cuja memória é a imagem compartilhada (memoryview de uint32), sem cópia
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+    cpu.memoria = memoria
+    cpu.pc = pc
+    return cpu
+
+
+def _executar_nucleo(nome_memoria, indice, pc, regs, ultima_op_flags, contador, max_steps):
+    """
+    Roda no processo de um núcleo: anexa a memória compartilhada pelo nome, executa e devolve o
+    estado final (registradores, flags, PC...). A memória é alterada diretamente na imagem.
+    """
+    memoria_compartilhada = shared_memory.SharedMemory(name=nome_memoria)
+    memoria = memoria_compartilhada.buf.cast('I')
+    cpu = _nucleo(memoria, pc)
+    try:
+        cpu.regs[:] = regs
+        cpu.ultima_op_flags = ultima_op_flags
+        cpu.contador_instrucoes = contador
+        erro = None
+        try:
+            cpu.run(max_steps)
+        except Exception as e:
+            erro = f"{type(e).__name__}: {e}"
+        return indice, cpu.pc, cpu.halted, cpu.contador_instrucoes, cpu.regs, cpu.ultima_op_flags, erro
+    finally:
+        # As views precisam ser liberadas antes de fechar o segmento
+        cpu.memoria = None
+        memoria.release()
+        memoria_compartilhada.close()
+
+
+class SistemaMulticore:
+    """
+    Vários núcleos UFLA-RISC sobre uma única imagem de memória de TAMANHO_MEMORIA palavras em
+    multiprocessing.shared_memory. Cada núcleo é um Processador com registradores, flags e PC
+    próprios (começando no endereço dado em `inicios`); todos leem e escrevem a mesma memória.
+
+    - executar_paralelo: cada núcleo roda em seu próprio processo do sistema, em paralelo de
+      verdade; a ordem entre acessos de núcleos diferentes não é determinística.
+    - executar_intercalado: rodízio determinístico no processo atual, `quantum` instruções por
+      núcleo a cada volta, para reproduzir uma intercalação exatamente.
+
+    Não há instruções atômicas: a sincronização fica a cargo do programa (ex.: cada núcleo
+    escreve na sua região e sinaliza o fim em uma palavra própria). No processo atual os núcleos
+    compartilham o cache de decodificação, e um store em código invalida a instrução para todos.
+    Em executar_paralelo cada processo decodifica por conta própria: código reescrito por outro
+    núcleo durante a execução paralela não é visto.
+
+    Uso:
+        with SistemaMulticore([0, 100, 200, 300]) as sistema:
+            sistema.carregar("programa.asm")
+            sistema.executar_paralelo()
+            print(sistema.estado())
+    """
+
+    def __init__(self, inicios):
+        if not inicios:
+            raise ValueError("O sistema precisa de pelo menos um núcleo.")
+        self._memoria_compartilhada = shared_memory.SharedMemory(create=True, size=TAMANHO_MEMORIA * 4)
+        self.memoria = self._memoria_compartilhada.buf.cast('I')
+        # Segmentos novos vêm zerados no Linux, mas não há garantia em todas as plataformas
+        self.memoria[:] = array('I', [0]) * TAMANHO_MEMORIA
+        self.nucleos = [_nucleo(self.memoria, inicio) for inicio in inicios]
+        self.erros = [None] * len(self.nucleos)
+        # Memória única, decodificação única: o store de qualquer núcleo encontra o endereço no
+        # cache comum, e a invalidação é repassada aos ouvintes (fusão, tradutor...) dos demais
+        self._repasses = set()
+        for nucleo in self.nucleos:
+            nucleo.cache_instrucoes = self.nucleos[0].cache_instrucoes
+            repasse = self._repassar_invalidacao(nucleo)
+            self._repasses.add(repasse)
+            nucleo.ouvintes_codigo.append(repasse)
+
+    @property
+    def nome_memoria(self):
+        return self._memoria_compartilhada.name
+
+    def carregar_programa(self, memoria_carregada):
+        """
+        Carrega o programa (mesmos formatos de Processador.carregar_programa) na memória compartilhada.
+        """
+        self.nucleos[0].carregar_programa(memoria_carregada)
+        self._limpar_caches()
+
+    def carregar(self, caminho):
+        """
+        Carrega um .asm (pelo cache de montagem) ou uma imagem binária na memória compartilhada.
+        """
+        if caminho.endswith(".asm"):
+            caminho = CacheMontagem.montar(caminho)
+        Interpretador.carregar_em(self.nucleos[0], caminho)
+        self._limpar_caches()
+
+    def _repassar_invalidacao(self, origem):
+        def repassar(endereco):
+            for nucleo in self.nucleos:
+                if nucleo is not origem:
+                    for ouvinte in nucleo.ouvintes_codigo:
+                        if ouvinte not in self._repasses:
+                            ouvinte(endereco)
+        return repassar
+
+    def _limpar_caches(self):
+        # A memória pode ter mudado por outro processo: redecodifica tudo (o repasse avisa os demais)
+        self.nucleos[0].limpar_cache_codigo()
+
+    def executar_intercalado(self, quantum=1, max_steps=None):
+        """
+        Rodízio determinístico: cada núcleo ainda ativo executa até `quantum` instruções por volta,
+        na ordem dos núcleos, até todos pararem (ou max_steps instruções por núcleo).
+        Devolve o total de instruções executadas.
+        """
+        if quantum < 1:
+            raise ValueError("O quantum precisa ser de pelo menos 1 instrução.")
+        inicio = [nucleo.contador_instrucoes for nucleo in self.nucleos]
+        total = 0
+        ativos = [i for i, nucleo in enumerate(self.nucleos) if not nucleo.halted and self.erros[i] is None]
+        while ativos:
+            restantes = []
+            for i in ativos:
+                nucleo = self.nucleos[i]
+                fatia = quantum
+                if max_steps is not None:
+                    fatia = min(fatia, max_steps - (nucleo.contador_instrucoes - inicio[i]))
+                    if fatia <= 0:
+                        continue
+                try:
+                    total += nucleo.run(fatia)
+                except Exception as e:
+                    self.erros[i] = f"{type(e).__name__}: {e}"
+                    continue
+                if not nucleo.halted:
+                    restantes.append(i)
+            ativos = restantes
+        return total
+
+    def executar_paralelo(self, max_steps=None):
+        """
+        Executa cada núcleo em um processo próprio até o halt (ou max_steps instruções por núcleo)
+        e traz de volta o estado final de cada um. Devolve o total de instruções executadas.
+        """
+        pendentes = [i for i, nucleo in enumerate(self.nucleos) if not nucleo.halted and self.erros[i] is None]
+        if not pendentes:
+            return 0
+        antes = sum(nucleo.contador_instrucoes for nucleo in self.nucleos)
+
+        with ProcessPoolExecutor(max_workers=len(pendentes)) as executor:
+            futuros = [
+                executor.submit(
+                    _executar_nucleo, self.nome_memoria, i, self.nucleos[i].pc, self.nucleos[i].regs,
+                    self.nucleos[i].ultima_op_flags, self.nucleos[i].contador_instrucoes, max_steps,
+                )
+                for i in pendentes
+            ]
+            for futuro in futuros:
+                indice, pc, halted, contador, regs, ultima_op_flags, erro = futuro.result()
+                nucleo = self.nucleos[indice]
+                nucleo.pc = pc
+                nucleo.halted = halted
+                nucleo.contador_instrucoes = contador
+                nucleo.regs[:] = regs
+                nucleo.ultima_op_flags = ultima_op_flags
+                self.erros[indice] = erro
+
+        self._limpar_caches()
+        return sum(nucleo.contador_instrucoes for nucleo in self.nucleos) - antes
+
+    def estado(self):
+        """
+        Resumo de cada núcleo: PC, halt, instruções executadas, registradores e erro.
+        """
+        return [
+            {
+                "nucleo": i,
+                "pc": nucleo.pc,
+                "halted": nucleo.halted,
+                "instrucoes": nucleo.contador_instrucoes,
+                "registradores": list(nucleo.regs),
+                "erro": self.erros[i],
+            }
+            for i, nucleo in enumerate(self.nucleos)
+        ]
+
+    def fechar(self):
+        """
+        Libera e remove a memória compartilhada.
+        """
+        if self.memoria is None:
+            return
+        for nucleo in self.nucleos:
+            nucleo.memoria = None
+        self.memoria.release()
+        self.memoria = None
+        self._memoria_compartilhada.close()
+        self._memoria_compartilhada.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa um programa UFLA-RISC em vários núcleos com memória compartilhada.")
+    parser.add_argument("programa", help="Arquivo .asm ou .bin")
+    parser.add_argument("--inicios", required=True, help="Endereço inicial de cada núcleo, separados por vírgula")
+    parser.add_argument("--intercalado", type=int, default=None, metavar="QUANTUM",
+                        help="Rodízio determinístico no processo atual, com este quantum (padrão: um processo por núcleo)")
+    parser.add_argument("--max-steps", type=int, default=None, help="Máximo de instruções por núcleo")
+    args = parser.parse_args()
+
+    inicios = [int(inicio, 0) for inicio in args.inicios.split(",")]
+    with SistemaMulticore(inicios) as sistema:
+        sistema.carregar(args.programa)
+        if args.intercalado is not None:
+            sistema.executar_intercalado(args.intercalado, args.max_steps)
+        else:
+            sistema.executar_paralelo(args.max_steps)
+
+        for resumo in sistema.estado():
+            texto = f"núcleo {resumo['nucleo']}: PC={resumo['pc']} halted={resumo['halted']} instruções={resumo['instrucoes']}"
+            if resumo["erro"]:
+                texto += f" erro={resumo['erro']}"
+            print(texto)
+            registradores = [f"R{j:02}={valor}" for j, valor in enumerate(resumo["registradores"]) if valor]
+            print("  " + ("  ".join(registradores) or "registradores zerados"))
+    return 1 if any(sistema.erros) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
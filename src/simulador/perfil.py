@@ -0,0 +1,136 @@
+import time
+from collections import Counter
+
+from src.simulador.unidade_controle import UnidadeControle
+from src.interpretador.desmontador import Desmontador
+
+OP = UnidadeControle.OPCODES
+NOMES_OPCODES = {opcode: nome for nome, opcode in OP.items()}
+
+_DESVIOS = (OP['BEQ'], OP['BNE'])
+_TERMINADORES = {OP['J'], OP['JAL'], OP['JR'], OP['BEQ'], OP['BNE']}
+
+
+class Perfilador:
+    """
+    Observador que conta execuções por PC e por opcode, desvios tomados/não tomados
+    e endereços acessados por load/store.
+
+    Uso:
+        perfil = Perfilador()
+        cpu.instalar_observador(perfil)
+        cpu.run()
+        print(perfil.relatorio())
+    """
+
+    def __init__(self):
+        self.por_pc = Counter()
+        self.por_opcode = Counter()
+        self.desvios = {}  # pc -> [tomados, não tomados]
+        self.loads = Counter()
+        self.stores = Counter()
+        self.palavras = {}  # pc -> palavra executada (para a desmontagem)
+        self.instrucoes = 0
+        self.inicio = None  # relógio começa na primeira instrução observada
+        self.fim = None
+        self._endereco = None  # endereço do load/store, lido antes que a instrução altere registradores
+
+    def antes(self, cpu, pc, decodificada):
+        # Só prepara: a instrução é contada em depois(), pois outro observador pode parar antes dela
+        if self.inicio is None:
+            self.inicio = time.perf_counter()
+        opcode = decodificada.opcode
+        if opcode == OP['LOAD']:
+            self._endereco = cpu.regs[decodificada.ra] & cpu.mascara_endereco
+        elif opcode == OP['STORE']:
+            self._endereco = cpu.regs[decodificada.rc] & cpu.mascara_endereco
+        return None
+
+    def depois(self, cpu, pc, decodificada):
+        opcode = decodificada.opcode
+        self.por_pc[pc] += 1
+        self.por_opcode[opcode] += 1
+        self.palavras[pc] = decodificada.palavra
+        self.instrucoes += 1
+
+        if opcode == OP['LOAD']:
+            self.loads[self._endereco] += 1
+        elif opcode == OP['STORE']:
+            self.stores[self._endereco] += 1
+        elif opcode in _DESVIOS:
+            contagem = self.desvios.get(pc)
+            if contagem is None:
+                contagem = self.desvios[pc] = [0, 0]
+            # beq/bne não escrevem registradores: a comparação pode ser refeita aqui. O PC seguinte
+            # não serve, pois um desvio tomado com offset 1 também cai em pc + 1.
+            iguais = cpu.regs[decodificada.ra] == cpu.regs[decodificada.rb]
+            contagem[0 if iguais == (opcode == OP['BEQ']) else 1] += 1
+        self.fim = time.perf_counter()
+        return None
+
+    def instrucoes_por_segundo(self):
+        """
+        Instruções simuladas por segundo de tempo do host, da primeira à última instrução observada.
+        """
+        if self.inicio is None:
+            return 0.0
+        decorrido = (self.fim or time.perf_counter()) - self.inicio
+        return self.instrucoes / decorrido if decorrido > 0 else 0.0
+
+    def opcodes(self):
+        """
+        Contagem por nome de opcode (nomes de UnidadeControle.OPCODES).
+        """
+        return {NOMES_OPCODES.get(opcode, f"0x{opcode:02X}"): total for opcode, total in self.por_opcode.most_common()}
+
+    def blocos_quentes(self, quantidade=10):
+        """
+        Agrupa os PCs executados em blocos básicos (trechos contíguos com a mesma contagem,
+        terminando em desvio) e devolve os mais executados: (início, fim, execuções, instruções).
+        """
+        blocos = []
+        atual = None
+        for pc in sorted(self.por_pc):
+            contagem = self.por_pc[pc]
+            if atual is not None and pc == atual[1] + 1 and contagem == atual[2] and not atual[3]:
+                atual[1] = pc
+            else:
+                atual = [pc, pc, contagem, False]
+                blocos.append(atual)
+            atual[3] = (self.palavras[pc] >> 24) & 0xFF in _TERMINADORES
+
+        resultado = [(inicio, fim, contagem, contagem * (fim - inicio + 1)) for inicio, fim, contagem, _ in blocos]
+        resultado.sort(key=lambda bloco: bloco[3], reverse=True)
+        return resultado[:quantidade]
+
+    def relatorio(self, quantidade_blocos=5):
+        """
+        Relatório em texto: velocidade, opcodes, desvios, acessos à memória e blocos quentes desmontados.
+        """
+        linhas = [
+            f"Instruções executadas: {self.instrucoes}",
+            f"Velocidade do host: {self.instrucoes_por_segundo():,.0f} instruções/s",
+            "",
+            "Opcodes:",
+        ]
+        for nome, total in self.opcodes().items():
+            linhas.append(f"  {nome:<6} {total:>12} ({100 * total / max(self.instrucoes, 1):5.1f}%)")
+
+        if self.desvios:
+            linhas += ["", "Desvios (tomados / não tomados):"]
+            for pc, (tomados, nao_tomados) in sorted(self.desvios.items()):
+                linhas.append(f"  {pc:>6}: {tomados:>10} / {nao_tomados:<10} {Desmontador.desmontar(self.palavras[pc])}")
+
+        for titulo, histograma in (("Loads", self.loads), ("Stores", self.stores)):
+            if histograma:
+                linhas += ["", f"{titulo} (endereços mais acessados):"]
+                for endereco, total in histograma.most_common(10):
+                    linhas.append(f"  {endereco:>6}: {total}")
+
+        linhas += ["", "Blocos quentes:"]
+        for inicio, fim, contagem, total in self.blocos_quentes(quantidade_blocos):
+            linhas.append(f"  [{inicio}..{fim}] executado {contagem} vezes ({total} instruções)")
+            for pc in range(inicio, fim + 1):
+                linhas.append(f"    {pc:>6}: {Desmontador.desmontar(self.palavras[pc])}")
+
+        return "\n".join(linhas)
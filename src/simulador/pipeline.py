@@ -0,0 +1,206 @@
+from src.simulador.unidade_controle import UnidadeControle
+from src.interpretador.desmontador import Desmontador
+
+OP = UnidadeControle.OPCODES
+
+# Registradores lidos e escrito por opcode (nomes dos campos da instrução decodificada)
+_ALU_AB = (("ra", "rb"), "rc")
+_OPERANDOS = {
+    OP['ADD']: _ALU_AB, OP['SUB']: _ALU_AB, OP['XOR']: _ALU_AB, OP['OR']: _ALU_AB, OP['AND']: _ALU_AB,
+    OP['ASL']: _ALU_AB, OP['ASR']: _ALU_AB, OP['LSL']: _ALU_AB, OP['LSR']: _ALU_AB,
+    OP['NOT']: (("ra",), "rc"), OP['COPY']: (("ra",), "rc"),
+    OP['ZERO']: ((), "rc"),
+    # lch/lcl preservam metade de rc: leem o valor anterior
+    OP['LC_HI']: (("rc",), "rc"), OP['LC_LO']: (("rc",), "rc"),
+    OP['LOAD']: (("ra",), "rc"),
+    OP['STORE']: (("ra", "rc"), None),
+    OP['BEQ']: (("ra", "rb"), None), OP['BNE']: (("ra", "rb"), None),
+    OP['JR']: (("ra",), None),
+    OP['J']: ((), None), OP['JAL']: ((), None),
+}
+
+# Penalidades (ciclos perdidos) das transferências de controle. Os desvios usam previsão
+# "não tomado" e são resolvidos em EX; j/jal têm o destino conhecido já em ID; jr depende
+# de um registrador e também é resolvido em EX.
+PENALIDADES_PADRAO = {
+    "desvio_tomado": 2,
+    "salto": 1,
+    "jr": 2,
+}
+
+
+class ModeloPipeline:
+    """
+    Modelo de tempo de um pipeline clássico de 5 estágios (IF, ID, EX, MEM, WB), em ordem e com
+    uma instrução por ciclo. É um observador: a execução funcional continua sendo do Processador,
+    e o modelo calcula em que ciclo cada instrução executada passa por EX.
+
+    - Hazards RAW nos registradores geram bolhas. Com adiantamento (forwarding) o resultado da
+      ULA chega à instrução seguinte sem bolha e um load seguido de uso custa 1 ciclo; sem
+      adiantamento o valor só é lido em ID no ciclo do WB do produtor.
+    - Transferências de controle descartam as instruções buscadas no caminho errado (flush),
+      com o custo de PENALIDADES_PADRAO.
+
+    Uso:
+        modelo = ModeloPipeline()
+        cpu.instalar_observador(modelo)
+        cpu.run()
+        print(modelo.relatorio())
+    """
+
+    def __init__(self, adiantamento=True, penalidades=None, registrar=0):
+        self.adiantamento = adiantamento
+        self.penalidades = dict(PENALIDADES_PADRAO)
+        if penalidades:
+            self.penalidades.update(penalidades)
+
+        # Ciclos entre o EX do produtor e o primeiro EX possível do consumidor
+        self.latencia_ula = 1 if adiantamento else 3
+        self.latencia_load = 2 if adiantamento else 3
+
+        self.instrucoes = 0
+        self.ultimo_ex = 0
+        self.proximo_ex = 3  # a primeira instrução: IF no ciclo 1, ID no 2, EX no 3
+        self.pronto = [0] * 32  # registrador -> primeiro ciclo em que pode alimentar um EX
+        self.produzido_por_load = [False] * 32
+
+        self.bolhas = {"dados": 0, "load_uso": 0}
+        self.flushes = {"desvio_tomado": 0, "salto": 0, "jr": 0}
+        self.ciclos_flush = {"desvio_tomado": 0, "salto": 0, "jr": 0}
+        self.desvios_nao_tomados = 0
+
+        # Linha do tempo das primeiras `registrar` instruções: (pc, palavra, ciclo de EX, bolhas)
+        self.registrar = registrar
+        self.linha_do_tempo = []
+
+        self._operandos = {}
+
+    def _operandos_de(self, decodificada):
+        operandos = self._operandos.get(decodificada.palavra)
+        if operandos is None:
+            campos, destino = _OPERANDOS.get(decodificada.opcode, ((), None))
+            fontes = tuple(getattr(decodificada, campo) for campo in campos)
+            if decodificada.opcode == OP['JAL']:
+                escrito = 31
+            else:
+                escrito = getattr(decodificada, destino) if destino else None
+            operandos = self._operandos[decodificada.palavra] = (fontes, escrito)
+        return operandos
+
+    def antes(self, cpu, pc, decodificada):
+        return None
+
+    def depois(self, cpu, pc, decodificada):
+        fontes, escrito = self._operandos_de(decodificada)
+        opcode = decodificada.opcode
+
+        ex = self.proximo_ex
+        bolhas = 0
+        for registrador in fontes:
+            pronto = self.pronto[registrador]
+            if pronto > ex:
+                tipo = "load_uso" if self.produzido_por_load[registrador] else "dados"
+                self.bolhas[tipo] += pronto - ex
+                bolhas += pronto - ex
+                ex = pronto
+
+        if escrito is not None:
+            eh_load = opcode == OP['LOAD']
+            self.pronto[escrito] = ex + (self.latencia_load if eh_load else self.latencia_ula)
+            self.produzido_por_load[escrito] = eh_load
+
+        proximo = ex + 1
+        if opcode == OP['BEQ'] or opcode == OP['BNE']:
+            # Pela comparação, não pelo PC seguinte: tomado com offset 1 também cai em pc + 1
+            iguais = cpu.regs[decodificada.ra] == cpu.regs[decodificada.rb]
+            if iguais == (opcode == OP['BEQ']):
+                proximo += self._flush("desvio_tomado")
+            else:
+                self.desvios_nao_tomados += 1
+        elif opcode == OP['J'] or opcode == OP['JAL']:
+            proximo += self._flush("salto")
+        elif opcode == OP['JR']:
+            proximo += self._flush("jr")
+
+        self.instrucoes += 1
+        self.ultimo_ex = ex
+        self.proximo_ex = proximo
+        if len(self.linha_do_tempo) < self.registrar:
+            self.linha_do_tempo.append((pc, decodificada.palavra, ex, bolhas))
+        return None
+
+    def _flush(self, tipo):
+        penalidade = self.penalidades[tipo]
+        self.flushes[tipo] += 1
+        self.ciclos_flush[tipo] += penalidade
+        return penalidade
+
+    @property
+    def ciclos(self):
+        """
+        Ciclos até o WB da última instrução executada (o halt não entra na conta).
+        """
+        return self.ultimo_ex + 2 if self.instrucoes else 0
+
+    @property
+    def cpi(self):
+        return self.ciclos / self.instrucoes if self.instrucoes else 0.0
+
+    def resumo(self):
+        """
+        Estatísticas em um dicionário serializável em JSON.
+        """
+        return {
+            "instrucoes": self.instrucoes,
+            "ciclos": self.ciclos,
+            "cpi": self.cpi,
+            "adiantamento": self.adiantamento,
+            "bolhas": dict(self.bolhas),
+            "flushes": dict(self.flushes),
+            "ciclos_flush": dict(self.ciclos_flush),
+            "desvios_nao_tomados": self.desvios_nao_tomados,
+        }
+
+    def relatorio(self):
+        """
+        Relatório em texto: ciclos, CPI, bolhas por causa e flushes por tipo de desvio.
+        """
+        linhas = [
+            f"Instruções: {self.instrucoes}",
+            f"Ciclos: {self.ciclos}",
+            f"CPI: {self.cpi:.3f}",
+            f"Adiantamento: {'sim' if self.adiantamento else 'não'}",
+            "",
+            "Bolhas (hazards de dados):",
+            f"  dependência de dados: {self.bolhas['dados']}",
+            f"  load seguido de uso:  {self.bolhas['load_uso']}",
+            "",
+            "Flushes (transferências de controle):",
+        ]
+        for tipo in ("desvio_tomado", "salto", "jr"):
+            linhas.append(f"  {tipo:<14} {self.flushes[tipo]:>10} ({self.ciclos_flush[tipo]} ciclos)")
+        linhas.append(f"  desvios não tomados: {self.desvios_nao_tomados}")
+        return "\n".join(linhas)
+
+    def diagrama(self):
+        """
+        Diagrama de ocupação dos estágios para as instruções registradas (ver parâmetro registrar).
+        Bolhas aparecem como '--' entre ID e EX.
+        """
+        if not self.linha_do_tempo:
+            return ""
+        primeiro = self.linha_do_tempo[0][2] - 2 - self.linha_do_tempo[0][3]
+        ultimo = self.linha_do_tempo[-1][2] + 2
+        largura = 4
+
+        linhas = []
+        cabecalho = " " * 30 + "".join(f"{ciclo:<{largura}}" for ciclo in range(primeiro, ultimo + 1))
+        linhas.append(cabecalho.rstrip())
+        for pc, palavra, ex, bolhas in self.linha_do_tempo:
+            celulas = {ex - 2 - bolhas: "IF", ex - 1 - bolhas: "ID", ex: "EX", ex + 1: "MEM", ex + 2: "WB"}
+            for ciclo in range(ex - bolhas, ex):
+                celulas[ciclo] = "--"
+            texto = f"{pc:>6}: {Desmontador.desmontar(palavra):<22}"
+            texto += "".join(f"{celulas.get(ciclo, ''):<{largura}}" for ciclo in range(primeiro, ultimo + 1))
+            linhas.append(texto.rstrip())
+        return "\n".join(linhas)
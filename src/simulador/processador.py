@@ -1,15 +1,66 @@
-from src.simulador.unidade_controle import UnidadeControle
+import struct
+import sys
+from array import array
+
 from src.simulador.instrucoes import Instrucoes
-from src.simulador.opcodes import OPCODES
+from src.simulador.decodificador import Decodificador
+from src.simulador.checkpoint import Checkpoint, BITS_PAGINA, PALAVRAS_POR_PAGINA
+from src.simulador.memoria_esparsa import MemoriaEsparsa
+from src.simulador.avanco_rapido import AvancoRapido
+from src.simulador.fusao import Fusao, TIPOS as TIPOS_FUSAO
+
+# Níveis de trace (dump_estado)
+TRACE_DESLIGADO = 0  # Sem dump: execução direta pelo run()
+TRACE_INSTRUCAO = 1  # Um dump por instrução
+TRACE_ESTAGIO = 2    # Um dump por estágio (IF, ID, EX, WB)
+
+HALT = 0xFFFFFFFF
+
+NUM_REGISTRADORES = 32
+TAMANHO_MEMORIA = 65536  # Memória de 64K palavras de 32 bits
+
+# Vetores zerados usados como molde: a repetição de um array é feita em C, sem laço Python
+_REGS_ZERADOS = array('I', [0]) * NUM_REGISTRADORES
+_MEMORIA_ZERADA = array('I', [0]) * TAMANHO_MEMORIA
+
+# Estado serializado (to_bytes/from_bytes):
+#   cabeçalho: magic (4 bytes) | versão (uint16) | indicadores (uint16) | pc (int64) | ir (uint32)
+#              | opcode, ra, rb, rc (uint8) | instruções executadas (uint64)
+#              | última operação das flags: tipo (uint8), a, b, resultado (uint32)
+#              | resultado_alu (uint32) | última escrita: registrador (uint8), valor (uint32)
+#              | tamanho da memória em palavras (uint32) | número de páginas gravadas (uint32)
+#   registradores (32 x uint32) | número de cada página (uint32) | páginas (PALAVRAS_POR_PAGINA x uint32 cada)
+# Só as páginas não nulas são gravadas. Todos os campos em little-endian.
+MAGIC_ESTADO = b"URSE"
+VERSAO_ESTADO = 1
+
+_ESTADO = struct.Struct("<4sHHqIBBBBQBIIIIBIII")
+_HALTED = 1
+_ESPARSA = 2
+_COM_RESULTADO_ALU = 4
+_COM_ULTIMA_ESCRITA = 8
+
+_PAGINA_NULA = bytes(4 * PALAVRAS_POR_PAGINA)
+_HOST_LITTLE_ENDIAN = sys.byteorder == "little"
 
 class Processador:
-    def __init__(self):
-        self.regs = [0] * 32
+    # Campos fixos: sem __dict__ por instância (ProcessadorObservado também não acrescenta nenhum)
+    __slots__ = (
+        "regs", "ultima_op_flags", "opcode", "ra", "rb", "rc", "pc", "ir",
+        "resultado_alu", "ultimo_write_reg", "flags_anteriores",
+        "memoria_esparsa", "memoria", "mascara_endereco", "paginas_sujas", "_ultimo_checkpoint",
+        "cache_instrucoes", "decodificada", "ouvintes_codigo", "halted", "contador_instrucoes",
+        "observadores", "parada", "avanco_rapido", "lacos_analisados", "fusao", "fusoes",
+        "estatisticas_fusao", "nivel_trace", "caminho_log", "log_arquivo",
+    )
+
+    def __init__(self, nivel_trace=TRACE_ESTAGIO, caminho_log="execucao_dump.txt", avanco_rapido=False, fusao=False,
+                 memoria_esparsa=False):
+        # Registradores e memória em arrays de uint32 (sem um objeto int por palavra)
+        self.regs = array('I', _REGS_ZERADOS)
         
-        self.flag_neg = 0
-        self.flag_zero = 0
-        self.flag_carry = 0
-        self.flag_overflow = 0
+        # Flags preguiçosas: apenas a última operação é registrada (ver Instrucoes.calcular_flags)
+        self.ultima_op_flags = Instrucoes.fixar_flags(0, 0, 0, 0)
 
         self.opcode = 0
         self.ra = 0
@@ -19,22 +70,356 @@ class Processador:
         self.pc = 0
         self.ir = 0
 
-        self.memoria = [0] * 65536  # Memória de 64K (65536 endereços)
+        # Resultado entre EX e WB e última escrita em registrador (para o dump); None quando não há
+        self.resultado_alu = None
+        self.ultimo_write_reg = None
+        self.flags_anteriores = None
+
+        # Memória densa de 64K palavras, ou esparsa cobrindo os 16M endereços dos saltos (ver MemoriaEsparsa)
+        self.memoria_esparsa = memoria_esparsa
+        if memoria_esparsa:
+            self.memoria = MemoriaEsparsa()
+        else:
+            self.memoria = array('I', _MEMORIA_ZERADA)
+        # Máscara dos endereços de load/store: 16 bits na memória densa, 24 bits na esparsa
+        self.mascara_endereco = len(self.memoria) - 1
+
+        # Páginas escritas desde o último checkpoint (copy-on-write)
+        self.paginas_sujas = set()
+        self._ultimo_checkpoint = None
+
+        # Cache de instruções decodificadas: endereço -> InstrucaoDecodificada
+        self.cache_instrucoes = {}
+        self.decodificada = None
+        # Funções chamadas com o endereço invalidado (ou None quando todo o cache é descartado)
+        self.ouvintes_codigo = []
 
         self.halted = False
+        self.contador_instrucoes = 0
+
+        # Observadores (perfilador, modelos de tempo...): ver instalar_observador
+        self.observadores = []
+        self.parada = None
+
+        # Avanço rápido de laços ociosos no run() sem trace (ver AvancoRapido)
+        self.avanco_rapido = avanco_rapido
+        self.lacos_analisados = None
 
-         # Arquivo de log (criado automaticamente)
-        self.log_arquivo = open("execucao_dump.txt", "w", encoding="utf-8")
+        # Superinstruções no run() sem trace (ver Fusao); o avanço rápido tem precedência
+        self.fusao = fusao
+        self.fusoes = None
+        self.estatisticas_fusao = dict.fromkeys(TIPOS_FUSAO, 0)
 
-        # Escreve cabeçalho no log
-        self.log_arquivo.write("===== INÍCIO DA EXECUÇÃO =====\n\n")
+        # Arquivo de log: só é aberto no primeiro dump, e só se o trace estiver ligado
+        self.nivel_trace = nivel_trace
+        self.caminho_log = caminho_log
+        self.log_arquivo = None
+
+    def flags(self):
+        """
+        Devolve (N, Z, C, O), calculadas a partir da última operação
+        """
+        return Instrucoes.calcular_flags(self.ultima_op_flags)
+
+    def _definir_flag(self, indice, valor):
+        flags = list(self.flags())
+        flags[indice] = 1 if valor else 0
+        self.ultima_op_flags = Instrucoes.fixar_flags(*flags)
+
+    @property
+    def flag_neg(self):
+        return self.flags()[0]
+
+    @flag_neg.setter
+    def flag_neg(self, valor):
+        self._definir_flag(0, valor)
+
+    @property
+    def flag_zero(self):
+        return self.flags()[1]
+
+    @flag_zero.setter
+    def flag_zero(self, valor):
+        self._definir_flag(1, valor)
+
+    @property
+    def flag_carry(self):
+        return self.flags()[2]
+
+    @flag_carry.setter
+    def flag_carry(self, valor):
+        self._definir_flag(2, valor)
+
+    @property
+    def flag_overflow(self):
+        return self.flags()[3]
+
+    @flag_overflow.setter
+    def flag_overflow(self, valor):
+        self._definir_flag(3, valor)
 
     def carregar_programa(self, memoria_carregada):
         """
-        Carrega o programa na memória do processador
+        Carrega o programa na memória do processador.
+        Aceita um dicionário endereço -> palavra ou uma lista de segmentos (endereço_base, palavras),
+        onde palavras pode ser um array('I') ou uma memoryview de uint32 (ex.: sobre um mmap);
+        cada trecho contíguo é copiado de uma só vez por atribuição de fatia.
+        """
+        if isinstance(memoria_carregada, dict):
+            segmentos = Processador._agrupar_segmentos(memoria_carregada)
+        else:
+            segmentos = memoria_carregada
+
+        if self.memoria_esparsa:
+            for base, palavras in segmentos:
+                self._verificar_segmento(base, palavras)
+                self.paginas_sujas.update(self.memoria.escrever(base, palavras))
+            self.limpar_cache_codigo()
+            return
+
+        with memoryview(self.memoria) as destino:
+            for base, palavras in segmentos:
+                self._verificar_segmento(base, palavras)
+                if not isinstance(palavras, (array, memoryview)):
+                    palavras = array('I', palavras)
+                destino[base:base + len(palavras)] = palavras
+                if len(palavras):
+                    self.paginas_sujas.update(range(base >> BITS_PAGINA, ((base + len(palavras) - 1) >> BITS_PAGINA) + 1))
+        self.limpar_cache_codigo()
+
+    def _verificar_segmento(self, base, palavras):
+        if base < 0 or base + len(palavras) > len(self.memoria):
+            raise IndexError(
+                f"Segmento em {base} com {len(palavras)} palavras excede a memória de {len(self.memoria)} palavras."
+            )
+
+    @staticmethod
+    def _agrupar_segmentos(memoria_carregada):
+        """
+        Converte um dicionário endereço -> palavra em segmentos contíguos (endereço_base, array)
+        """
+        segmentos = []
+        base = None
+        palavras = None
+        proximo = None
+        for endereco in sorted(memoria_carregada):
+            if endereco != proximo:
+                palavras = array('I')
+                base = endereco
+                segmentos.append((base, palavras))
+            palavras.append(memoria_carregada[endereco])
+            proximo = endereco + 1
+        return segmentos
+
+    def memoria_view(self):
+        """
+        Exporta a memória como memoryview (sem cópia) de palavras de 32 bits.
+        Só disponível na memória densa: a esparsa não é contínua.
+        """
+        if self.memoria_esparsa:
+            raise TypeError("A memória esparsa não pode ser exportada como memoryview; use memoria.ler(inicio, quantidade).")
+        return memoryview(self.memoria)
+
+    def registradores_view(self):
+        """
+        Exporta o banco de registradores como memoryview (sem cópia)
+        """
+        return memoryview(self.regs)
+
+    def invalidar_codigo(self, endereco):
+        """
+        Descarta a decodificação do endereço (chamado quando um store sobrescreve código)
+        """
+        self.cache_instrucoes.pop(endereco, None)
+        for ouvinte in self.ouvintes_codigo:
+            ouvinte(endereco)
+
+    def limpar_cache_codigo(self):
+        """
+        Descarta todas as instruções decodificadas (ex.: ao carregar um novo programa)
+        """
+        self.cache_instrucoes.clear()
+        for ouvinte in self.ouvintes_codigo:
+            ouvinte(None)
+
+    def checkpoint(self):
+        """
+        Captura registradores, flags, PC e memória. Só as páginas sujas desde o checkpoint
+        anterior são copiadas; as demais são compartilhadas com ele.
+        """
+        anterior = self._ultimo_checkpoint
+        if self.memoria_esparsa:
+            paginas = self.memoria.capturar(None if anterior is None else anterior.paginas, self.paginas_sujas)
+            return self._registrar_checkpoint(paginas)
+
+        with memoryview(self.memoria) as visao:
+            if anterior is None:
+                paginas = [
+                    visao[inicio:inicio + PALAVRAS_POR_PAGINA].tobytes()
+                    for inicio in range(0, len(visao), PALAVRAS_POR_PAGINA)
+                ]
+            else:
+                paginas = list(anterior.paginas)
+                for pagina in self.paginas_sujas:
+                    inicio = pagina << BITS_PAGINA
+                    paginas[pagina] = visao[inicio:inicio + PALAVRAS_POR_PAGINA].tobytes()
+        return self._registrar_checkpoint(tuple(paginas))
+
+    def _registrar_checkpoint(self, paginas):
+        self.paginas_sujas.clear()
+        checkpoint = Checkpoint(
+            array('I', self.regs), self.ultima_op_flags, self.pc, self.halted,
+            self.contador_instrucoes, paginas,
+        )
+        self._ultimo_checkpoint = checkpoint
+        return checkpoint
+
+    def restore(self, checkpoint):
+        """
+        Restaura um checkpoint. Só são regravadas as páginas que diferem do estado atual.
         """
-        for endereco, instrucao in memoria_carregada.items():
-            self.memoria[endereco] = instrucao
+        atual = self._ultimo_checkpoint
+        if isinstance(checkpoint.paginas, dict) != self.memoria_esparsa:
+            raise ValueError("Checkpoint e processador usam modelos de memória diferentes (densa/esparsa).")
+
+        if self.memoria_esparsa:
+            if self.memoria.restaurar(checkpoint.paginas, None if atual is None else atual.paginas, self.paginas_sujas):
+                self.limpar_cache_codigo()
+        else:
+            if atual is None:
+                restaurar = range(len(checkpoint.paginas))
+            else:
+                restaurar = set(self.paginas_sujas)
+                restaurar.update(
+                    pagina for pagina, conteudo in enumerate(checkpoint.paginas)
+                    if conteudo is not atual.paginas[pagina]
+                )
+
+            if restaurar:
+                with memoryview(self.memoria) as visao:
+                    for pagina in restaurar:
+                        inicio = pagina << BITS_PAGINA
+                        visao[inicio:inicio + PALAVRAS_POR_PAGINA] = memoryview(checkpoint.paginas[pagina]).cast('I')
+                self.limpar_cache_codigo()
+
+        self.regs[:] = checkpoint.regs
+        self.ultima_op_flags = checkpoint.ultima_op_flags
+        self.pc = checkpoint.pc
+        self.halted = checkpoint.halted
+        self.contador_instrucoes = checkpoint.contador_instrucoes
+        self.paginas_sujas.clear()
+        self._ultimo_checkpoint = checkpoint
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializa o estado arquitetural e de pipeline (registradores, flags, PC, IR, campos
+        decodificados, resultado pendente e memória) num buffer compacto: só as páginas não nulas
+        da memória são gravadas. Configuração (trace, avanço rápido, fusão), caches e observadores
+        ficam de fora.
+        """
+        if self.memoria_esparsa:
+            candidatas = sorted((numero, pagina.tobytes()) for numero, pagina in self.memoria.paginas.items())
+        else:
+            bruto = memoryview(self.memoria).cast('B').tobytes()
+            tamanho_pagina = len(_PAGINA_NULA)
+            candidatas = [
+                (inicio // tamanho_pagina, bruto[inicio:inicio + tamanho_pagina])
+                for inicio in range(0, len(bruto), tamanho_pagina)
+            ]
+        numeros = array('I')
+        conteudo = []
+        for numero, pagina in candidatas:
+            if pagina != _PAGINA_NULA:
+                numeros.append(numero)
+                conteudo.append(pagina)
+
+        regs = array('I', self.regs)
+        paginas = array('I')
+        paginas.frombytes(b"".join(conteudo))
+        if not _HOST_LITTLE_ENDIAN:
+            for vetor in (regs, numeros, paginas):
+                vetor.byteswap()
+
+        indicadores = (
+            (_HALTED if self.halted else 0) | (_ESPARSA if self.memoria_esparsa else 0)
+            | (_COM_RESULTADO_ALU if self.resultado_alu is not None else 0)
+            | (_COM_ULTIMA_ESCRITA if self.ultimo_write_reg is not None else 0)
+        )
+        tipo_flags, a, b, resultado = self.ultima_op_flags
+        reg_escrita, valor_escrita = self.ultimo_write_reg or (0, 0)
+        cabecalho = _ESTADO.pack(
+            MAGIC_ESTADO, VERSAO_ESTADO, indicadores, self.pc, self.ir,
+            self.opcode, self.ra, self.rb, self.rc, self.contador_instrucoes,
+            tipo_flags, a, b, resultado, self.resultado_alu or 0, reg_escrita, valor_escrita,
+            len(self.memoria), len(numeros),
+        )
+        return b"".join((cabecalho, regs.tobytes(), numeros.tobytes(), paginas.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, dados, **opcoes):
+        """
+        Cria um processador com o estado serializado por to_bytes. O modelo de memória (densa ou
+        esparsa) vem dos dados; as demais opções do construtor (nivel_trace, fusao...) são repassadas.
+        """
+        visao = memoryview(dados)
+        if len(visao) < _ESTADO.size:
+            raise ValueError("Estado serializado truncado: cabeçalho incompleto.")
+        (magic, versao, indicadores, pc, ir, opcode, ra, rb, rc, contador, tipo_flags, a, b, resultado,
+         resultado_alu, reg_escrita, valor_escrita, tamanho, quantidade) = _ESTADO.unpack_from(visao, 0)
+        if magic != MAGIC_ESTADO:
+            raise ValueError("Dados não são um estado serializado de processador UFLA-RISC.")
+        if versao != VERSAO_ESTADO:
+            raise ValueError(f"Versão de estado não suportada: {versao} (esperada {VERSAO_ESTADO}).")
+
+        cpu = cls(memoria_esparsa=bool(indicadores & _ESPARSA), **opcoes)
+        if tamanho != len(cpu.memoria):
+            raise ValueError(f"Estado com memória de {tamanho} palavras; o processador tem {len(cpu.memoria)}.")
+
+        posicao = _ESTADO.size
+        fim = posicao + 4 * (NUM_REGISTRADORES + quantidade + quantidade * PALAVRAS_POR_PAGINA)
+        if len(visao) != fim:
+            raise ValueError("Estado serializado truncado ou com dados extras.")
+        regs = array('I')
+        regs.frombytes(visao[posicao:posicao + 4 * NUM_REGISTRADORES])
+        posicao += 4 * NUM_REGISTRADORES
+        numeros = array('I')
+        numeros.frombytes(visao[posicao:posicao + 4 * quantidade])
+        posicao += 4 * quantidade
+        paginas = array('I')
+        paginas.frombytes(visao[posicao:fim])
+        if not _HOST_LITTLE_ENDIAN:
+            for vetor in (regs, numeros, paginas):
+                vetor.byteswap()
+
+        total_paginas = tamanho >> BITS_PAGINA
+        for i, numero in enumerate(numeros):
+            if numero >= total_paginas:
+                raise ValueError(f"Página {numero} fora da memória de {tamanho} palavras.")
+            pagina = paginas[i * PALAVRAS_POR_PAGINA:(i + 1) * PALAVRAS_POR_PAGINA]
+            if cpu.memoria_esparsa:
+                cpu.memoria.paginas[numero] = pagina
+            else:
+                inicio = numero << BITS_PAGINA
+                cpu.memoria[inicio:inicio + PALAVRAS_POR_PAGINA] = pagina
+        cpu.paginas_sujas.update(numeros)
+
+        cpu.regs[:] = regs
+        cpu.ultima_op_flags = (tipo_flags, a, b, resultado)
+        cpu.pc = pc
+        cpu.ir = ir
+        cpu.opcode = opcode
+        cpu.ra = ra
+        cpu.rb = rb
+        cpu.rc = rc
+        cpu.halted = bool(indicadores & _HALTED)
+        cpu.contador_instrucoes = contador
+        cpu.resultado_alu = resultado_alu if indicadores & _COM_RESULTADO_ALU else None
+        cpu.ultimo_write_reg = (reg_escrita, valor_escrita) if indicadores & _COM_ULTIMA_ESCRITA else None
+        return cpu
+
+    def __reduce__(self):
+        # pickle (ex.: multiprocessing) envia só o estado serializado e as opções do construtor
+        return _processador_de_bytes, (self.to_bytes(), self.nivel_trace, self.caminho_log, self.avanco_rapido, self.fusao)
 
     def ciclo_IF(self):
         """
@@ -42,14 +427,21 @@ class Processador:
         """
         if self.pc >= len(self.memoria) or self.pc < 0:  # Se o PC for inválido
             self.halted = True
-            print(f"Erro: PC inválido. PC = {self.pc}. Encerrando execução.")
+            if self.nivel_trace != TRACE_DESLIGADO:
+                print(f"Erro: PC inválido. PC = {self.pc}. Encerrando execução.")
             return
         
-        self.ir = self.memoria[self.pc]
+        self.decodificada = self.cache_instrucoes.get(self.pc)
+        if self.decodificada is None:
+            self.decodificada = Decodificador.decodificar(self.memoria[self.pc])
+            self.cache_instrucoes[self.pc] = self.decodificada
+
+        self.ir = self.decodificada.palavra
         
         # Se encontrar o HALT (32 bits 1)
-        if self.ir == 0xFFFFFFFF:  
-            print(f"Halt encontrado no PC = {self.pc}. Execução finalizada.")
+        if self.ir == HALT:  
+            if self.nivel_trace != TRACE_DESLIGADO:
+                print(f"Halt encontrado no PC = {self.pc}. Execução finalizada.")
             self.halted = True
         
         self.pc += 1  # Incrementa o PC após a busca da instrução
@@ -61,10 +453,11 @@ class Processador:
         if self.halted:
             return
         
-        self.opcode = UnidadeControle.extrair_opcode(self.ir)
-        self.ra = UnidadeControle.extrair_ra(self.ir)
-        self.rb = UnidadeControle.extrair_rb(self.ir)
-        self.rc = UnidadeControle.extrair_rc(self.ir)
+        decodificada = self.decodificada
+        self.opcode = decodificada.opcode
+        self.ra = decodificada.ra
+        self.rb = decodificada.rb
+        self.rc = decodificada.rc
     
     def ciclo_EX(self):
         """
@@ -73,53 +466,11 @@ class Processador:
         if self.halted:
             return
         
-        if self.opcode == UnidadeControle.OPCODES['ADD']:
-            self.resultado_alu = Instrucoes.add(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['SUB']:
-            self.resultado_alu = Instrucoes.sub(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['ZERO']:
-            self.resultado_alu = Instrucoes.zeros(self, self.rc)
-        elif self.opcode == UnidadeControle.OPCODES['XOR']:
-            self.resultado_alu = Instrucoes.xor(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['OR']:
-            self.resultado_alu = Instrucoes.or_(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['NOT']:
-            self.resultado_alu = Instrucoes.not_(self, self.ra)
-        elif self.opcode == UnidadeControle.OPCODES['AND']:
-            self.resultado_alu = Instrucoes.and_(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['ASL']:
-            self.resultado_alu = Instrucoes.asl(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['ASR']:
-            self.resultado_alu = Instrucoes.asr(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['LSL']:
-            self.resultado_alu = Instrucoes.lsl(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['LSR']:
-            self.resultado_alu = Instrucoes.lsr(self, self.ra, self.rb)
-        elif self.opcode == UnidadeControle.OPCODES['COPY']:
-            self.resultado_alu = Instrucoes.copy(self, self.ra)
-        elif self.opcode == UnidadeControle.OPCODES['LC_HI']:
-            const16 = UnidadeControle.extrair_const16(self.ir)
-            self.resultado_alu = Instrucoes.lc_hi(self, const16, self.rc)
-        elif self.opcode == UnidadeControle.OPCODES['LC_LO']:
-            const16 = UnidadeControle.extrair_const16(self.ir)
-            self.resultado_alu = Instrucoes.lc_lo(self, const16, self.rc)
-        elif self.opcode == UnidadeControle.OPCODES['LOAD']:
-            self.resultado_alu = Instrucoes.load(self, self.ra, self.rc)
-        elif self.opcode == UnidadeControle.OPCODES['STORE']:
-            Instrucoes.store(self, self.ra, self.rc)
-        
-        # Controle de Fluxo
-        elif self.opcode == UnidadeControle.OPCODES['J']:
-            endereco = UnidadeControle.extrair_endereco24(self.ir)
-            Instrucoes.jump(self, endereco)
-        elif self.opcode == UnidadeControle.OPCODES['JR']:
-            Instrucoes.jr(self, self.ra)
-        elif self.opcode == UnidadeControle.OPCODES['BEQ']:
-            # O offset de 8 bits está armazenado em self.rc (bits 0-7)
-            Instrucoes.beq(self, self.ra, self.rb, self.rc)
-        elif self.opcode == UnidadeControle.OPCODES['BNE']:
-            # O offset de 8 bits está armazenado em self.rc (bits 0-7)
-            Instrucoes.bne(self, self.ra, self.rb, self.rc)
+        # Despacho pela tabela do decodificador: custo constante para qualquer opcode
+        decodificada = self.decodificada
+        resultado = decodificada.handler(self)
+        if decodificada.escreve_rc:
+            self.resultado_alu = resultado
 
     def ciclo_WB(self):
         """
@@ -127,10 +478,11 @@ class Processador:
         """
         if self.halted:
             return
-        if hasattr(self, "resultado_alu"):
-            self.regs[self.rc] = self.resultado_alu
-            self.ultimo_write_reg = (self.rc, self.resultado_alu)
-            del self.resultado_alu
+        resultado = self.resultado_alu
+        if resultado is not None:
+            self.regs[self.rc] = resultado
+            self.ultimo_write_reg = (self.rc, resultado)
+            self.resultado_alu = None
 
 
     def executar_ciclo(self):
@@ -139,25 +491,121 @@ class Processador:
         """
         if self.halted:
             return
+
+        por_estagio = self.nivel_trace == TRACE_ESTAGIO
         
         self.ciclo_IF()
-        self.dump_estado("IF")
+        if por_estagio:
+            self.dump_estado("IF")
         
         # Verifica se o PC ultrapassou o tamanho da memória ou se houve Halt no fetch
         if self.halted or self.pc >= len(self.memoria) or self.pc < 0:
             self.halted = True
+            if self.nivel_trace == TRACE_INSTRUCAO:
+                self.dump_estado("INS")
             return
         
         self.ciclo_ID()
-        self.dump_estado("ID")
+        if por_estagio:
+            self.dump_estado("ID")
         self.ciclo_EX()
-        self.dump_estado("EX")
+        if por_estagio:
+            self.dump_estado("EX")
         self.ciclo_WB()
-        self.dump_estado("WB")
+        self.contador_instrucoes += 1
+        if por_estagio:
+            self.dump_estado("WB")
+        elif self.nivel_trace == TRACE_INSTRUCAO:
+            self.dump_estado("INS")
+
+    def run(self, max_steps=None):
+        """
+        Executa até o halt (ou até max_steps instruções) e devolve o número de instruções executadas.
+        Com o trace desligado usa um laço direto, sem estágios nem dump_estado.
+        """
+        if self.nivel_trace != TRACE_DESLIGADO:
+            inicio = self.contador_instrucoes
+            while not self.halted and (max_steps is None or self.contador_instrucoes - inicio < max_steps):
+                self.executar_ciclo()
+            return self.contador_instrucoes - inicio
+
+        if self.avanco_rapido:
+            return AvancoRapido.run(self, max_steps)
+        if self.fusao:
+            return Fusao.run(self, max_steps)
+
+        if self.halted:
+            return 0
+
+        cache = self.cache_instrucoes
+        memoria = self.memoria
+        regs = self.regs
+        tamanho = len(memoria)
+        limite = -1 if max_steps is None else max_steps
+        executadas = 0
+        decodificada = self.decodificada
 
+        try:
+            while executadas != limite:
+                pc = self.pc
+                if pc >= tamanho or pc < 0:
+                    self.halted = True
+                    break
 
+                decodificada = cache.get(pc)
+                if decodificada is None:
+                    decodificada = cache[pc] = Decodificador.decodificar(memoria[pc])
 
+                pc += 1
+                self.pc = pc
+                if decodificada.palavra == HALT or pc >= tamanho:
+                    self.halted = True
+                    break
 
+                resultado = decodificada.handler(self)
+                if decodificada.escreve_rc:
+                    regs[decodificada.rc] = resultado
+                executadas += 1
+        finally:
+            self.contador_instrucoes += executadas
+            if decodificada is not None:
+                self.decodificada = decodificada
+                self.ir = decodificada.palavra
+                self.opcode = decodificada.opcode
+                self.ra = decodificada.ra
+                self.rb = decodificada.rb
+                self.rc = decodificada.rc
+
+        return executadas
+
+    def instalar_observador(self, observador):
+        """
+        Instala um observador de execução. Enquanto houver observadores o processador passa a
+        ser um ProcessadorObservado; sem eles, executar_ciclo e run não têm custo extra.
+
+        O observador implementa antes(cpu, pc, decodificada) e depois(cpu, pc, decodificada),
+        chamados em torno de cada instrução executada. Um valor verdadeiro devolvido por
+        qualquer um deles interrompe o run() e fica em cpu.parada.
+        """
+        self.observadores.append(observador)
+        if type(self) is Processador:
+            self.__class__ = ProcessadorObservado
+
+    def remover_observador(self, observador):
+        """
+        Remove um observador; sem observadores volta ao laço de execução normal.
+        """
+        self.observadores.remove(observador)
+        if not self.observadores and type(self) is ProcessadorObservado:
+            self.__class__ = Processador
+
+    def fechar_log(self):
+        """
+        Fecha o arquivo de log, se tiver sido aberto
+        """
+        if self.log_arquivo is not None:
+            self.log_arquivo.close()
+            self.log_arquivo = None
 
     def dump_estado(self, ciclo_nome):
         linha1 = f"[{ciclo_nome}] PC={self.pc}  IR={self.ir:08X}  OP={self.opcode:02X}\n"
@@ -165,14 +613,14 @@ class Processador:
         linhas = [linha1]
 
              # Apenas quando houver escrita em registrador
-        if hasattr(self, "ultimo_write_reg"):
+        if self.ultimo_write_reg is not None:
             reg, val = self.ultimo_write_reg
             linhas.append(f"WRITE -> R{reg:02} = {val}\n")
-            del self.ultimo_write_reg
+            self.ultimo_write_reg = None
 
             # Flags só quando mudarem
-        flags = f"N={self.flag_neg} Z={self.flag_zero} C={self.flag_carry} O={self.flag_overflow}"
-        if getattr(self, "flags_anteriores", None) != flags:
+        flags = "N={} Z={} C={} O={}".format(*self.flags())
+        if self.flags_anteriores != flags:
             linhas.append(f"FLAGS -> {flags}\n")
             self.flags_anteriores = flags
 
@@ -181,7 +629,85 @@ class Processador:
             print(linha, end="")
 
          # ==== ESCREVE NO ARQUIVO ====
+        if self.log_arquivo is None:
+            self.log_arquivo = open(self.caminho_log, "w", encoding="utf-8")
+            self.log_arquivo.write("===== INÍCIO DA EXECUÇÃO =====\n\n")
         for linha in linhas:
             self.log_arquivo.write(linha)
 
         self.log_arquivo.flush()  # garante salvar imediatamente
+
+
+class ProcessadorObservado(Processador):
+    """
+    Processador com observadores instalados: notifica cada instrução executada.
+    Não deve ser instanciado diretamente (ver Processador.instalar_observador).
+    """
+    __slots__ = ()
+
+    def _instrucao_em(self, pc):
+        # Instrução que será executada em pc, ou None se o fetch vai encerrar a execução
+        tamanho = len(self.memoria)
+        if pc < 0 or pc + 1 >= tamanho:
+            return None
+        decodificada = self.cache_instrucoes.get(pc)
+        if decodificada is None:
+            decodificada = self.cache_instrucoes[pc] = Decodificador.decodificar(self.memoria[pc])
+        if decodificada.palavra == HALT:
+            return None
+        return decodificada
+
+    def _notificar(self, metodo, pc, decodificada):
+        for observador in self.observadores:
+            parada = getattr(observador, metodo)(self, pc, decodificada)
+            if parada:
+                self.parada = parada
+        return self.parada is not None
+
+    def executar_ciclo(self):
+        if self.halted:
+            return
+        pc = self.pc
+        decodificada = self._instrucao_em(pc)
+        if decodificada is not None and self._notificar("antes", pc, decodificada):
+            return
+        Processador.executar_ciclo(self)
+        if decodificada is not None:
+            self._notificar("depois", pc, decodificada)
+
+    def run(self, max_steps=None):
+        self.parada = None
+        inicio = self.contador_instrucoes
+        regs = self.regs
+        while not self.halted and self.parada is None:
+            if max_steps is not None and self.contador_instrucoes - inicio >= max_steps:
+                break
+            if self.nivel_trace != TRACE_DESLIGADO:
+                self.executar_ciclo()
+                continue
+
+            pc = self.pc
+            decodificada = self._instrucao_em(pc)
+            if decodificada is None:
+                # halt, PC inválido ou fim da memória: o laço normal trata
+                Processador.run(self, 1)
+                continue
+            if self._notificar("antes", pc, decodificada):
+                break
+
+            self.pc = pc + 1
+            self.decodificada = decodificada
+            self.ir = decodificada.palavra
+            resultado = decodificada.handler(self)
+            if decodificada.escreve_rc:
+                regs[decodificada.rc] = resultado
+            self.contador_instrucoes += 1
+            self._notificar("depois", pc, decodificada)
+
+        return self.contador_instrucoes - inicio
+
+
+def _processador_de_bytes(dados, nivel_trace, caminho_log, avanco_rapido, fusao):
+    return Processador.from_bytes(
+        dados, nivel_trace=nivel_trace, caminho_log=caminho_log, avanco_rapido=avanco_rapido, fusao=fusao
+    )
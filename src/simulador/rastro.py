@@ -0,0 +1,337 @@
+import argparse
+import lzma
+import struct
+import sys
+import zlib
+
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.instrucoes import Instrucoes
+from src.simulador.checkpoint import BITS_PAGINA
+from src.interpretador.desmontador import Desmontador
+
+# Cabeçalho: magic, versão, compressão, tamanho do registro, reservado
+MAGIC = b"URTR"
+VERSAO = 1
+CABECALHO = struct.Struct("<4sBBHI")
+
+# Registro (um por instrução executada):
+#   pc, ir, registrador escrito (SEM_REGISTRADOR se nenhum), flags, valor escrito no registrador,
+#   endereço escrito na memória (SEM_ENDERECO se nenhum), valor escrito na memória.
+# flags: bits 0-3 = N Z C O após a instrução, bits 4-7 = quais delas mudaram
+REGISTRO = struct.Struct("<IIBBIII")
+CAMPOS = ("pc", "ir", "registrador", "flags", "valor_registrador", "endereco", "valor_memoria")
+
+SEM_REGISTRADOR = 0xFF
+SEM_ENDERECO = 0xFFFFFFFF
+
+SEM_COMPRESSAO = 0
+ZLIB = 1
+LZMA = 2
+_COMPRESSOES = {None: SEM_COMPRESSAO, "zlib": ZLIB, "lzma": LZMA}
+
+OPCODE_STORE = UnidadeControle.OPCODES['STORE']
+OPCODE_JAL = UnidadeControle.OPCODES['JAL']
+
+# Tamanho do buffer antes de comprimir/gravar, e dos blocos lidos do arquivo
+TAMANHO_BUFFER = 1 << 20
+
+
+def _bits_flags(flags):
+    neg, zero, carry, overflow = flags
+    return (neg << 3) | (zero << 2) | (carry << 1) | overflow
+
+
+class GravadorRastro:
+    """
+    Observador que grava um registro binário de tamanho fixo por instrução executada, em um
+    fluxo com buffer e, opcionalmente, comprimido com zlib ou lzma.
+
+    Uso:
+        with GravadorRastro("execucao.rastro", compressao="zlib") as rastro:
+            cpu.instalar_observador(rastro)
+            cpu.run()
+    """
+
+    def __init__(self, caminho, compressao=None):
+        if compressao not in _COMPRESSOES:
+            raise ValueError(f"Compressão desconhecida: {compressao}")
+        self.caminho = caminho
+        self.arquivo = open(caminho, "wb")
+        self.arquivo.write(CABECALHO.pack(MAGIC, VERSAO, _COMPRESSOES[compressao], REGISTRO.size, 0))
+
+        if compressao == "zlib":
+            self._compressor = zlib.compressobj(6)
+        elif compressao == "lzma":
+            self._compressor = lzma.LZMACompressor()
+        else:
+            self._compressor = None
+
+        self._buffer = bytearray()
+        self._ultima_op = None
+        self._bits_flags = None  # flags do registro anterior; na primeira instrução, as do início da gravação
+        self.registros = 0
+
+    def antes(self, cpu, pc, decodificada):
+        if self._bits_flags is None:
+            self._ultima_op = cpu.ultima_op_flags
+            self._bits_flags = _bits_flags(cpu.flags())
+        return None
+
+    def depois(self, cpu, pc, decodificada):
+        registrador = SEM_REGISTRADOR
+        valor_registrador = 0
+        if decodificada.escreve_rc:
+            registrador = decodificada.rc
+            valor_registrador = cpu.regs[registrador]
+        elif decodificada.opcode == OPCODE_JAL:
+            registrador = 31
+            valor_registrador = cpu.regs[31]
+
+        endereco = SEM_ENDERECO
+        valor_memoria = 0
+        if decodificada.opcode == OPCODE_STORE:
+            endereco = cpu.regs[decodificada.rc] & cpu.mascara_endereco
+            valor_memoria = cpu.memoria[endereco]
+
+        # Flags só são recalculadas quando a última operação muda
+        mudadas = 0
+        if cpu.ultima_op_flags is not self._ultima_op:
+            self._ultima_op = cpu.ultima_op_flags
+            bits = _bits_flags(cpu.flags())
+            mudadas = bits ^ self._bits_flags
+            self._bits_flags = bits
+
+        self._buffer += REGISTRO.pack(
+            pc, decodificada.palavra, registrador, (mudadas << 4) | self._bits_flags,
+            valor_registrador, endereco, valor_memoria,
+        )
+        self.registros += 1
+        if len(self._buffer) >= TAMANHO_BUFFER:
+            self._descarregar()
+        return None
+
+    def _descarregar(self):
+        dados = bytes(self._buffer)
+        self._buffer.clear()
+        if self._compressor is not None:
+            dados = self._compressor.compress(dados)
+        self.arquivo.write(dados)
+
+    def fechar(self):
+        """
+        Grava o que restou no buffer e finaliza o fluxo comprimido.
+        """
+        if self.arquivo.closed:
+            return
+        self._descarregar()
+        if self._compressor is not None:
+            self.arquivo.write(self._compressor.flush())
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+
+def _descomprimir(f, compressao, descompressor):
+    """
+    Gera os dados descomprimidos do arquivo em pedaços de no máximo TAMANHO_BUFFER bytes: um bloco
+    lido muito comprimido não vira um único buffer enorme.
+    """
+    while True:
+        dados = f.read(TAMANHO_BUFFER)
+        if not dados:
+            break
+        if compressao == ZLIB:
+            # A entrada que não coube no limite de saída fica em unconsumed_tail
+            yield descompressor.decompress(dados, TAMANHO_BUFFER)
+            while descompressor.unconsumed_tail:
+                yield descompressor.decompress(descompressor.unconsumed_tail, TAMANHO_BUFFER)
+        elif compressao == LZMA:
+            # O LZMADecompressor guarda a entrada pendente e avisa por needs_input
+            yield descompressor.decompress(dados, TAMANHO_BUFFER)
+            while not descompressor.needs_input and not descompressor.eof:
+                yield descompressor.decompress(b"", TAMANHO_BUFFER)
+        else:
+            yield dados
+    if compressao == ZLIB:
+        yield descompressor.flush()
+
+
+def _blocos(caminho):
+    """
+    Gera blocos de bytes descomprimidos, cada um com um número inteiro de registros.
+    """
+    with open(caminho, "rb") as f:
+        cabecalho = f.read(CABECALHO.size)
+        if len(cabecalho) != CABECALHO.size:
+            raise ValueError(f"'{caminho}' não é um rastro UFLA-RISC (arquivo curto demais).")
+        magic, versao, compressao, tamanho_registro, _ = CABECALHO.unpack(cabecalho)
+        if magic != MAGIC:
+            raise ValueError(f"'{caminho}' não é um rastro UFLA-RISC.")
+        if versao != VERSAO or tamanho_registro != REGISTRO.size:
+            raise ValueError(f"Versão de rastro não suportada em '{caminho}': {versao}")
+
+        if compressao == ZLIB:
+            descompressor = zlib.decompressobj()
+        elif compressao == LZMA:
+            descompressor = lzma.LZMADecompressor()
+        elif compressao == SEM_COMPRESSAO:
+            descompressor = None
+        else:
+            raise ValueError(f"Compressão desconhecida no rastro '{caminho}': {compressao}")
+
+        resto = b""
+        for dados in _descomprimir(f, compressao, descompressor):
+            if resto:
+                dados = resto + dados
+            alinhado = len(dados) - len(dados) % REGISTRO.size
+            resto = dados[alinhado:]
+            if alinhado:
+                yield dados[:alinhado]
+
+        if resto:
+            raise ValueError(f"Rastro '{caminho}' truncado: {len(resto)} bytes após o último registro.")
+
+
+def ler_rastro(caminho):
+    """
+    Gera os registros do rastro como tuplas na ordem de CAMPOS, sem carregar o arquivo inteiro.
+    """
+    for bloco in _blocos(caminho):
+        yield from REGISTRO.iter_unpack(bloco)
+
+
+def contar_registros(caminho):
+    return sum(len(bloco) for bloco in _blocos(caminho)) // REGISTRO.size
+
+
+def primeira_divergencia(caminho_a, caminho_b):
+    """
+    Compara dois rastros em fluxo e devolve (índice, registro_a, registro_b) da primeira
+    diferença, ou None se forem iguais. Quando um rastro termina antes, o registro que falta é None.
+    Os blocos são comparados como bytes; só o bloco divergente é examinado registro a registro.
+    """
+    blocos_a = _blocos(caminho_a)
+    blocos_b = _blocos(caminho_b)
+    buffer_a = buffer_b = b""
+    indice = 0
+    fim_a = fim_b = False
+
+    while True:
+        if not buffer_a and not fim_a:
+            buffer_a = next(blocos_a, None)
+            if buffer_a is None:
+                buffer_a, fim_a = b"", True
+        if not buffer_b and not fim_b:
+            buffer_b = next(blocos_b, None)
+            if buffer_b is None:
+                buffer_b, fim_b = b"", True
+
+        if not buffer_a or not buffer_b:
+            if not buffer_a and not buffer_b:
+                return None
+            if buffer_a:
+                return (indice, REGISTRO.unpack_from(buffer_a), None)
+            return (indice, None, REGISTRO.unpack_from(buffer_b))
+
+        comum = min(len(buffer_a), len(buffer_b))
+        if buffer_a[:comum] != buffer_b[:comum]:
+            for deslocamento in range(0, comum, REGISTRO.size):
+                registro_a = REGISTRO.unpack_from(buffer_a, deslocamento)
+                registro_b = REGISTRO.unpack_from(buffer_b, deslocamento)
+                if registro_a != registro_b:
+                    return (indice + deslocamento // REGISTRO.size, registro_a, registro_b)
+
+        indice += comum // REGISTRO.size
+        buffer_a = buffer_a[comum:]
+        buffer_b = buffer_b[comum:]
+
+
+def reproduzir(caminho, cpu):
+    """
+    Reaplica o rastro em um Processador com o mesmo estado inicial da execução gravada
+    (normalmente, apenas o programa carregado): para cada registro escreve o registrador, a memória e
+    as flags gravadas, e põe em cpu.pc/cpu.ir a instrução executada. Gera o índice de cada registro
+    já aplicado, permitindo inspecionar o estado em qualquer ponto da execução.
+    """
+    regs = cpu.regs
+    memoria = cpu.memoria
+    cache = cpu.cache_instrucoes
+    for indice, (pc, ir, registrador, flags, valor_registrador, endereco, valor_memoria) in enumerate(ler_rastro(caminho)):
+        cpu.pc = pc
+        cpu.ir = ir
+        if registrador != SEM_REGISTRADOR:
+            regs[registrador] = valor_registrador
+        if endereco != SEM_ENDERECO:
+            memoria[endereco] = valor_memoria
+            cpu.paginas_sujas.add(endereco >> BITS_PAGINA)
+            # Como em Instrucoes.store: código já decodificado no endereço deixa de valer
+            if endereco in cache:
+                cpu.invalidar_codigo(endereco)
+        if flags >> 4:
+            cpu.ultima_op_flags = Instrucoes.fixar_flags((flags >> 3) & 1, (flags >> 2) & 1, (flags >> 1) & 1, flags & 1)
+        cpu.contador_instrucoes += 1
+        yield indice
+
+
+def formatar_registro(registro):
+    """
+    Linha legível de um registro (com a instrução desmontada).
+    """
+    pc, ir, registrador, flags, valor_registrador, endereco, valor_memoria = registro
+    texto = f"PC={pc:<6} IR={ir:08X} {Desmontador.desmontar(ir):<22}"
+    if registrador != SEM_REGISTRADOR:
+        texto += f" R{registrador:02}={valor_registrador}"
+    if endereco != SEM_ENDERECO:
+        texto += f" M[{endereco}]={valor_memoria}"
+    if flags >> 4:
+        texto += " N={} Z={} C={} O={}".format((flags >> 3) & 1, (flags >> 2) & 1, (flags >> 1) & 1, flags & 1)
+    return texto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ferramentas para rastros binários do simulador UFLA-RISC.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    diff = comandos.add_parser("diff", help="Primeira divergência entre dois rastros")
+    diff.add_argument("rastro_a")
+    diff.add_argument("rastro_b")
+
+    mostrar = comandos.add_parser("mostrar", help="Lista os registros de um rastro")
+    mostrar.add_argument("rastro")
+    mostrar.add_argument("--inicio", type=int, default=0)
+    mostrar.add_argument("--quantidade", type=int, default=50)
+
+    info = comandos.add_parser("info", help="Número de registros de um rastro")
+    info.add_argument("rastro")
+
+    args = parser.parse_args()
+
+    if args.comando == "diff":
+        divergencia = primeira_divergencia(args.rastro_a, args.rastro_b)
+        if divergencia is None:
+            print("Rastros idênticos.")
+            return 0
+        indice, registro_a, registro_b = divergencia
+        print(f"Primeira divergência na instrução {indice}:")
+        print(f"  A: {formatar_registro(registro_a) if registro_a else '(fim do rastro)'}")
+        print(f"  B: {formatar_registro(registro_b) if registro_b else '(fim do rastro)'}")
+        return 1
+
+    if args.comando == "mostrar":
+        for indice, registro in enumerate(ler_rastro(args.rastro)):
+            if indice >= args.inicio + args.quantidade:
+                break
+            if indice >= args.inicio:
+                print(f"{indice:>10}: {formatar_registro(registro)}")
+        return 0
+
+    print(f"{contar_registros(args.rastro)} registros de {REGISTRO.size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.interpretador.assembler import Assembler
+from src.interpretador.interpretador import Interpretador
+from src.simulador.processador import Processador, TRACE_DESLIGADO
+from src.simulador.tradutor import TradutorBlocos
+
+MOTORES = ("interpretador", "fusao", "blocos")
+
+# Instruções executadas por vez antes de devolver o controle ao laço de eventos
+FATIA = 20_000
+
+# Execuções com orçamento a partir deste valor (ou sem orçamento) vão para o pool de processos
+LIMIAR_POOL = 1_000_000
+
+# Instruções por tarefa enviada ao pool: entre duas tarefas o servidor atende um interromper
+FATIA_POOL = 5_000_000
+
+# Tempo máximo (s) de uma execução no pool: um laço infinito não prende o processo para sempre
+TEMPO_LIMITE_POOL = 60.0
+
+# Maior intervalo de memória devolvido por uma leitura
+MAXIMO_LEITURA = 65536
+
+
+class ErroComando(Exception):
+    """
+    Erro de uso de um comando (sessão inexistente, parâmetro inválido...), devolvido ao cliente.
+    """
+
+
+def _criar_processador(motor, avanco_rapido):
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO, avanco_rapido=avanco_rapido, fusao=motor == "fusao")
+    executar = TradutorBlocos(cpu).run if motor == "blocos" else cpu.run
+    return cpu, executar
+
+
+def _executar_no_pool(checkpoint, motor, avanco_rapido, orcamento, tempo_limite):
+    """
+    Roda em um processo do pool: restaura o checkpoint, executa e devolve o novo checkpoint.
+    """
+    cpu, executar = _criar_processador(motor, avanco_rapido)
+    cpu.restore(checkpoint)
+    inicio = time.perf_counter()
+    executadas = 0
+    while not cpu.halted and cpu.parada is None:
+        fatia = FATIA * 50
+        if orcamento is not None:
+            fatia = min(fatia, orcamento - executadas)
+            if fatia <= 0:
+                break
+        feitas = executar(fatia)
+        executadas += feitas
+        if feitas == 0 or time.perf_counter() - inicio > tempo_limite:
+            break
+    return cpu.checkpoint(), cpu.parada
+
+
+class Sessao:
+    """
+    Um processador hospedado no servidor, com o programa carregado e os checkpoints tirados.
+    """
+
+    def __init__(self, identificador, motor="interpretador", avanco_rapido=False):
+        if motor not in MOTORES:
+            raise ErroComando(f"Motor desconhecido: {motor}")
+        self.identificador = identificador
+        self.motor = motor
+        self.avanco_rapido = avanco_rapido
+        self.segmentos = None
+        self.checkpoints = {}
+        self.proximo_checkpoint = 1
+        self.trava = asyncio.Lock()
+        self.interromper = False
+        self.cpu, self.executar = _criar_processador(motor, avanco_rapido)
+
+    def carregar(self, segmentos):
+        self.segmentos = segmentos
+        self.checkpoints.clear()
+        self.cpu, self.executar = _criar_processador(self.motor, self.avanco_rapido)
+        self.cpu.carregar_programa(segmentos)
+
+    def estado(self):
+        cpu = self.cpu
+        return {
+            "pc": cpu.pc,
+            "halted": cpu.halted,
+            "instrucoes": cpu.contador_instrucoes,
+            "flags": dict(zip("NZCO", cpu.flags())),
+            "parada": cpu.parada,
+        }
+
+
+class ServidorSimulacao:
+    """
+    Servidor asyncio que hospeda várias sessões de simulação. O protocolo é uma linha JSON por
+    requisição e por resposta:
+
+        {"id": 1, "comando": "criar_sessao", "motor": "fusao"}
+        {"id": 1, "ok": true, "sessao": "s1"}
+
+    Comandos: criar_sessao, fechar_sessao, sessoes, carregar (caminho .asm/.bin ou fonte),
+    reiniciar, passo (n), executar (orcamento, pool), interromper, registradores,
+    memoria (inicio, quantidade), checkpoint, restaurar (checkpoint).
+
+    Execuções longas avançam em fatias de FATIA instruções, devolvendo o controle ao laço de
+    eventos entre elas; com processos > 0, execuções grandes vão para um ProcessPoolExecutor em
+    tarefas de até FATIA_POOL instruções (o estado viaja como Checkpoint). O interromper vale para
+    os dois caminhos: é atendido na próxima fatia ou ao fim da tarefa em andamento no pool.
+    Programas montados ficam em cache, então recarregar o mesmo programa em outra sessão não paga
+    a montagem de novo.
+    """
+
+    def __init__(self, processos=0, fatia=FATIA, limiar_pool=LIMIAR_POOL, tempo_limite_pool=TEMPO_LIMITE_POOL,
+                 fatia_pool=FATIA_POOL):
+        self.sessoes = {}
+        self.proxima_sessao = 1
+        self.fatia = fatia
+        self.fatia_pool = fatia_pool
+        self.limiar_pool = limiar_pool
+        self.tempo_limite_pool = tempo_limite_pool
+        self.pool = ProcessPoolExecutor(max_workers=processos) if processos > 0 else None
+        self._programas = {}  # (caminho, mtime, tamanho) ou fonte -> segmentos
+        self._servidor = None
+
+    # ===== Transporte =====
+
+    async def iniciar_tcp(self, host="127.0.0.1", porta=7070):
+        self._servidor = await asyncio.start_server(self._atender, host, porta)
+        return self._servidor
+
+    async def iniciar_unix(self, caminho):
+        self._servidor = await asyncio.start_unix_server(self._atender, caminho)
+        return self._servidor
+
+    async def fechar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _atender(self, leitor, escritor):
+        # Cada requisição vira uma tarefa: um run longo não bloqueia os outros comandos da conexão
+        trava_escrita = asyncio.Lock()
+        tarefas = set()
+
+        async def responder(linha):
+            resposta = await self.processar_linha(linha)
+            async with trava_escrita:
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await escritor.drain()
+
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                if not linha.strip():
+                    continue
+                tarefa = asyncio.create_task(responder(linha))
+                tarefas.add(tarefa)
+                tarefa.add_done_callback(tarefas.discard)
+            if tarefas:
+                await asyncio.gather(*tarefas, return_exceptions=True)
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            escritor.close()
+
+    async def processar_linha(self, linha):
+        try:
+            requisicao = json.loads(linha)
+        except ValueError as e:
+            return {"ok": False, "erro": f"JSON inválido: {e}"}
+        if not isinstance(requisicao, dict):
+            return {"ok": False, "erro": "A requisição deve ser um objeto JSON"}
+        resposta = await self.processar(requisicao)
+        if "id" in requisicao:
+            resposta["id"] = requisicao["id"]
+        return resposta
+
+    async def processar(self, requisicao):
+        """
+        Executa um comando (dicionário já decodificado) e devolve a resposta.
+        """
+        comando = requisicao.get("comando")
+        metodo = getattr(self, f"_cmd_{comando}", None) if isinstance(comando, str) else None
+        if metodo is None:
+            return {"ok": False, "erro": f"Comando desconhecido: {comando}"}
+        try:
+            resposta = await metodo(requisicao)
+        except (ErroComando, ValueError, IndexError, FileNotFoundError) as e:
+            return {"ok": False, "erro": str(e)}
+        except Exception as e:
+            return {"ok": False, "erro": f"{type(e).__name__}: {e}"}
+        resposta["ok"] = True
+        return resposta
+
+    # ===== Auxiliares =====
+
+    def _sessao(self, requisicao):
+        sessao = self.sessoes.get(requisicao.get("sessao"))
+        if sessao is None:
+            raise ErroComando(f"Sessão inexistente: {requisicao.get('sessao')}")
+        return sessao
+
+    def _programa(self, requisicao):
+        fonte = requisicao.get("fonte")
+        if fonte is not None:
+            chave = ("fonte", fonte)
+            segmentos = self._programas.get(chave)
+            if segmentos is None:
+                segmentos = self._programas[chave] = Assembler.montar_fonte(fonte)
+            return segmentos
+
+        caminho = requisicao.get("caminho")
+        if not caminho:
+            raise ErroComando("Informe 'caminho' ou 'fonte'")
+        info = os.stat(caminho)
+        chave = (os.path.abspath(caminho), info.st_mtime_ns, info.st_size)
+        segmentos = self._programas.get(chave)
+        if segmentos is None:
+            if caminho.endswith(".asm"):
+                with open(caminho, "r") as f:
+                    segmentos = Assembler.montar_fonte(f.read())
+            else:
+                segmentos = Interpretador.carregar_arquivo(caminho)
+            self._programas[chave] = segmentos
+        return segmentos
+
+    @staticmethod
+    def _inteiro(requisicao, nome, padrao=None, minimo=0):
+        valor = requisicao.get(nome, padrao)
+        if valor is None:
+            return None
+        if not isinstance(valor, int) or isinstance(valor, bool) or valor < minimo:
+            raise ErroComando(f"'{nome}' deve ser um inteiro >= {minimo}")
+        return valor
+
+    async def _executar_em_fatias(self, sessao, orcamento):
+        cpu = sessao.cpu
+        sessao.interromper = False
+        inicio = cpu.contador_instrucoes
+        while not cpu.halted and not sessao.interromper:
+            fatia = self.fatia
+            if orcamento is not None:
+                fatia = min(fatia, orcamento - (cpu.contador_instrucoes - inicio))
+                if fatia <= 0:
+                    break
+            if sessao.executar(fatia) == 0 or cpu.parada is not None:
+                break
+            await asyncio.sleep(0)
+        return cpu.contador_instrucoes - inicio
+
+    async def _executar_no_pool(self, sessao, orcamento):
+        # Uma tarefa por fatia_pool instruções: o interromper é visto entre duas tarefas, e o
+        # tempo_limite_pool vale para a execução inteira
+        cpu = sessao.cpu
+        sessao.interromper = False
+        inicio = cpu.contador_instrucoes
+        comeco = time.perf_counter()
+        laco = asyncio.get_running_loop()
+        while not cpu.halted and not sessao.interromper:
+            fatia = self.fatia_pool
+            if orcamento is not None:
+                fatia = min(fatia, orcamento - (cpu.contador_instrucoes - inicio))
+                if fatia <= 0:
+                    break
+            tempo_restante = self.tempo_limite_pool - (time.perf_counter() - comeco)
+            if tempo_restante <= 0:
+                break
+            antes = cpu.contador_instrucoes
+            checkpoint, parada = await laco.run_in_executor(
+                self.pool, _executar_no_pool, cpu.checkpoint(), sessao.motor, sessao.avanco_rapido,
+                fatia, tempo_restante,
+            )
+            cpu.restore(checkpoint)
+            cpu.parada = parada
+            if parada is not None or cpu.contador_instrucoes == antes:
+                break
+        return cpu.contador_instrucoes - inicio
+
+    # ===== Comandos =====
+
+    async def _cmd_criar_sessao(self, requisicao):
+        identificador = f"s{self.proxima_sessao}"
+        self.proxima_sessao += 1
+        sessao = Sessao(identificador, requisicao.get("motor", "interpretador"), bool(requisicao.get("avanco_rapido", False)))
+        self.sessoes[identificador] = sessao
+        if "caminho" in requisicao or "fonte" in requisicao:
+            sessao.carregar(self._programa(requisicao))
+        return {"sessao": identificador}
+
+    async def _cmd_fechar_sessao(self, requisicao):
+        sessao = self._sessao(requisicao)
+        sessao.interromper = True
+        del self.sessoes[sessao.identificador]
+        return {}
+
+    async def _cmd_sessoes(self, requisicao):
+        return {"sessoes": {identificador: sessao.estado() for identificador, sessao in self.sessoes.items()}}
+
+    async def _cmd_carregar(self, requisicao):
+        sessao = self._sessao(requisicao)
+        segmentos = self._programa(requisicao)
+        async with sessao.trava:
+            sessao.carregar(segmentos)
+            return sessao.estado()
+
+    async def _cmd_reiniciar(self, requisicao):
+        sessao = self._sessao(requisicao)
+        if sessao.segmentos is None:
+            raise ErroComando("Nenhum programa carregado nesta sessão")
+        async with sessao.trava:
+            sessao.carregar(sessao.segmentos)
+            return sessao.estado()
+
+    async def _cmd_passo(self, requisicao):
+        sessao = self._sessao(requisicao)
+        n = self._inteiro(requisicao, "n", 1)
+        async with sessao.trava:
+            executadas = await self._executar_em_fatias(sessao, n)
+            return dict(sessao.estado(), executadas=executadas)
+
+    async def _cmd_executar(self, requisicao):
+        sessao = self._sessao(requisicao)
+        orcamento = self._inteiro(requisicao, "orcamento")
+        usar_pool = requisicao.get("pool")
+        if usar_pool is None:
+            usar_pool = self.pool is not None and (orcamento is None or orcamento >= self.limiar_pool)
+        elif usar_pool and self.pool is None:
+            raise ErroComando("O servidor foi iniciado sem pool de processos")
+
+        async with sessao.trava:
+            if usar_pool:
+                executadas = await self._executar_no_pool(sessao, orcamento)
+            else:
+                executadas = await self._executar_em_fatias(sessao, orcamento)
+            return dict(sessao.estado(), executadas=executadas)
+
+    async def _cmd_interromper(self, requisicao):
+        # Não usa a trava: precisa agir enquanto um executar está em andamento (em fatias ou no pool)
+        self._sessao(requisicao).interromper = True
+        return {}
+
+    async def _cmd_registradores(self, requisicao):
+        sessao = self._sessao(requisicao)
+        return dict(sessao.estado(), registradores=list(sessao.cpu.regs))
+
+    async def _cmd_memoria(self, requisicao):
+        sessao = self._sessao(requisicao)
+        inicio = self._inteiro(requisicao, "inicio", 0)
+        quantidade = self._inteiro(requisicao, "quantidade", 1)
+        if quantidade > MAXIMO_LEITURA:
+            raise ErroComando(f"No máximo {MAXIMO_LEITURA} palavras por leitura")
+        memoria = sessao.cpu.memoria
+        if inicio + quantidade > len(memoria):
+            raise ErroComando(f"Intervalo [{inicio}, {inicio + quantidade}) fora da memória de {len(memoria)} palavras")
+        return {"inicio": inicio, "palavras": memoria[inicio:inicio + quantidade].tolist()}
+
+    async def _cmd_checkpoint(self, requisicao):
+        sessao = self._sessao(requisicao)
+        async with sessao.trava:
+            identificador = sessao.proximo_checkpoint
+            sessao.proximo_checkpoint += 1
+            sessao.checkpoints[identificador] = sessao.cpu.checkpoint()
+            return {"checkpoint": identificador}
+
+    async def _cmd_restaurar(self, requisicao):
+        sessao = self._sessao(requisicao)
+        checkpoint = sessao.checkpoints.get(requisicao.get("checkpoint"))
+        if checkpoint is None:
+            raise ErroComando(f"Checkpoint inexistente: {requisicao.get('checkpoint')}")
+        async with sessao.trava:
+            sessao.cpu.restore(checkpoint)
+            sessao.cpu.parada = None
+            return sessao.estado()
+
+
+async def _servir(args):
+    servidor = ServidorSimulacao(processos=args.processos, fatia=args.fatia)
+    if args.unix:
+        await servidor.iniciar_unix(args.unix)
+        print(f"Servidor UFLA-RISC em {args.unix}")
+    else:
+        await servidor.iniciar_tcp(args.host, args.porta)
+        print(f"Servidor UFLA-RISC em {args.host}:{args.porta}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de simulação UFLA-RISC (JSON por linha).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=7070)
+    parser.add_argument("--unix", default=None, help="Caminho de um socket Unix (no lugar de TCP)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="Processos do pool (0 desliga)")
+    parser.add_argument("--fatia", type=int, default=FATIA, help="Instruções por fatia de execução")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
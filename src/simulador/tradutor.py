@@ -0,0 +1,294 @@
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.instrucoes import Instrucoes, FLAGS_ADD, FLAGS_SUB, FLAGS_RESULTADO, FLAGS_ZEROS
+from src.simulador.decodificador import Decodificador
+from src.simulador.processador import HALT
+
+OP = UnidadeControle.OPCODES
+
+# Instruções que encerram um bloco básico
+TERMINADORES = {OP['J'], OP['JAL'], OP['JR'], OP['BEQ'], OP['BNE']}
+
+# Operações de dois registradores: expressão do resultado em função de a e b
+_EXPRESSOES_AB = {
+    OP['ADD']: "({a} + {b}) & 0xFFFFFFFF",
+    OP['SUB']: "({a} - {b}) & 0xFFFFFFFF",
+    OP['XOR']: "{a} ^ {b}",
+    OP['OR']: "{a} | {b}",
+    OP['AND']: "{a} & {b}",
+    OP['ASL']: "({a} << ({b} & 0x1F)) & 0xFFFFFFFF",
+    OP['LSL']: "({a} << ({b} & 0x1F)) & 0xFFFFFFFF",
+    OP['LSR']: "{a} >> ({b} & 0x1F)",
+    OP['ASR']: "((({a} >> {s}) | (0xFFFFFFFF << (32 - {s}))) & 0xFFFFFFFF if {a} >> 31 else {a} >> {s}) if {s} else {a}",
+}
+
+# Campos de cada opcode que indexam registradores
+_CAMPOS_REGISTRADOR = {opcode: ("ra", "rb", "rc") for opcode in _EXPRESSOES_AB}
+_CAMPOS_REGISTRADOR.update({
+    0x00: (),
+    OP['ZERO']: ("rc",),
+    OP['NOT']: ("ra", "rc"),
+    OP['COPY']: ("ra", "rc"),
+    OP['LC_HI']: ("rc",),
+    OP['LC_LO']: ("rc",),
+    OP['LOAD']: ("ra", "rc"),
+    OP['STORE']: ("ra", "rc"),
+    OP['J']: (),
+    OP['JAL']: (),
+    OP['JR']: ("ra",),
+    OP['BEQ']: ("ra", "rb"),
+    OP['BNE']: ("ra", "rb"),
+})
+
+TAMANHO_MAXIMO_BLOCO = 256
+
+
+class Bloco:
+    """
+    Bloco básico traduzido: sequência linear de instruções compilada em uma única função Python.
+    """
+    __slots__ = ("inicio", "fim", "tamanho", "funcao", "valido", "sucessores", "fonte")
+
+    def __init__(self, inicio, fim):
+        self.inicio = inicio
+        self.fim = fim  # último endereço coberto (inclusive)
+        self.tamanho = fim - inicio + 1
+        self.funcao = None
+        self.valido = True
+        # Encadeamento direto: pc de destino -> Bloco
+        self.sucessores = {}
+        self.fonte = ""
+
+
+class TradutorBlocos:
+    """
+    Motor de execução alternativo: descobre blocos básicos a partir do PC, traduz cada bloco
+    para uma função Python e os executa encadeados. O estado final (registradores, memória,
+    PC, flags e contador de instruções) é idêntico ao do Processador.
+    """
+
+    def __init__(self, cpu):
+        self.cpu = cpu
+        self.blocos = {}            # pc de entrada -> Bloco
+        self.blocos_por_endereco = {}  # endereço coberto -> lista de Blocos
+        cpu.ouvintes_codigo.append(self.invalidar)
+
+    def invalidar(self, endereco):
+        """
+        Invalida os blocos que cobrem o endereço (ou todos, se endereco for None).
+        """
+        if endereco is None:
+            for bloco in self.blocos.values():
+                bloco.valido = False
+            self.blocos.clear()
+            self.blocos_por_endereco.clear()
+            return
+
+        for bloco in self.blocos_por_endereco.pop(endereco, ()):
+            if not bloco.valido:
+                continue
+            bloco.valido = False
+            if self.blocos.get(bloco.inicio) is bloco:
+                del self.blocos[bloco.inicio]
+
+    def _decodificar(self, endereco):
+        cache = self.cpu.cache_instrucoes
+        decodificada = cache.get(endereco)
+        if decodificada is None:
+            decodificada = cache[endereco] = Decodificador.decodificar(self.cpu.memoria[endereco])
+        return decodificada
+
+    @staticmethod
+    def _traduzivel(decodificada):
+        # Halt, opcodes ilegais e registradores fora de r0..r31 ficam com o interpretador,
+        # que é quem sinaliza o fim da execução ou o erro.
+        if decodificada.palavra == HALT:
+            return False
+        campos = _CAMPOS_REGISTRADOR.get(decodificada.opcode)
+        if campos is None:
+            return False
+        return all(getattr(decodificada, campo) < 32 for campo in campos)
+
+    def traduzir(self, inicio):
+        """
+        Traduz o bloco básico que começa em inicio. Devolve None se a primeira instrução
+        precisar ser interpretada (halt, instrução ilegal, fim da memória).
+        """
+        # A última posição da memória nunca é executada pelo Processador (o PC sairia da memória)
+        tamanho_memoria = len(self.cpu.memoria)
+        instrucoes = []
+        endereco = inicio
+        while 0 <= endereco < tamanho_memoria - 1 and len(instrucoes) < TAMANHO_MAXIMO_BLOCO:
+            decodificada = self._decodificar(endereco)
+            if not self._traduzivel(decodificada):
+                break
+            instrucoes.append(decodificada)
+            endereco += 1
+            if decodificada.opcode in TERMINADORES:
+                break
+
+        if not instrucoes:
+            return None
+
+        bloco = Bloco(inicio, inicio + len(instrucoes) - 1)
+        bloco.fonte = self._gerar_fonte(inicio, instrucoes)
+        namespace = {
+            "Instrucoes": Instrucoes,
+            "bloco": bloco,
+        }
+        exec(compile(bloco.fonte, f"<bloco {inicio}>", "exec"), namespace)
+        bloco.funcao = namespace["executar_bloco"]
+
+        self.blocos[inicio] = bloco
+        for endereco in range(bloco.inicio, bloco.fim + 1):
+            self.blocos_por_endereco.setdefault(endereco, []).append(bloco)
+        return bloco
+
+    def _gerar_fonte(self, inicio, instrucoes):
+        """
+        Gera o código de uma função executar_bloco(cpu, regs, mem) que devolve o próximo PC.
+        As flags só são registradas na saída do bloco, para a última operação que as altera.
+        """
+        linhas = ["def executar_bloco(cpu, regs, mem):"]
+        flags = None  # expressão de cpu.ultima_op_flags da última operação até aqui
+
+        def saida(executadas, proximo_pc, indentacao="    "):
+            codigo = []
+            if flags is not None:
+                codigo.append(f"{indentacao}cpu.ultima_op_flags = {flags}")
+            codigo.append(f"{indentacao}cpu.contador_instrucoes += {executadas}")
+            codigo.append(f"{indentacao}return {proximo_pc}")
+            return codigo
+
+        for i, d in enumerate(instrucoes):
+            endereco = inicio + i
+            executadas = i + 1
+            opcode = d.opcode
+            ra, rb, rc = d.ra, d.rb, d.rc
+            linhas.append(f"    # {endereco}: {d.palavra:08X}")
+
+            if opcode in _EXPRESSOES_AB:
+                linhas.append(f"    a{i} = regs[{ra}]")
+                linhas.append(f"    b{i} = regs[{rb}]")
+                if opcode == OP['ASR']:
+                    linhas.append(f"    s{i} = b{i} & 0x1F")
+                expressao = _EXPRESSOES_AB[opcode].format(a=f"a{i}", b=f"b{i}", s=f"s{i}")
+                linhas.append(f"    r{i} = {expressao}")
+                linhas.append(f"    regs[{rc}] = r{i}")
+                if opcode == OP['ADD']:
+                    flags = f"({FLAGS_ADD}, a{i}, b{i}, r{i})"
+                elif opcode == OP['SUB']:
+                    flags = f"({FLAGS_SUB}, a{i}, b{i}, r{i})"
+                else:
+                    flags = f"({FLAGS_RESULTADO}, 0, 0, r{i})"
+
+            elif opcode == OP['ZERO']:
+                linhas.append(f"    regs[{rc}] = 0")
+                flags = repr(FLAGS_ZEROS)
+
+            elif opcode in (OP['NOT'], OP['COPY']):
+                if opcode == OP['NOT']:
+                    linhas.append(f"    r{i} = (~regs[{ra}]) & 0xFFFFFFFF")
+                else:
+                    linhas.append(f"    r{i} = regs[{ra}]")
+                linhas.append(f"    regs[{rc}] = r{i}")
+                flags = f"({FLAGS_RESULTADO}, 0, 0, r{i})"
+
+            elif opcode == OP['LC_HI']:
+                alto = (d.const16 << 16) & 0xFFFF0000
+                linhas.append(f"    r{i} = {alto} | (regs[{rc}] & 0xFFFF)")
+                linhas.append(f"    regs[{rc}] = r{i}")
+                flags = f"({FLAGS_RESULTADO}, 0, 0, r{i})"
+
+            elif opcode == OP['LC_LO']:
+                linhas.append(f"    r{i} = {d.const16 & 0xFFFF} | (regs[{rc}] & 0xFFFF0000)")
+                linhas.append(f"    regs[{rc}] = r{i}")
+                flags = f"({FLAGS_RESULTADO}, 0, 0, r{i})"
+
+            elif opcode == OP['LOAD']:
+                linhas.append(f"    r{i} = mem[regs[{ra}] & 0x{self.cpu.mascara_endereco:X}]")
+                linhas.append(f"    regs[{rc}] = r{i}")
+                flags = f"({FLAGS_RESULTADO}, 0, 0, r{i})"
+
+            elif opcode == OP['STORE']:
+                # Passa pelo Instrucoes.store para manter a invalidação de código; se o store
+                # atingiu este próprio bloco, sai logo após ele.
+                linhas.append(f"    Instrucoes.store(cpu, {ra}, {rc})")
+                if i < len(instrucoes) - 1:
+                    linhas.append("    if not bloco.valido:")
+                    linhas.extend(saida(executadas, endereco + 1, "        "))
+
+            elif opcode == OP['J']:
+                linhas.extend(saida(executadas, d.endereco24 & 0xFFFFFF))
+                break
+
+            elif opcode == OP['JAL']:
+                linhas.append(f"    regs[31] = {endereco + 1}")
+                linhas.extend(saida(executadas, d.endereco24 & 0xFFFFFF))
+                break
+
+            elif opcode == OP['JR']:
+                linhas.append(f"    destino = regs[{ra}] & 0xFFFFFFFF")
+                linhas.extend(saida(executadas, "destino"))
+                break
+
+            elif opcode in (OP['BEQ'], OP['BNE']):
+                offset = (rc - 256) if rc > 127 else rc
+                comparacao = "==" if opcode == OP['BEQ'] else "!="
+                linhas.append(f"    if regs[{ra}] {comparacao} regs[{rb}]:")
+                linhas.extend(saida(executadas, endereco + offset, "        "))
+                linhas.extend(saida(executadas, endereco + 1))
+                break
+
+            # opcode 0 (palavra nula): nenhuma linha gerada
+        else:
+            linhas.extend(saida(len(instrucoes), inicio + len(instrucoes)))
+
+        return "\n".join(linhas) + "\n"
+
+    def run(self, max_steps=None):
+        """
+        Executa até o halt (ou até max_steps instruções) e devolve o número de instruções executadas.
+        """
+        cpu = self.cpu
+        if cpu.halted:
+            return 0
+        if cpu.observadores:
+            # Observadores precisam ver instrução por instrução
+            return cpu.run(max_steps)
+
+        inicio = cpu.contador_instrucoes
+        limite = None if max_steps is None else inicio + max_steps
+        regs = cpu.regs
+        memoria = cpu.memoria
+        blocos = self.blocos
+        pc = cpu.pc
+        anterior = None
+
+        while True:
+            bloco = anterior.sucessores.get(pc) if anterior is not None else None
+            if bloco is None or not bloco.valido:
+                bloco = blocos.get(pc)
+                if bloco is None:
+                    bloco = self.traduzir(pc)
+                if bloco is not None and anterior is not None and anterior.valido:
+                    anterior.sucessores[pc] = bloco
+
+            if bloco is None or (limite is not None and cpu.contador_instrucoes + bloco.tamanho > limite):
+                # Halt, instrução ilegal, PC inválido ou orçamento menor que o bloco:
+                # o próprio Processador executa uma instrução.
+                if limite is not None and cpu.contador_instrucoes >= limite:
+                    break
+                cpu.pc = pc
+                cpu.run(1)
+                pc = cpu.pc
+                anterior = None
+                if cpu.halted:
+                    break
+                continue
+
+            pc = bloco.funcao(cpu, regs, memoria)
+            anterior = bloco
+
+        cpu.pc = pc
+        return cpu.contador_instrucoes - inicio
+
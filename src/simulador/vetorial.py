@@ -0,0 +1,246 @@
+from array import array
+
+import numpy as np
+
+from src.simulador.unidade_controle import UnidadeControle
+from src.simulador.instrucoes import FLAGS_ADD, FLAGS_SUB, FLAGS_RESULTADO, FLAGS_FIXAS
+from src.simulador.decodificador import Decodificador, InstrucaoIlegal
+from src.simulador.processador import Processador, HALT, NUM_REGISTRADORES, TAMANHO_MEMORIA, TRACE_DESLIGADO
+
+OP = UnidadeControle.OPCODES
+
+_REGISTRADORES_POR_OPCODE = {
+    OP['ADD']: ("ra", "rb", "rc"), OP['SUB']: ("ra", "rb", "rc"), OP['XOR']: ("ra", "rb", "rc"),
+    OP['OR']: ("ra", "rb", "rc"), OP['AND']: ("ra", "rb", "rc"), OP['ASL']: ("ra", "rb", "rc"),
+    OP['ASR']: ("ra", "rb", "rc"), OP['LSL']: ("ra", "rb", "rc"), OP['LSR']: ("ra", "rb", "rc"),
+    OP['ZERO']: ("rc",), OP['NOT']: ("ra", "rc"), OP['COPY']: ("ra", "rc"),
+    OP['LC_HI']: ("rc",), OP['LC_LO']: ("rc",), OP['LOAD']: ("ra", "rc"), OP['STORE']: ("ra", "rc"),
+    OP['J']: (), OP['JAL']: (), OP['JR']: ("ra",), OP['BEQ']: ("ra", "rb"), OP['BNE']: ("ra", "rb"),
+    0x00: (),
+}
+
+
+class MotorVetorial:
+    """
+    Executa N instâncias (lanes) do mesmo programa em lockstep: registradores (N, 32) e memórias
+    (N, 65536) em arrays uint32, com uma operação NumPy por instrução aplicada a todas as lanes
+    que estão no mesmo PC. Lanes que divergem em beq/bne/jr seguem em grupos separados.
+    Cada lane termina no mesmo estado que um Processador executando o programa sozinho.
+    """
+
+    def __init__(self, n, segmentos=None):
+        self.n = n
+        self.regs = np.zeros((n, NUM_REGISTRADORES), dtype=np.uint32)
+        self.memoria = np.zeros((n, TAMANHO_MEMORIA), dtype=np.uint32)
+        self.pc = np.zeros(n, dtype=np.int64)
+        self.halted = np.zeros(n, dtype=bool)
+        self.contador_instrucoes = np.zeros(n, dtype=np.int64)
+
+        # Flags preguiçosas por lane, como Processador.ultima_op_flags
+        self.flags_tipo = np.full(n, FLAGS_FIXAS, dtype=np.uint8)
+        self.flags_a = np.zeros(n, dtype=np.uint32)
+        self.flags_b = np.zeros(n, dtype=np.uint32)
+        self.flags_resultado = np.zeros(n, dtype=np.uint32)
+
+        # Lanes interrompidas por erro (instrução ilegal, registrador inválido): lane -> exceção
+        self.erros = {}
+
+        self._decodificadas = {}
+
+        if segmentos is not None:
+            self.carregar_programa(segmentos)
+
+    def carregar_programa(self, segmentos):
+        """
+        Copia os segmentos (endereço_base, palavras) para a memória de todas as lanes.
+        """
+        if isinstance(segmentos, dict):
+            segmentos = Processador._agrupar_segmentos(segmentos)
+        for base, palavras in segmentos:
+            valores = np.asarray(palavras, dtype=np.uint32)
+            if base < 0 or base + len(valores) > TAMANHO_MEMORIA:
+                raise IndexError(f"Segmento em {base} com {len(valores)} palavras excede a memória de {TAMANHO_MEMORIA} palavras.")
+            self.memoria[:, base:base + len(valores)] = valores
+
+    def flags(self):
+        """
+        Materializa as flags de todas as lanes: array (N, 4) com as colunas N, Z, C, O.
+        """
+        tipo = self.flags_tipo
+        a = self.flags_a
+        b = self.flags_b
+        r = self.flags_resultado
+
+        neg = (r >> 31).astype(np.uint8)
+        zero = (r == 0).astype(np.uint8)
+        sinal_a = (a >> 31).astype(np.uint8)
+        sinal_b = (b >> 31).astype(np.uint8)
+
+        carry = np.zeros(self.n, dtype=np.uint8)
+        overflow = np.zeros(self.n, dtype=np.uint8)
+        soma = tipo == FLAGS_ADD
+        sub = tipo == FLAGS_SUB
+        carry[soma] = (a[soma].astype(np.uint64) + b[soma] > 0xFFFFFFFF)
+        overflow[soma] = (sinal_a[soma] == sinal_b[soma]) & (neg[soma] != sinal_a[soma])
+        carry[sub] = a[sub] < b[sub]
+        overflow[sub] = (sinal_a[sub] != sinal_b[sub]) & (neg[sub] != sinal_a[sub])
+
+        resultado = np.stack([neg, zero, carry, overflow], axis=1)
+        fixas = tipo == FLAGS_FIXAS
+        if fixas.any():
+            bits = a[fixas]
+            resultado[fixas] = np.stack([(bits >> 3) & 1, (bits >> 2) & 1, (bits >> 1) & 1, bits & 1], axis=1)
+        return resultado
+
+    def processador(self, lane):
+        """
+        Cria um Processador com o estado de uma lane (útil para comparar com a execução de referência).
+        """
+        cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+        cpu.regs[:] = array('I', self.regs[lane].tolist())
+        cpu.memoria[:] = array('I', self.memoria[lane].tolist())
+        cpu.pc = int(self.pc[lane])
+        cpu.halted = bool(self.halted[lane])
+        cpu.contador_instrucoes = int(self.contador_instrucoes[lane])
+        cpu.ultima_op_flags = (
+            int(self.flags_tipo[lane]), int(self.flags_a[lane]), int(self.flags_b[lane]), int(self.flags_resultado[lane])
+        )
+        return cpu
+
+    def _decodificar(self, palavra):
+        decodificada = self._decodificadas.get(palavra)
+        if decodificada is None:
+            decodificada = self._decodificadas[palavra] = Decodificador.decodificar(palavra)
+        return decodificada
+
+    def run(self, max_steps=None):
+        """
+        Executa até todas as lanes pararem (ou até max_steps passos). Devolve o número de passos.
+        """
+        passos = 0
+        while max_steps is None or passos < max_steps:
+            if not self.passo():
+                break
+            passos += 1
+        return passos
+
+    def passo(self):
+        """
+        Executa uma instrução em cada lane ativa. Devolve False se não havia lane ativa.
+        """
+        ativas = np.flatnonzero(~self.halted)
+        if ativas.size == 0:
+            return False
+
+        pcs = self.pc[ativas]
+        invalidas = (pcs < 0) | (pcs >= TAMANHO_MEMORIA)
+        if invalidas.any():
+            self.halted[ativas[invalidas]] = True
+            ativas = ativas[~invalidas]
+            pcs = pcs[~invalidas]
+            if ativas.size == 0:
+                return True
+
+        palavras = self.memoria[ativas, pcs]
+        chaves = (pcs.astype(np.uint64) << np.uint64(32)) | palavras
+        if (chaves == chaves[0]).all():
+            self._executar(ativas, int(pcs[0]), int(palavras[0]))
+        else:
+            unicas, indices = np.unique(chaves, return_inverse=True)
+            for k, chave in enumerate(unicas):
+                chave = int(chave)
+                self._executar(ativas[indices == k], chave >> 32, chave & 0xFFFFFFFF)
+        return True
+
+    def _executar(self, lanes, pc, palavra):
+        proximo = pc + 1
+        self.pc[lanes] = proximo
+        if palavra == HALT or proximo >= TAMANHO_MEMORIA:
+            self.halted[lanes] = True
+            return
+
+        d = self._decodificar(palavra)
+        opcode = d.opcode
+        campos = _REGISTRADORES_POR_OPCODE.get(opcode)
+        if campos is None:
+            self._falhar(lanes, InstrucaoIlegal(pc, palavra))
+            return
+        for campo in campos:
+            if getattr(d, campo) >= NUM_REGISTRADORES:
+                self._falhar(lanes, IndexError(f"Registrador r{getattr(d, campo)} inexistente no PC = {pc}"))
+                return
+
+        regs = self.regs
+        ra, rb, rc = d.ra, d.rb, d.rc
+        resultado = None
+        tipo = FLAGS_RESULTADO
+
+        if opcode == OP['ADD'] or opcode == OP['SUB']:
+            a = regs[lanes, ra]
+            b = regs[lanes, rb]
+            if opcode == OP['ADD']:
+                resultado = a + b
+                tipo = FLAGS_ADD
+            else:
+                resultado = a - b
+                tipo = FLAGS_SUB
+            self.flags_a[lanes] = a
+            self.flags_b[lanes] = b
+        elif opcode == OP['XOR']:
+            resultado = regs[lanes, ra] ^ regs[lanes, rb]
+        elif opcode == OP['OR']:
+            resultado = regs[lanes, ra] | regs[lanes, rb]
+        elif opcode == OP['AND']:
+            resultado = regs[lanes, ra] & regs[lanes, rb]
+        elif opcode == OP['ASL'] or opcode == OP['LSL']:
+            resultado = regs[lanes, ra] << (regs[lanes, rb] & np.uint32(0x1F))
+        elif opcode == OP['LSR']:
+            resultado = regs[lanes, ra] >> (regs[lanes, rb] & np.uint32(0x1F))
+        elif opcode == OP['ASR']:
+            deslocamento = (regs[lanes, rb] & np.uint32(0x1F)).astype(np.int32)
+            resultado = (regs[lanes, ra].view(np.int32) >> deslocamento).view(np.uint32)
+        elif opcode == OP['NOT']:
+            resultado = ~regs[lanes, ra]
+        elif opcode == OP['COPY']:
+            resultado = regs[lanes, ra]
+        elif opcode == OP['ZERO']:
+            resultado = np.zeros(lanes.size, dtype=np.uint32)
+            tipo = FLAGS_FIXAS
+        elif opcode == OP['LC_HI']:
+            resultado = np.uint32((d.const16 << 16) & 0xFFFF0000) | (regs[lanes, rc] & np.uint32(0xFFFF))
+        elif opcode == OP['LC_LO']:
+            resultado = np.uint32(d.const16 & 0xFFFF) | (regs[lanes, rc] & np.uint32(0xFFFF0000))
+        elif opcode == OP['LOAD']:
+            resultado = self.memoria[lanes, regs[lanes, ra] & np.uint32(0xFFFF)]
+        elif opcode == OP['STORE']:
+            self.memoria[lanes, regs[lanes, rc] & np.uint32(0xFFFF)] = regs[lanes, ra]
+        elif opcode == OP['J']:
+            self.pc[lanes] = d.endereco24 & 0xFFFFFF
+        elif opcode == OP['JAL']:
+            regs[lanes, 31] = proximo
+            self.pc[lanes] = d.endereco24 & 0xFFFFFF
+        elif opcode == OP['JR']:
+            self.pc[lanes] = regs[lanes, ra]
+        elif opcode == OP['BEQ'] or opcode == OP['BNE']:
+            offset = (rc - 256) if rc > 127 else rc
+            if opcode == OP['BEQ']:
+                tomados = regs[lanes, ra] == regs[lanes, rb]
+            else:
+                tomados = regs[lanes, ra] != regs[lanes, rb]
+            self.pc[lanes[tomados]] = pc + offset
+
+        if resultado is not None:
+            regs[lanes, rc] = resultado
+            self.flags_tipo[lanes] = tipo
+            if tipo == FLAGS_FIXAS:
+                # zeros: N=0 Z=1 C=0 O=0
+                self.flags_a[lanes] = 0b0100
+            else:
+                self.flags_resultado[lanes] = resultado
+
+        self.contador_instrucoes[lanes] += 1
+
+    def _falhar(self, lanes, erro):
+        self.halted[lanes] = True
+        for lane in lanes.tolist():
+            self.erros[lane] = erro
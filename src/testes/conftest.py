@@ -0,0 +1,57 @@
+import os
+
+from src.interpretador.assembler import Assembler
+from src.simulador.processador import Processador, TRACE_DESLIGADO, TAMANHO_MEMORIA
+
+# Auxiliares comuns aos testes: importados com `from conftest import carregar, estado, ...`
+
+BENCHMARKS = os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks")
+EXEMPLOS = os.path.join(os.path.dirname(__file__), "..", "..", "exemplos")
+
+# Salto para o segmento em 2^20 e acesso ao endereço 0x123456, fora da memória densa de 64K
+ALTO = """
+address 0
+        j alto
+address 100000000000000000000
+alto:   lch r1, 18
+        lcl r1, 13398
+        lcl r2, 77
+        store r1, r2
+        load r3, r1
+        halt
+"""
+
+
+def ler_fonte(diretorio, nome):
+    with open(os.path.join(diretorio, nome)) as f:
+        return f.read()
+
+
+def carregar(fonte, **opcoes):
+    """
+    Processador sem trace com a fonte montada já carregada; opcoes vão para o construtor.
+    """
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO, **opcoes)
+    cpu.carregar_programa(Assembler.montar_fonte(fonte))
+    return cpu
+
+
+def referencia(fonte, **opcoes):
+    """
+    Executa a fonte ciclo a ciclo (executar_ciclo) até o halt: a referência dos motores rápidos.
+    """
+    cpu = carregar(fonte, **opcoes)
+    while not cpu.halted:
+        cpu.executar_ciclo()
+    return cpu
+
+
+def estado(cpu):
+    """
+    Estado arquitetural comparado entre execuções: registradores, 64K palavras baixas da memória
+    (densa ou esparsa), PC, halt, contador de instruções e flags.
+    """
+    return (
+        cpu.regs.tolist(), cpu.memoria[0:TAMANHO_MEMORIA].tobytes(), cpu.pc, cpu.halted,
+        cpu.contador_instrucoes, cpu.flags(),
+    )
@@ -0,0 +1,94 @@
+import pytest
+
+from src.interpretador.assembler import (
+    Assembler, ErroMontagem, TABELA_CODIFICACAO, F_DESVIO, F_SALTO, campo_rotulo, codificar_instrucao,
+)
+
+from conftest import carregar
+
+
+def _palavras(fonte):
+    return [palavra for _, palavras in Assembler.montar_fonte(fonte) for palavra in palavras]
+
+
+def _codificar(mnemonico, *operandos):
+    opcode, formato = TABELA_CODIFICACAO[mnemonico]
+    return codificar_instrucao(mnemonico, opcode, formato, list(operandos))
+
+
+def _diagnosticos(fonte):
+    with pytest.raises(ErroMontagem) as erro:
+        Assembler.montar_fonte(fonte)
+    return erro.value.diagnosticos
+
+
+def test_codificacao_dos_campos():
+    assert _codificar("add", "r3", "r1", "r2") == (0x01010203, None)
+    assert _codificar("lcl", "r7", "0xBEEF") == (0x0FBEEF07, None)
+    assert _codificar("beq", "r1", "r2", "-3") == (0x140102FD, None)
+    assert _codificar("bne", "r1", "r2", "fim") == (0x15010200, "fim")
+    assert _codificar("jal", "0x123456") == (0x12123456, None)
+    assert _codificar("halt") == (0xFFFFFFFF, None)
+
+
+def test_campo_rotulo_calcula_offset_e_endereco():
+    assert campo_rotulo(F_DESVIO, 10, "volta", 3) == (-7) & 0xFF
+    assert campo_rotulo(F_DESVIO, 10, "frente", 137) == 127
+    assert campo_rotulo(F_SALTO, 10, "longe", 0xABCDEF) == 0xABCDEF
+    with pytest.raises(ValueError):
+        campo_rotulo(F_DESVIO, 10, "longe", 138)
+    with pytest.raises(ValueError):
+        campo_rotulo(F_SALTO, 0, "longe", 1 << 24)
+
+
+def test_rotulos_para_tras_e_para_frente_nos_desvios():
+    fonte = """
+            lcl r1, 3
+            lcl r2, 1
+            zeros r3
+    volta:  sub r1, r1, r2
+            beq r1, r3, fim
+            bne r1, r3, volta
+            lcl r4, 99
+    fim:    halt
+    """
+    palavras = _palavras(fonte)
+    assert palavras[4] & 0xFF == 3               # beq em 4 -> fim em 7
+    assert palavras[5] & 0xFF == (-2) & 0xFF     # bne em 5 -> volta em 3
+
+    cpu = carregar(fonte)
+    cpu.run()
+    assert cpu.halted and cpu.regs[1] == 0 and cpu.regs[4] == 0
+
+
+def test_desvio_alem_de_127_palavras_e_erro():
+    meio = "\n".join("zeros r1" for _ in range(126))
+    assert _palavras(f"beq r1, r2, alvo\n{meio}\nalvo: halt")[0] & 0xFF == 127
+    assert _palavras(f"alvo: zeros r1\n{meio}\nzeros r1\nbne r1, r2, alvo")[-1] & 0xFF == 0x80
+
+    diagnosticos = _diagnosticos(f"beq r1, r2, alvo\n{meio}\nzeros r1\nalvo: halt")
+    assert diagnosticos == [(1, "Rótulo 'alvo' fora do alcance de 8 bits do desvio (offset 128)")]
+    diagnosticos = _diagnosticos(f"alvo: zeros r1\n{meio}\nzeros r1\nzeros r1\nbne r1, r2, alvo")
+    assert diagnosticos == [(130, "Rótulo 'alvo' fora do alcance de 8 bits do desvio (offset -129)")]
+
+
+def test_rotulo_indefinido_e_duplicado():
+    assert _diagnosticos("j nenhum\nhalt") == [(1, "Rótulo não definido: 'nenhum'")]
+    assert _diagnosticos("a: zeros r1\na: halt") == [(2, "Rótulo 'a' definido mais de uma vez")]
+
+
+def test_varios_erros_relatados_juntos_em_ordem_de_linha():
+    fonte = """
+            j longe
+            foo r1
+            add r1, r2
+            lcl r1, 70000
+    9x:     halt
+    """
+    assert _diagnosticos(fonte) == [
+        (2, "Rótulo não definido: 'longe'"),
+        (3, "Mnemônico desconhecido: foo"),
+        (4, "Instrução add requer 3 operando(s) (rc, ra, rb)."),
+        (5, "Constante de 16 bits fora do intervalo (0 a 65535): 70000"),
+        (6, "Rótulo inválido: '9x'"),
+    ]
@@ -0,0 +1,56 @@
+from src.simulador import fuzz
+
+from conftest import BENCHMARKS, carregar, estado, ler_fonte
+
+
+def test_avanco_rapido_concorda_com_executar_ciclo_em_programas_aleatorios():
+    for semente in range(500):
+        caso = fuzz.gerar_caso(semente)
+        assert fuzz.comparar(caso, "avanco_rapido") is None, fuzz.formatar_caso(caso, "avanco_rapido")
+
+
+def test_lacos_de_contagem_terminam_no_mesmo_estado():
+    fonte = ler_fonte(BENCHMARKS, "contagem.asm").replace("lcl r1, 300", "lcl r1, 20")
+    referencia = carregar(fonte)
+    referencia.run()
+    rapido = carregar(fonte, avanco_rapido=True)
+    rapido.run()
+
+    assert rapido.halted
+    assert estado(rapido) == estado(referencia)
+    assert rapido.regs[5] == 20 * 1000
+    assert rapido.lacos_analisados
+
+
+def test_orcamento_para_no_meio_do_laco_avancado():
+    fonte = """
+            lcl r1, 5000
+            lcl r2, 1
+            zeros r3
+    laco:   sub r1, r1, r2
+            bne r1, r3, laco
+            halt
+    """
+    referencia = carregar(fonte)
+    referencia.run(1234)
+    rapido = carregar(fonte, avanco_rapido=True)
+    rapido.run(1234)
+    assert estado(rapido) == estado(referencia)
+
+    referencia.run()
+    rapido.run()
+    assert estado(rapido) == estado(referencia)
+
+
+def test_laco_sem_mudanca_de_estado_consome_o_orcamento():
+    fonte = """
+            lcl r1, 1
+    laco:   j laco
+    """
+    cpu = carregar(fonte, avanco_rapido=True)
+    cpu.run(10_000)
+    assert cpu.contador_instrucoes == 10_000 and cpu.pc == 1 and not cpu.halted
+
+    cpu = carregar(fonte, avanco_rapido=True)
+    cpu.run()
+    assert "infinito" in cpu.parada and not cpu.halted
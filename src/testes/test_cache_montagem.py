@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from src.interpretador import cache_montagem
+from src.interpretador.assembler import Assembler
+from src.interpretador.cache_montagem import CacheMontagem, load_program
+from src.interpretador.imagem import ImagemPrograma
+from src.simulador.processador import Processador, TRACE_DESLIGADO
+
+from conftest import EXEMPLOS, ler_fonte
+
+FONTE = "lcl r1, 5\nadd r2, r1, r1\nhalt\n"
+
+
+def _contar_montagens(monkeypatch):
+    montagens = []
+    original = Assembler.montar_fonte
+
+    def montar_fonte(fonte):
+        montagens.append(fonte)
+        return original(fonte)
+    monkeypatch.setattr(Assembler, "montar_fonte", staticmethod(montar_fonte))
+    return montagens
+
+
+def test_fonte_inalterada_reaproveita_a_imagem(tmp_path, monkeypatch):
+    montagens = _contar_montagens(monkeypatch)
+    fonte = tmp_path / "prog.asm"
+    fonte.write_text(FONTE)
+    cache = tmp_path / "cache"
+
+    imagem = CacheMontagem.montar(str(fonte), diretorio=str(cache))
+    assert len(montagens) == 1
+    assert ImagemPrograma.ler(imagem) == Assembler.montar_fonte(FONTE)
+    montagens.clear()
+
+    saida = tmp_path / "prog.bin"
+    assert CacheMontagem.montar(str(fonte), str(saida), diretorio=str(cache)) == imagem
+    assert montagens == []
+    assert saida.read_bytes() == open(imagem, "rb").read()
+
+
+def test_fonte_alterada_monta_de_novo(tmp_path, monkeypatch):
+    montagens = _contar_montagens(monkeypatch)
+    fonte = tmp_path / "prog.asm"
+    fonte.write_text(FONTE)
+    primeira = CacheMontagem.montar(str(fonte), diretorio=str(tmp_path))
+
+    fonte.write_text(FONTE.replace("lcl r1, 5", "lcl r1, 6"))
+    segunda = CacheMontagem.montar(str(fonte), diretorio=str(tmp_path))
+    assert segunda != primeira and len(montagens) == 2
+    assert os.path.exists(primeira) and os.path.exists(segunda)
+
+
+def test_nova_versao_do_montador_invalida_o_cache(tmp_path, monkeypatch):
+    fonte = tmp_path / "prog.asm"
+    fonte.write_text(FONTE)
+    primeira = CacheMontagem.montar(str(fonte), diretorio=str(tmp_path))
+
+    monkeypatch.setattr(cache_montagem, "VERSAO_MONTADOR", cache_montagem.VERSAO_MONTADOR + 1)
+    montagens = _contar_montagens(monkeypatch)
+    assert CacheMontagem.montar(str(fonte), diretorio=str(tmp_path)) != primeira
+    assert len(montagens) == 1
+
+
+def test_fonte_sem_arquivo_levanta_filenotfounderror(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        CacheMontagem.montar(str(tmp_path / "nao_existe.asm"), diretorio=str(tmp_path))
+
+
+def test_load_program_aceita_asm_e_bin_com_a_mesma_memoria(tmp_path):
+    asm = os.path.join(EXEMPLOS, "test_all.asm")
+    binario = tmp_path / "test_all.bin"
+    Assembler.montar(asm, str(binario))
+    texto = tmp_path / "test_all_texto.bin"
+    Assembler.montar(asm, str(texto), formato="texto")
+
+    memorias = []
+    for caminho in (asm, str(binario), str(texto)):
+        cpu = load_program(caminho, Processador(nivel_trace=TRACE_DESLIGADO), diretorio_cache=str(tmp_path / "cache"))
+        memorias.append(cpu.memoria.tobytes())
+    assert memorias[0] == memorias[1] == memorias[2]
+
+    esperado = Processador(nivel_trace=TRACE_DESLIGADO)
+    esperado.carregar_programa(Assembler.montar_fonte(ler_fonte(EXEMPLOS, "test_all.asm")))
+    assert memorias[0] == esperado.memoria.tobytes()
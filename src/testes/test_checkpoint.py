@@ -0,0 +1,93 @@
+import pytest
+
+from src.interpretador.assembler import Assembler
+from src.simulador.checkpoint import Rebobinador, BITS_PAGINA
+
+from conftest import BENCHMARKS, carregar, estado, ler_fonte
+
+
+def _ordenacao():
+    return ler_fonte(BENCHMARKS, "ordenacao.asm")
+
+
+def _apos(fonte, n):
+    cpu = carregar(fonte)
+    cpu.run(n)
+    return cpu
+
+
+def test_ir_para_e_voltar_reproduzem_run_n():
+    fonte = _ordenacao()
+    cpu = carregar(fonte)
+    rebobinador = Rebobinador(cpu, intervalo=997)
+    assert rebobinador.run(30_000) == 30_000
+    assert len(rebobinador.checkpoints) == 1 + 30_000 // 997
+
+    for alvo in (12_345, 0, 996, 997, 998, 29_999, 5_000, 30_000):
+        rebobinador.ir_para(alvo)
+        assert estado(cpu) == estado(_apos(fonte, alvo)), alvo
+
+    rebobinador.voltar(1)
+    assert estado(cpu) == estado(_apos(fonte, 29_999))
+    rebobinador.voltar(2_500)
+    assert estado(cpu) == estado(_apos(fonte, 27_499))
+    rebobinador.voltar(10 ** 9)
+    assert estado(cpu) == estado(carregar(fonte))
+    with pytest.raises(ValueError):
+        rebobinador.ir_para(-1)
+
+
+def test_restore_so_regrava_paginas_sujas_e_checkpoints_compartilham_paginas():
+    cpu = carregar("""
+            lcl r1, 300
+            lcl r2, 5000
+            lcl r3, 42
+            store r1, r3
+            store r2, r3
+            halt
+    """)
+    inicial = cpu.checkpoint()
+    cpu.run()
+    final = cpu.checkpoint()
+
+    escritas = {300 >> BITS_PAGINA, 5000 >> BITS_PAGINA}
+    for pagina, conteudo in enumerate(final.paginas):
+        assert (conteudo is inicial.paginas[pagina]) == (pagina not in escritas), pagina
+
+    # Escrita que não passa pelo controle de páginas sujas: restore não tem por que regravar a página
+    cpu.memoria[9000] = 123
+    cpu.restore(inicial)
+    assert cpu.memoria[300] == 0 and cpu.memoria[5000] == 0
+    assert cpu.memoria[9000] == 123
+
+    cpu.run()
+    cpu.restore(final)
+    assert cpu.memoria[300] == 42 and cpu.memoria[5000] == 42 and cpu.halted
+    assert not cpu.paginas_sujas
+
+
+def test_restore_descarta_codigo_decodificado_de_paginas_alteradas():
+    # Na segunda volta executa a instrução reescrita pelo store (lcl r5, 7) e sai sem outro store:
+    # a decodificação dela fica no cache
+    palavra = Assembler.montar_fonte("lcl r5, 7")[0][1][0]
+    fonte = f"""
+    alvo:   lcl r5, 3
+            bne r6, r3, fim
+            lch r1, {palavra >> 16}
+            lcl r1, {palavra & 0xFFFF}
+            zeros r2
+            store r2, r1
+            lcl r6, 1
+            j alvo
+    fim:    halt
+    """
+    cpu = carregar(fonte)
+    inicial = cpu.checkpoint()
+    cpu.run()
+    assert cpu.regs[5] == 7
+
+    cpu.restore(inicial)
+    cpu.run(1)
+    assert cpu.regs[5] == 3
+    cpu.run()
+    assert estado(cpu) == estado(_apos(fonte, None))
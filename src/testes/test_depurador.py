@@ -0,0 +1,117 @@
+import pytest
+
+from src.simulador.depurador import Depurador, Parada, ESCRITA, LEITURA
+from src.simulador.processador import Processador
+
+from conftest import carregar
+
+# r3 conta até 10 no laço, depois store em M[100] e load de volta em r5
+PROGRAMA = """
+address 0
+        lcl r1, 100
+        lcl r2, 1
+        lcl r4, 10
+laco:   add r3, r3, r2
+        bne r3, r4, laco
+        store r1, r3
+        load r5, r1
+        halt
+"""
+LACO, STORE, LOAD = 3, 5, 6
+
+
+def test_breakpoint_de_pc_para_antes_da_instrucao():
+    cpu = carregar(PROGRAMA)
+    depurador = Depurador(cpu)
+    depurador.adicionar_breakpoint(LACO)
+
+    parada = depurador.continuar()
+    assert isinstance(parada, Parada) and cpu.parada is parada
+    assert (parada.motivo, parada.pc, cpu.pc) == ("breakpoint", LACO, LACO)
+    assert cpu.regs[3] == 0 and cpu.contador_instrucoes == 3
+
+
+def test_breakpoint_condicional_em_texto():
+    cpu = carregar(PROGRAMA)
+    depurador = Depurador(cpu)
+    depurador.adicionar_breakpoint(LACO, "r3 == 5")
+
+    parada = depurador.continuar()
+    assert parada.pc == LACO and cpu.regs[3] == 5
+    assert str(parada) == f"Breakpoint em PC={LACO}"
+
+
+def test_watchpoint_de_escrita_para_antes_do_store():
+    cpu = carregar(PROGRAMA)
+    depurador = Depurador(cpu)
+    depurador.adicionar_watchpoint(100, tipo=ESCRITA)
+
+    parada = depurador.continuar()
+    assert (parada.motivo, parada.pc, parada.endereco) == (ESCRITA, STORE, 100)
+    assert (parada.valor_atual, parada.valor_novo) == (0, 10)
+    assert cpu.memoria[100] == 0
+
+    # O load do mesmo endereço não dispara um watchpoint só de escrita
+    assert depurador.continuar() is None
+    assert cpu.halted and cpu.memoria[100] == 10 and cpu.regs[5] == 10
+
+
+def test_watchpoint_de_leitura_no_load():
+    cpu = carregar(PROGRAMA)
+    depurador = Depurador(cpu)
+    depurador.adicionar_watchpoint(96, 103, LEITURA)
+
+    parada = depurador.continuar()
+    assert (parada.motivo, parada.pc, parada.endereco) == (LEITURA, LOAD, 100)
+    assert parada.valor_atual == 10 and parada.valor_novo is None
+    assert cpu.regs[5] == 0
+
+
+def test_continuar_e_passo_nao_param_de_novo_na_mesma_instrucao():
+    cpu = carregar(PROGRAMA)
+    depurador = Depurador(cpu)
+    depurador.adicionar_breakpoint(LACO)
+
+    assert depurador.continuar().pc == LACO and cpu.regs[3] == 0
+    # Sem a retomada, continuar() pararia de novo no mesmo add sem executá-lo
+    assert depurador.continuar().pc == LACO and cpu.regs[3] == 1
+
+    # passo() executa o add em que parou; o bne volta ao breakpoint, que só para no passo seguinte
+    assert depurador.passo() is None
+    assert cpu.pc == LACO + 1 and cpu.regs[3] == 2
+    assert depurador.passo() is None and cpu.pc == LACO
+    assert depurador.passo().pc == LACO and cpu.regs[3] == 2
+
+    assert depurador.passo(2) is None and cpu.pc == LACO and cpu.regs[3] == 3
+    assert depurador.continuar().pc == LACO and cpu.regs[3] == 3
+
+
+def test_remover_o_ultimo_ponto_desinstala_o_observador():
+    cpu = carregar(PROGRAMA)
+    depurador = Depurador(cpu)
+
+    depurador.adicionar_breakpoint(LACO)
+    depurador.adicionar_watchpoint(100)
+    assert depurador.instalado and type(cpu) is not Processador
+
+    depurador.remover_breakpoint(LACO)
+    assert depurador.instalado
+    depurador.remover_watchpoint(100)
+    assert not depurador.instalado and type(cpu) is Processador
+
+    depurador.adicionar_watchpoint(100, 101, LEITURA)
+    depurador.limpar()
+    assert not depurador.instalado and type(cpu) is Processador
+
+    assert depurador.continuar() is None and cpu.halted and cpu.regs[5] == 10
+
+
+def test_pontos_fora_da_memoria_ou_invalidos():
+    depurador = Depurador(carregar(PROGRAMA))
+    with pytest.raises(IndexError):
+        depurador.adicionar_breakpoint(len(depurador.cpu.memoria))
+    with pytest.raises(ValueError):
+        depurador.adicionar_watchpoint(10, 5)
+    with pytest.raises(ValueError):
+        depurador.adicionar_watchpoint(10, tipo="execucao")
+    assert not depurador.instalado
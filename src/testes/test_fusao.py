@@ -0,0 +1,75 @@
+from src.interpretador.assembler import Assembler
+from src.simulador import fuzz
+from src.simulador.fusao import Fusao, TIPOS
+
+from conftest import carregar, estado
+
+
+# Um exemplo de cada superinstrução dentro de um laço de 10 iterações
+PADROES = """
+        lch r1, 1
+        lcl r1, 2
+        zeros r2
+        lcl r2, 10
+        zeros r3
+        lcl r6, 200
+        lcl r7, 1
+laco:   load r4, r6
+        add r4, r4, r1
+        store r6, r4
+        sub r2, r2, r7
+        bne r2, r3, laco
+        halt
+"""
+
+
+def test_fusao_concorda_com_executar_ciclo_em_programas_aleatorios():
+    for semente in range(500):
+        caso = fuzz.gerar_caso(semente)
+        assert fuzz.comparar(caso, "fusao") is None, fuzz.formatar_caso(caso, "fusao")
+
+
+def test_cada_superinstrucao_mantem_o_estado_da_execucao_isolada():
+    referencia = carregar(PADROES)
+    referencia.run()
+    fundido = carregar(PADROES, fusao=True)
+    fundido.run()
+
+    assert estado(fundido) == estado(referencia)
+    assert fundido.memoria[200] == 10 * 0x10002
+    estatisticas = Fusao.estatisticas(fundido)
+    assert all(estatisticas["por_tipo"][tipo] > 0 for tipo in TIPOS)
+    assert estatisticas["fundidas"] <= fundido.contador_instrucoes
+
+
+def test_orcamento_nao_divide_uma_superinstrucao():
+    for passos in range(1, 20):
+        referencia = carregar(PADROES)
+        referencia.run(passos)
+        fundido = carregar(PADROES, fusao=True)
+        fundido.run(passos)
+        assert estado(fundido) == estado(referencia), passos
+
+
+def test_store_no_meio_do_grupo_descarta_a_superinstrucao():
+    palavra = Assembler.montar_fonte("lcl r5, 7")[0][1][0]
+    fonte = f"""
+            lcl r3, 2
+            zeros r4
+            lch r1, {palavra >> 16}
+            lcl r1, {palavra & 0xFFFF}
+            lcl r6, 6
+    laco:   zeros r5
+            lcl r5, 3
+            sub r3, r3, r7
+            store r6, r1
+            lcl r7, 1
+            bne r3, r4, laco
+            halt
+    """
+    referencia = carregar(fonte)
+    referencia.run()
+    fundido = carregar(fonte, fusao=True)
+    fundido.run()
+    assert estado(fundido) == estado(referencia)
+    assert fundido.regs[5] == 7
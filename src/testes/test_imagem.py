@@ -0,0 +1,33 @@
+import glob
+import os
+
+from src.interpretador.assembler import Assembler
+from src.interpretador.imagem import ImagemPrograma
+from src.interpretador.interpretador import Interpretador
+
+RAIZ = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def _palavras(segmentos):
+    return [(base, list(palavras)) for base, palavras in segmentos]
+
+
+def test_imagens_versionadas_correspondem_as_fontes():
+    imagens = sorted(glob.glob(os.path.join(RAIZ, "bin", "test_*.bin")))
+    assert imagens
+    for caminho in imagens:
+        nome = os.path.basename(caminho)[:-len(".bin")]
+        with open(os.path.join(RAIZ, "exemplos", nome + ".asm")) as f:
+            esperado = Assembler.montar_fonte(f.read())
+        assert ImagemPrograma.eh_binaria(caminho), caminho
+        assert _palavras(Interpretador.carregar_arquivo(caminho)) == _palavras(esperado), caminho
+
+
+def test_formato_texto_legado_continua_sendo_lido(tmp_path):
+    segmentos = Assembler.montar_fonte(open(os.path.join(RAIZ, "exemplos", "test_all.asm")).read())
+    caminho = str(tmp_path / "texto.bin")
+    ImagemPrograma.escrever_texto(caminho, segmentos)
+    assert not ImagemPrograma.eh_binaria(caminho)
+    assert _palavras(Interpretador.carregar_arquivo(caminho)) == _palavras(segmentos)
+    for legado in glob.glob(os.path.join(RAIZ, "bin", "alu_*.bin")):
+        assert Interpretador.carregar_arquivo(legado)
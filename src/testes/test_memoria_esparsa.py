@@ -0,0 +1,58 @@
+import pytest
+
+from src.simulador.checkpoint import BITS_PAGINA
+from src.simulador.memoria_esparsa import MemoriaEsparsa, TAMANHO_MEMORIA_ESPARSA
+from src.simulador.processador import TAMANHO_MEMORIA
+
+from conftest import ALTO, BENCHMARKS, carregar, estado, ler_fonte
+
+
+@pytest.mark.parametrize("nome", ["memoria.asm", "ordenacao.asm"])
+def test_esparsa_executa_como_a_densa(nome):
+    fonte = ler_fonte(BENCHMARKS, nome)
+    densa = carregar(fonte)
+    densa.run(200_000)
+    esparsa = carregar(fonte, memoria_esparsa=True)
+    esparsa.run(200_000)
+
+    assert estado(esparsa) == estado(densa)
+    assert len(esparsa.memoria.paginas) < TAMANHO_MEMORIA >> BITS_PAGINA
+
+
+def test_esparsa_alcanca_enderecos_de_24_bits():
+    cpu = carregar(ALTO, memoria_esparsa=True)
+    cpu.run()
+
+    assert cpu.halted and cpu.regs[3] == 77
+    assert cpu.memoria[0x123456] == 77
+    # Só as páginas do código e do dado: 0, a de 2^20 e a de 0x123456
+    assert sorted(cpu.memoria.paginas) == [0, (1 << 20) >> BITS_PAGINA, 0x123456 >> BITS_PAGINA]
+
+
+def test_leitura_nao_aloca_e_limites_levantam_indexerror():
+    memoria = MemoriaEsparsa()
+    assert memoria[TAMANHO_MEMORIA_ESPARSA - 1] == 0
+    assert memoria.ler(5000, 600).tolist() == [0] * 600
+    assert memoria.paginas == {}
+
+    memoria.escrever(250, range(1, 11))
+    assert memoria[250:260].tolist() == list(range(1, 11))
+    assert sorted(memoria.paginas) == [0, 1]
+    with pytest.raises(IndexError):
+        memoria[TAMANHO_MEMORIA_ESPARSA] = 1
+    with pytest.raises(IndexError):
+        memoria.ler(TAMANHO_MEMORIA_ESPARSA - 1, 2)
+
+
+def test_checkpoint_libera_paginas_alocadas_depois_dele():
+    cpu = carregar(ALTO, memoria_esparsa=True)
+    inicial = cpu.checkpoint()
+    paginas_iniciais = sorted(cpu.memoria.paginas)
+    cpu.run()
+    assert 0x123456 >> BITS_PAGINA in cpu.memoria.paginas
+
+    cpu.restore(inicial)
+    assert sorted(cpu.memoria.paginas) == paginas_iniciais
+    assert cpu.memoria[0x123456] == 0 and cpu.pc == 0 and not cpu.halted
+    cpu.run()
+    assert cpu.regs[3] == 77
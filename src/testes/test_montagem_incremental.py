@@ -0,0 +1,81 @@
+import pytest
+
+from src.interpretador.assembler import Assembler, ErroMontagem
+from src.interpretador.imagem import ImagemPrograma
+from src.interpretador.montagem_incremental import (
+    MontadorIncremental, MODO_COMPLETO, MODO_INCREMENTAL, MODO_INALTERADO,
+)
+
+from conftest import BENCHMARKS, ler_fonte
+
+
+def _fonte():
+    return ler_fonte(BENCHMARKS, "ordenacao.asm")
+
+
+def _lista(segmentos):
+    return [(base, list(palavras)) for base, palavras in segmentos]
+
+
+def _editar(fonte, antigo, novo):
+    assert antigo in fonte
+    return fonte.replace(antigo, novo, 1)
+
+
+# Sequência de edições: (nova fonte a partir da anterior, modo esperado)
+EDICOES = [
+    (lambda f: _editar(f, "lcl r1, 300", "lcl r1, 200"), MODO_INCREMENTAL),
+    (lambda f: _editar(f, "lcl r7, 12345", "lcl r7, 777\n        lcl r7, 12345"), MODO_COMPLETO),
+    (lambda f: _editar(f, "        copy r6, r5", "        nop_nao_existe\n        copy r6, r5"), None),
+    # Desfazer o erro volta à última montagem bem-sucedida
+    (lambda f: _editar(f, "        nop_nao_existe\n", ""), MODO_INALTERADO),
+    (lambda f: _editar(f, "beq r15, r3, sem_troca", "beq r15, r3, interno"), MODO_INCREMENTAL),
+    (lambda f: _editar(f, "sem_troca: copy r10, r11", "copy r10, r11\nsem_troca: add r10, r11, r3"), MODO_COMPLETO),
+    (lambda f: f + "\n# comentário no fim\n", MODO_INCREMENTAL),
+    (lambda f: f, MODO_INALTERADO),
+]
+
+
+@pytest.mark.parametrize("formato", ["binario", "texto"])
+def test_edicoes_produzem_o_mesmo_que_montar_fonte(tmp_path, formato):
+    saida = tmp_path / "saida.bin"
+    referencia = tmp_path / "referencia.bin"
+    montador = MontadorIncremental(str(tmp_path / "prog.asm"), str(saida), formato)
+    fonte = _fonte()
+    montador.atualizar(fonte)
+    assert montador.ultima["modo"] == MODO_COMPLETO
+
+    for editar, modo in EDICOES:
+        anterior = _lista(montador.segmentos)
+        fonte = editar(fonte)
+        if modo is None:
+            with pytest.raises(ErroMontagem) as erro:
+                montador.atualizar(fonte)
+            with pytest.raises(ErroMontagem) as esperado:
+                Assembler.montar_fonte(fonte)
+            assert erro.value.diagnosticos == esperado.value.diagnosticos
+            assert _lista(montador.segmentos) == anterior
+            continue
+
+        segmentos = montador.atualizar(fonte)
+        esperados = Assembler.montar_fonte(fonte)
+        assert montador.ultima["modo"] == modo
+        assert _lista(segmentos) == _lista(esperados)
+        if formato == "binario":
+            assert saida.read_bytes() == ImagemPrograma.codificar(esperados)
+        else:
+            ImagemPrograma.escrever_texto(str(referencia), esperados)
+            assert saida.read_text() == referencia.read_text()
+
+
+def test_edicao_de_uma_constante_analisa_uma_linha(tmp_path):
+    caminho = tmp_path / "prog.asm"
+    caminho.write_text(_fonte())
+    montador = MontadorIncremental(str(caminho), str(tmp_path / "saida.bin"))
+    montador.montar()
+
+    caminho.write_text(_editar(_fonte(), "lcl r14, 5", "lcl r14, 6"))
+    montador.montar()
+    assert montador.ultima["modo"] == MODO_INCREMENTAL
+    assert montador.ultima["linhas_analisadas"] == 1
+    assert montador.ultima["palavras_alteradas"] == 1
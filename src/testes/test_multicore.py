@@ -0,0 +1,69 @@
+import os
+
+from src.interpretador.assembler import Assembler
+from src.simulador.multicore import SistemaMulticore
+
+from conftest import EXEMPLOS
+
+SOMA = os.path.join(EXEMPLOS, "multicore_soma.asm")
+INICIOS = [0, 2, 4, 6]
+
+# Núcleo 0 (PC 0) copia "lcl r5, 99" de M[30] sobre a instrução em 20, que o núcleo 1 (PC 20)
+# já decodificou e repete enquanto r5 for 1
+REESCRITA = """
+address 0
+        lcl r1, 20
+        lcl r3, 30
+        load r2, r3
+        store r1, r2
+        halt
+address 10100
+alvo:   lcl r5, 1
+        lcl r4, 1
+        add r6, r6, r4
+        beq r5, r4, alvo
+        halt
+address 11110
+        lcl r5, 99
+"""
+
+
+def _somas(sistema):
+    return [sistema.memoria[100 + nucleo] for nucleo in range(len(INICIOS))]
+
+
+def test_intercalado_soma_a_regiao_de_cada_nucleo(tmp_path, monkeypatch):
+    monkeypatch.setenv("UFLA_RISC_CACHE", str(tmp_path))
+    with SistemaMulticore(INICIOS) as sistema:
+        sistema.carregar(SOMA)
+        sistema.executar_intercalado(quantum=7)
+        assert [resumo["halted"] for resumo in sistema.estado()] == [True] * 4
+        assert sistema.erros == [None] * 4
+        # Cada núcleo preenche sua região com nucleo, nucleo + 1, ..., nucleo + 999
+        assert _somas(sistema) == [1000 * nucleo + 499500 for nucleo in range(4)]
+
+
+def test_paralelo_termina_com_a_mesma_memoria_do_intercalado(tmp_path, monkeypatch):
+    monkeypatch.setenv("UFLA_RISC_CACHE", str(tmp_path))
+    memorias, instrucoes = [], []
+    for executar in ("executar_intercalado", "executar_paralelo"):
+        with SistemaMulticore(INICIOS) as sistema:
+            sistema.carregar(SOMA)
+            instrucoes.append(getattr(sistema, executar)())
+            assert sistema.erros == [None] * 4
+            memorias.append(bytes(sistema.memoria))
+    assert memorias[0] == memorias[1]
+    assert instrucoes[0] == instrucoes[1]
+
+
+def test_store_em_codigo_invalida_a_decodificacao_dos_outros_nucleos():
+    with SistemaMulticore([0, 20]) as sistema:
+        sistema.carregar_programa(Assembler.montar_fonte(REESCRITA))
+        avisos = []
+        sistema.nucleos[1].ouvintes_codigo.append(avisos.append)
+
+        sistema.executar_intercalado(quantum=1, max_steps=100)
+        reescrito, leitor = sistema.nucleos
+        assert reescrito.halted and leitor.halted
+        assert leitor.regs[5] == 99
+        assert 20 in avisos
@@ -0,0 +1,45 @@
+from src.simulador.depurador import Depurador
+from src.simulador.perfil import Perfilador
+from src.simulador.unidade_controle import UnidadeControle
+
+from conftest import carregar
+
+OP = UnidadeControle.OPCODES
+
+
+def test_desvio_tomado_com_offset_1_conta_como_tomado():
+    cpu = carregar("""
+            zeros r1
+            zeros r2
+            beq r1, r2, prox
+    prox:   bne r1, r2, fim
+    fim:    halt
+    """)
+    perfil = Perfilador()
+    cpu.instalar_observador(perfil)
+    cpu.run()
+    assert perfil.desvios == {2: [1, 0], 3: [0, 1]}
+
+
+def test_parada_do_depurador_nao_conta_a_instrucao_duas_vezes():
+    cpu = carregar("""
+            lcl r1, 7
+            lcl r2, 40
+            store r2, r1
+            load r3, r2
+            halt
+    """)
+    perfil = Perfilador()
+    cpu.instalar_observador(perfil)
+    depurador = Depurador(cpu)
+    depurador.adicionar_breakpoint(2)
+    assert depurador.continuar() is not None
+    assert perfil.instrucoes == 2
+    depurador.continuar()
+
+    assert cpu.halted
+    assert perfil.instrucoes == cpu.contador_instrucoes
+    assert perfil.por_pc[2] == 1
+    assert perfil.por_opcode[OP['STORE']] == 1
+    assert perfil.stores == {40: 1} and perfil.loads == {40: 1}
+    assert perfil.inicio is not None and perfil.fim >= perfil.inicio
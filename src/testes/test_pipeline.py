@@ -0,0 +1,94 @@
+from src.simulador.pipeline import ModeloPipeline
+
+from conftest import carregar
+
+
+def test_pipeline_cobra_flush_de_desvio_tomado_com_offset_1():
+    cpu = carregar("""
+            zeros r1
+            zeros r2
+            beq r1, r2, prox
+    prox:   halt
+    """)
+    modelo = ModeloPipeline()
+    cpu.instalar_observador(modelo)
+    cpu.run()
+    assert modelo.flushes["desvio_tomado"] == 1
+    assert modelo.desvios_nao_tomados == 0
+
+
+def _modelar(fonte, **opcoes):
+    cpu = carregar(fonte)
+    modelo = ModeloPipeline(**opcoes)
+    cpu.instalar_observador(modelo)
+    cpu.run()
+    return modelo
+
+
+def test_sem_hazards_ciclos_sao_instrucoes_mais_4():
+    modelo = _modelar("""
+            lcl r1, 1
+            lcl r2, 2
+            zeros r3
+            lch r4, 5
+            lcl r5, 7
+            halt
+    """)
+    assert modelo.instrucoes == 5
+    assert modelo.ciclos == 5 + 4
+    assert modelo.bolhas == {"dados": 0, "load_uso": 0}
+    assert sum(modelo.flushes.values()) == 0
+
+
+def test_desvio_tomado_e_nao_tomado():
+    # IF/ID/EX de zeros, zeros e do desvio nos ciclos 3, 4 e 5; o alvo entra em EX no 6 + penalidade
+    tomado = _modelar("""
+            zeros r1
+            zeros r2
+            beq r1, r2, alvo
+            lcl r3, 1
+    alvo:   lcl r4, 1
+            halt
+    """)
+    assert tomado.flushes["desvio_tomado"] == 1 and tomado.desvios_nao_tomados == 0
+    assert tomado.ciclos == 4 + 4 + 2
+
+    nao_tomado = _modelar("""
+            zeros r1
+            zeros r2
+            bne r1, r2, alvo
+            lcl r3, 1
+    alvo:   lcl r4, 1
+            halt
+    """)
+    assert nao_tomado.flushes["desvio_tomado"] == 0 and nao_tomado.desvios_nao_tomados == 1
+    assert nao_tomado.ciclos == 5 + 4
+
+    caro = _modelar("zeros r1\nbeq r1, r1, 1\nlcl r2, 1\nhalt", penalidades={"desvio_tomado": 5})
+    assert caro.ciclos_flush["desvio_tomado"] == 5 and caro.ciclos == 3 + 4 + 5
+
+
+LOAD_USO = """
+        lcl r1, 100
+        load r2, r1
+        add r3, r2, r2
+        halt
+"""
+
+
+def test_load_seguido_de_uso_com_e_sem_adiantamento():
+    com = _modelar(LOAD_USO)
+    assert com.bolhas == {"dados": 0, "load_uso": 1}
+    assert com.ciclos == 3 + 4 + 1
+
+    # Sem adiantamento cada consumidor espera o WB do produtor: 2 bolhas por dependência
+    sem = _modelar(LOAD_USO, adiantamento=False)
+    assert sem.bolhas == {"dados": 2, "load_uso": 2}
+    assert sem.ciclos == 3 + 4 + 4
+
+
+def test_dependencia_da_ula_sem_adiantamento():
+    fonte = "lcl r1, 5\nadd r2, r1, r1\nhalt"
+    assert _modelar(fonte).ciclos == 2 + 4
+    sem = _modelar(fonte, adiantamento=False)
+    assert sem.bolhas["dados"] == 2 and sem.ciclos == 2 + 4 + 2
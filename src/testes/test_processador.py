@@ -0,0 +1,113 @@
+import pytest
+
+from src.interpretador.assembler import Assembler
+from src.simulador.decodificador import InstrucaoIlegal
+from src.simulador.processador import Processador, TRACE_DESLIGADO, TRACE_INSTRUCAO, TRACE_ESTAGIO
+
+from conftest import carregar, estado, referencia
+
+HALT = 0xFFFFFFFF
+
+
+def _com_palavras(palavras):
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+    cpu.carregar_programa([(0, palavras)])
+    return cpu
+
+
+def test_palavra_nula_e_nop():
+    cpu = _com_palavras([0x00000000, 0x00000000, HALT])
+    cpu.regs[5] = 9
+    cpu.run()
+    assert cpu.halted and cpu.pc == 3 and cpu.contador_instrucoes == 2
+    assert cpu.regs.tolist() == [0] * 5 + [9] + [0] * 26
+
+
+@pytest.mark.parametrize("opcode", [0x0D, 0x17, 0x7F, 0xFE])
+def test_opcode_fora_do_isa_levanta_instrucao_ilegal(opcode):
+    palavra = (opcode << 24) | 0x010203
+    cpu = _com_palavras([0x00000000, palavra, HALT])
+    with pytest.raises(InstrucaoIlegal) as erro:
+        cpu.run()
+    assert erro.value.pc == 1 and erro.value.palavra == palavra
+    assert cpu.contador_instrucoes == 1 and not cpu.halted
+
+    cpu = _com_palavras([palavra, HALT])
+    with pytest.raises(InstrucaoIlegal):
+        cpu.executar_ciclo()
+
+
+def test_jal_grava_o_endereco_de_retorno_em_r31():
+    cpu = carregar("""
+            jal sub
+            lcl r2, 1
+            halt
+    sub:    lcl r1, 7
+            jr r31
+    """)
+    cpu.run()
+    assert cpu.halted
+    assert cpu.regs[1] == 7 and cpu.regs[2] == 1 and cpu.regs[31] == 1
+
+
+def test_j_nao_altera_r31():
+    cpu = carregar("""
+            lcl r31, 55
+            j fim
+            lcl r1, 1
+    fim:    halt
+    """)
+    cpu.run()
+    assert cpu.regs[31] == 55 and cpu.regs[1] == 0
+
+
+LACO = """
+        lcl r1, 10
+        lcl r2, 1
+        zeros r3
+laco:   sub r1, r1, r2
+        bne r1, r3, laco
+        halt
+"""
+
+
+def _com_trace(tmp_path, nivel):
+    cpu = Processador(nivel_trace=nivel, caminho_log=str(tmp_path / "dump.txt"))
+    cpu.carregar_programa(Assembler.montar_fonte(LACO))
+    return cpu
+
+
+def test_trace_desligado_nao_cria_o_log(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    cpu = carregar(LACO)
+    cpu.run()
+    assert cpu.halted
+    assert not (tmp_path / cpu.caminho_log).exists()
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("nivel, marcas", [(TRACE_INSTRUCAO, ("[INS]",)), (TRACE_ESTAGIO, ("[IF]", "[ID]", "[EX]", "[WB]"))])
+def test_trace_grava_uma_linha_por_instrucao_ou_estagio(tmp_path, capsys, nivel, marcas):
+    cpu = _com_trace(tmp_path, nivel)
+    cpu.run()
+    cpu.fechar_log()
+    linhas = (tmp_path / "dump.txt").read_text(encoding="utf-8").splitlines()
+    capsys.readouterr()
+
+    # O halt também gera uma linha (INS, ou IF no trace por estágio)
+    for marca in marcas:
+        esperadas = cpu.contador_instrucoes + (1 if marca in ("[INS]", "[IF]") else 0)
+        assert sum(linha.startswith(marca) for linha in linhas) == esperadas
+    assert estado(cpu) == estado(referencia(LACO))
+
+
+@pytest.mark.parametrize("nivel", [TRACE_DESLIGADO, TRACE_INSTRUCAO])
+def test_run_para_no_orcamento_e_devolve_as_executadas(tmp_path, capsys, nivel):
+    cpu = _com_trace(tmp_path, nivel)
+    assert cpu.run(7) == 7
+    assert cpu.contador_instrucoes == 7 and not cpu.halted
+    assert cpu.run(0) == 0
+    restantes = cpu.run()
+    assert cpu.halted and restantes == cpu.contador_instrucoes - 7 == 3 + 2 * 10 - 7
+    assert cpu.run(5) == 0
+    cpu.fechar_log()
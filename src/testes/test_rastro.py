@@ -0,0 +1,92 @@
+from src.interpretador.assembler import Assembler
+from src.simulador import rastro
+from src.simulador.instrucoes import Instrucoes
+from src.simulador.rastro import GravadorRastro, REGISTRO
+
+from conftest import carregar
+
+# Laço longo e repetitivo: o rastro comprime muito bem
+LACO = """
+        lcl r1, 3000
+        lcl r2, 1
+        zeros r3
+laco:   add r4, r4, r2
+        store r2, r4
+        sub r1, r1, r2
+        bne r1, r3, laco
+        halt
+"""
+
+
+def _gravar(caminho, fonte, compressao, preparar=None):
+    cpu = carregar(fonte)
+    if preparar:
+        preparar(cpu)
+    with GravadorRastro(str(caminho), compressao=compressao) as gravador:
+        cpu.instalar_observador(gravador)
+        cpu.run()
+    return cpu
+
+
+def test_descompressao_limita_o_tamanho_dos_blocos(tmp_path, monkeypatch):
+    monkeypatch.setattr(rastro, "TAMANHO_BUFFER", 4096)
+    sem_compressao = tmp_path / "puro.rastro"
+    cpu = _gravar(sem_compressao, LACO, None)
+    esperado = list(rastro.ler_rastro(str(sem_compressao)))
+    assert len(esperado) == cpu.contador_instrucoes
+
+    for compressao in ("zlib", "lzma"):
+        caminho = tmp_path / f"{compressao}.rastro"
+        _gravar(caminho, LACO, compressao)
+        # Cada leitura de 4 KiB comprimidos descomprime para bem mais que 4 KiB
+        assert caminho.stat().st_size < len(esperado) * REGISTRO.size // 8
+        assert max(len(bloco) for bloco in rastro._blocos(str(caminho))) < 4096 + REGISTRO.size
+        assert list(rastro.ler_rastro(str(caminho))) == esperado
+        assert rastro.primeira_divergencia(str(caminho), str(sem_compressao)) is None
+
+
+def test_primeiro_registro_compara_com_as_flags_do_inicio_da_gravacao(tmp_path):
+    def preparar(cpu):
+        cpu.regs[2] = 1
+        cpu.ultima_op_flags = Instrucoes.fixar_flags(1, 0, 1, 0)
+
+    caminho = tmp_path / "flags.rastro"
+    gravado = _gravar(caminho, "add r1, r2, r2\nhalt", "zlib", preparar)
+    assert gravado.flags() == (0, 0, 0, 0)
+    primeiro = next(rastro.ler_rastro(str(caminho)))
+    assert primeiro[3] == 0b1010_0000
+
+    cpu = carregar("add r1, r2, r2\nhalt")
+    preparar(cpu)
+    for _ in rastro.reproduzir(str(caminho), cpu):
+        pass
+    assert cpu.flags() == gravado.flags()
+    assert cpu.regs[1] == 2
+
+
+def test_reproduzir_store_sobre_codigo_descarta_a_decodificacao(tmp_path):
+    palavra = Assembler.montar_fonte("lcl r5, 7")[0][1][0]
+    fonte = f"""
+            lcl r5, 3
+            lch r1, {palavra >> 16}
+            lcl r1, {palavra & 0xFFFF}
+            zeros r2
+            store r2, r1
+            halt
+    """
+    caminho = tmp_path / "automodificavel.rastro"
+    _gravar(caminho, fonte, None)
+
+    # Processador que já executou (e decodificou) o endereço 0 antes de voltar ao estado inicial
+    cpu = carregar(fonte)
+    inicial = cpu.checkpoint()
+    cpu.run(1)
+    cpu.restore(inicial)
+    assert 0 in cpu.cache_instrucoes
+
+    for _ in rastro.reproduzir(str(caminho), cpu):
+        pass
+    assert cpu.memoria[0] == palavra
+    cpu.pc = 0
+    cpu.run(1)
+    assert cpu.regs[5] == 7
@@ -0,0 +1,73 @@
+import pickle
+
+import pytest
+
+from src.simulador.processador import Processador, TRACE_DESLIGADO, TAMANHO_MEMORIA
+
+from conftest import ALTO, BENCHMARKS, carregar, estado, ler_fonte
+
+
+def _estado(cpu):
+    # Além do estado arquitetural, o que fica entre os estágios do ciclo
+    return estado(cpu) + (cpu.ir, cpu.resultado_alu, cpu.ultimo_write_reg)
+
+
+def test_ida_e_volta_no_meio_da_execucao_continua_igual():
+    original = carregar(ler_fonte(BENCHMARKS, "ordenacao.asm"))
+    original.run(50_000)
+    dados = original.to_bytes()
+    copia = Processador.from_bytes(dados, nivel_trace=TRACE_DESLIGADO)
+    assert _estado(copia) == _estado(original)
+    # Só as páginas não nulas vão para os dados
+    assert len(dados) < TAMANHO_MEMORIA
+
+    original.run()
+    copia.run()
+    assert copia.halted and _estado(copia) == _estado(original)
+
+
+def test_memoria_esparsa_guarda_so_as_paginas_alocadas():
+    original = carregar(ALTO, memoria_esparsa=True)
+    original.run(4)
+    copia = Processador.from_bytes(original.to_bytes(), nivel_trace=TRACE_DESLIGADO)
+    assert copia.memoria_esparsa
+    assert sorted(copia.memoria.paginas) == sorted(original.memoria.paginas)
+
+    original.run()
+    copia.run()
+    assert copia.memoria[0x123456] == 77 and copia.regs[3] == 77
+    assert _estado(copia) == _estado(original)
+
+
+def test_estado_entre_estagios_e_preservado():
+    original = carregar("lcl r1, 5\nadd r2, r1, r1\nhalt")
+    original.executar_ciclo()
+    original.ciclo_IF()
+    original.ciclo_ID()
+    original.ciclo_EX()
+    assert original.resultado_alu == 10
+
+    copia = Processador.from_bytes(original.to_bytes(), nivel_trace=TRACE_DESLIGADO)
+    assert _estado(copia) == _estado(original)
+    copia.ciclo_WB()
+    original.ciclo_WB()
+    assert copia.regs[2] == 10 and copia.ultimo_write_reg == (2, 10)
+    assert _estado(copia) == _estado(original)
+
+
+def test_pickle_leva_o_estado_e_as_opcoes():
+    original = carregar(ler_fonte(BENCHMARKS, "ordenacao.asm"), fusao=True)
+    original.run(10_000)
+    copia = pickle.loads(pickle.dumps(original))
+    assert copia.fusao and copia.nivel_trace == TRACE_DESLIGADO
+    assert _estado(copia) == _estado(original)
+
+
+def test_dados_invalidos_levantam_valueerror():
+    dados = carregar("lcl r1, 5\nhalt").to_bytes()
+    with pytest.raises(ValueError):
+        Processador.from_bytes(dados[:-4])
+    with pytest.raises(ValueError):
+        Processador.from_bytes(b"XXXX" + dados[4:])
+    with pytest.raises(ValueError):
+        Processador.from_bytes(dados[:10])
@@ -0,0 +1,113 @@
+import asyncio
+
+from src.simulador.servidor import ServidorSimulacao
+
+# Nunca termina: só para por orçamento, tempo limite ou interromper
+INFINITO = """
+        lcl r2, 1
+laco:   add r1, r1, r2
+        j laco
+"""
+
+
+def test_interromper_para_execucao_no_pool():
+    async def cenario():
+        servidor = ServidorSimulacao(processos=1, fatia_pool=20_000, tempo_limite_pool=30.0)
+        try:
+            resposta = await servidor.processar({"comando": "criar_sessao", "fonte": INFINITO})
+            sessao = resposta["sessao"]
+            execucao = asyncio.create_task(servidor.processar({"comando": "executar", "sessao": sessao, "pool": True}))
+            await asyncio.sleep(0.5)
+            assert not execucao.done()
+            assert (await servidor.processar({"comando": "interromper", "sessao": sessao}))["ok"]
+            resposta = await asyncio.wait_for(execucao, 5)
+        finally:
+            await servidor.fechar()
+        return resposta
+
+    resposta = asyncio.run(cenario())
+    assert resposta["ok"] and not resposta["halted"]
+    assert resposta["executadas"] > 0 and resposta["instrucoes"] == resposta["executadas"]
+
+
+def test_execucao_no_pool_em_varias_tarefas_respeita_o_orcamento():
+    async def cenario():
+        servidor = ServidorSimulacao(processos=1, fatia_pool=7_000)
+        try:
+            sessao = (await servidor.processar({"comando": "criar_sessao", "fonte": INFINITO}))["sessao"]
+            resposta = await servidor.processar({"comando": "executar", "sessao": sessao, "pool": True, "orcamento": 50_001})
+            registradores = await servidor.processar({"comando": "registradores", "sessao": sessao})
+        finally:
+            await servidor.fechar()
+        return resposta, registradores
+
+    resposta, registradores = asyncio.run(cenario())
+    assert resposta["executadas"] == 50_001
+    assert registradores["registradores"][1] == 25_000
+
+
+def test_sessoes_em_fatias_avancam_juntas():
+    async def cenario():
+        servidor = ServidorSimulacao(processos=0, fatia=1_000)
+        sessoes = [(await servidor.processar({"comando": "criar_sessao", "fonte": INFINITO}))["sessao"] for _ in range(2)]
+        execucoes = [
+            asyncio.create_task(servidor.processar({"comando": "executar", "sessao": sessao}))
+            for sessao in sessoes
+        ]
+        await asyncio.sleep(0.2)
+        andamento = (await servidor.processar({"comando": "sessoes"}))["sessoes"]
+        for sessao in sessoes:
+            await servidor.processar({"comando": "interromper", "sessao": sessao})
+        respostas = await asyncio.wait_for(asyncio.gather(*execucoes), 5)
+        await servidor.fechar()
+        return sessoes, andamento, respostas
+
+    sessoes, andamento, respostas = asyncio.run(cenario())
+    for sessao, resposta in zip(sessoes, respostas):
+        assert andamento[sessao]["instrucoes"] > 0
+        assert resposta["ok"] and resposta["executadas"] >= andamento[sessao]["instrucoes"]
+
+
+def test_passo_memoria_checkpoint_e_restaurar():
+    fonte = """
+            lcl r1, 200
+            lcl r2, 9
+            store r1, r2
+            lcl r2, 10
+            store r1, r2
+            halt
+    """
+
+    async def cenario():
+        servidor = ServidorSimulacao(processos=0)
+        sessao = (await servidor.processar({"comando": "criar_sessao", "fonte": fonte}))["sessao"]
+
+        def pedir(comando, **campos):
+            return servidor.processar(dict(campos, comando=comando, sessao=sessao))
+
+        resultados = {"passo": await pedir("passo", n=3)}
+        resultados["checkpoint"] = await pedir("checkpoint")
+        resultados["memoria"] = await pedir("memoria", inicio=199, quantidade=3)
+        resultados["executar"] = await pedir("executar")
+        resultados["memoria_final"] = await pedir("memoria", inicio=200)
+        resultados["restaurar"] = await pedir("restaurar", checkpoint=resultados["checkpoint"]["checkpoint"])
+        resultados["memoria_restaurada"] = await pedir("memoria", inicio=200)
+        resultados["erros"] = [
+            await pedir("memoria", inicio=65535, quantidade=2),
+            await pedir("memoria", inicio=-1),
+            await pedir("memoria", quantidade=65537),
+            await pedir("restaurar", checkpoint=99),
+            await pedir("passo", n="um"),
+        ]
+        await servidor.fechar()
+        return resultados
+
+    resultados = asyncio.run(cenario())
+    assert resultados["passo"]["executadas"] == 3 and resultados["passo"]["pc"] == 3
+    assert resultados["memoria"]["palavras"] == [0, 9, 0]
+    assert resultados["executar"]["halted"] and resultados["executar"]["executadas"] == 2
+    assert resultados["memoria_final"]["palavras"] == [10]
+    assert resultados["restaurar"]["pc"] == 3 and not resultados["restaurar"]["halted"]
+    assert resultados["restaurar"]["instrucoes"] == 3
+    assert resultados["memoria_restaurada"]["palavras"] == [9]
+    assert [resposta["ok"] for resposta in resultados["erros"]] == [False] * 5
@@ -0,0 +1,48 @@
+from src.interpretador.assembler import Assembler
+from src.simulador import fuzz
+from src.simulador.tradutor import TradutorBlocos
+
+from conftest import BENCHMARKS, carregar, estado, ler_fonte, referencia
+
+
+def test_blocos_concordam_com_executar_ciclo_em_programas_aleatorios():
+    for semente in range(100):
+        caso = fuzz.gerar_caso(semente)
+        assert fuzz.comparar(caso, "blocos") is None, fuzz.formatar_caso(caso, "blocos")
+
+
+def test_store_sobre_bloco_ja_traduzido_invalida_a_traducao():
+    palavra = Assembler.montar_fonte("lcl r5, 99")[0][1][0]
+    fonte = f"""
+            lcl r3, 1
+            zeros r4
+            lcl r7, 2
+            lch r1, {palavra >> 16}
+            lcl r1, {palavra & 0xFFFF}
+            lcl r2, 6
+    laco:   lcl r5, 7
+            add r6, r6, r5
+            store r2, r1
+            sub r7, r7, r3
+            bne r7, r4, laco
+            halt
+    """
+    esperado = referencia(fonte)
+    assert esperado.regs[6] == 7 + 99
+
+    cpu = carregar(fonte)
+    TradutorBlocos(cpu).run()
+    assert estado(cpu) == estado(esperado)
+
+
+def test_run_com_max_steps_para_no_mesmo_ponto():
+    fonte = ler_fonte(BENCHMARKS, "checksum.asm")
+    esperado = carregar(fonte)
+    for _ in range(1000):
+        esperado.executar_ciclo()
+
+    cpu = carregar(fonte)
+    tradutor = TradutorBlocos(cpu)
+    assert tradutor.run(600) == 600
+    assert tradutor.run(400) == 400
+    assert estado(cpu) == estado(esperado)
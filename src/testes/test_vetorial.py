@@ -0,0 +1,58 @@
+from array import array
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.interpretador.assembler import Assembler
+from src.simulador.processador import Processador, TRACE_DESLIGADO
+from src.simulador.vetorial import MotorVetorial
+
+# Soma r1 + (r1 - 1) + ... + 1 em r5 e grava em M[200 + r1]; lanes com r1 diferentes divergem no bne
+PROGRAMA = """
+        lcl r2, 1
+        zeros r3
+        zeros r5
+        copy r4, r1
+laco:   beq r4, r3, fim
+        add r5, r5, r4
+        sub r4, r4, r2
+        j laco
+fim:    lcl r6, 200
+        add r6, r6, r1
+        store r6, r5
+        halt
+"""
+
+
+def _referencia(segmentos, entrada):
+    cpu = Processador(nivel_trace=TRACE_DESLIGADO)
+    cpu.carregar_programa(segmentos)
+    cpu.regs[1] = entrada
+    while not cpu.halted:
+        cpu.executar_ciclo()
+    return cpu
+
+
+def test_lanes_terminam_no_estado_da_execucao_escalar():
+    segmentos = Assembler.montar_fonte(PROGRAMA)
+    entradas = [0, 1, 5, 17]
+    motor = MotorVetorial(len(entradas), segmentos)
+    motor.regs[:, 1] = entradas
+    motor.run()
+
+    for lane, entrada in enumerate(entradas):
+        esperado = _referencia(segmentos, entrada)
+        obtido = motor.processador(lane)
+        assert obtido.regs == esperado.regs
+        assert obtido.memoria == esperado.memoria
+        assert (obtido.pc, obtido.halted, obtido.contador_instrucoes) == (esperado.pc, esperado.halted, esperado.contador_instrucoes)
+        assert obtido.flags() == esperado.flags()
+        assert obtido.memoria[200 + entrada] == entrada * (entrada + 1) // 2
+
+
+def test_processador_da_lane_usa_arrays_uint32():
+    motor = MotorVetorial(2, Assembler.montar_fonte(PROGRAMA))
+    cpu = motor.processador(1)
+    assert isinstance(cpu.regs, array) and cpu.regs.typecode == 'I'
+    assert isinstance(cpu.memoria, array) and cpu.memoria.typecode == 'I'